@@ -1,20 +1,21 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from contextlib import contextmanager
 import json
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import undetected_chromedriver as uc
 import os
 import time
 import random
 
+from services.dashboard_stats import get_dashboard_stats
+from services.media_store import get_media_store
+from services.post_index import get_post_index, post_label
+from services.sheet_cache import get_sheet_cache
+from services.series_planner import SeriesPlanner, get_series_planner
+from services.sheets import open_worksheet
+from services.token_ledger import get_token_ledger
+from services.tracing import read_spans, span, summarize
+
 
 # Page config
 st.set_page_config(
@@ -25,11 +26,34 @@ st.set_page_config(
 )
 
 
-# Google Sheets setup with validation and retry logic
+# Startup timing report: how long each first-time initialization took
+@st.cache_resource
+def get_startup_timings():
+    return {}
+
+
+@contextmanager
+def startup_timer(label):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        get_startup_timings()[label] = elapsed
+        print(f"⏱️ {label}: {elapsed:.2f}s")
+
+
+# Google Sheets setup (authorized lazily, once per process)
+@st.cache_resource(show_spinner=False)
+def get_client():
+    from services.sheets import get_sheets_client
+    with startup_timer("Google Sheets auth"):
+        return get_sheets_client()
+
+
 try:
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-    client = gspread.authorize(creds)
+    import gspread
+    client = get_client()
 except FileNotFoundError:
     st.error("❌ credentials.json not found. Please place it in the project directory.")
     st.stop()
@@ -39,16 +63,16 @@ except Exception as e:
 
 
 # Initialize Google Sheets with reduced API calls and retry
-def init_sheets():
+def _init_sheets():
     """Initialize Google Sheets with minimal API calls and retry on quota errors"""
     max_retries = 3
     for attempt in range(max_retries):
         try:
             # Posts Sheet
             try:
-                posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
+                posts_sheet = get_client().open("LinkedIn_Posts").worksheet("posts")
             except gspread.exceptions.SpreadsheetNotFound:
-                posts_sheet = client.create("LinkedIn_Posts").add_worksheet("posts", 1, 10)
+                posts_sheet = get_client().create("LinkedIn_Posts").add_worksheet("posts", 1, 10)
                 posts_sheet.append_row([
                     'id', 'series', 'topic', 'content', 'status',
                     'scheduled_date', 'image_url', 'post_url',
@@ -65,16 +89,16 @@ def init_sheets():
                 headers = ['id', 'series', 'topic', 'content', 'status',
                           'scheduled_date', 'image_url', 'post_url',
                           'created_at', 'published_at']
-                if not posts_sheet.get_all_values():
+                if not posts_sheet.row_values(1):
                     posts_sheet.clear()
                     posts_sheet.append_row(headers)
 
 
             # Resources Sheet
             try:
-                resources_sheet = client.open("LinkedIn_Resources").worksheet("resources")
+                resources_sheet = get_client().open("LinkedIn_Resources").worksheet("resources")
             except gspread.exceptions.SpreadsheetNotFound:
-                resources_sheet = client.create("LinkedIn_Resources").add_worksheet("resources", 1, 8)
+                resources_sheet = get_client().create("LinkedIn_Resources").add_worksheet("resources", 1, 8)
                 resources_sheet.append_row([
                     'id', 'title', 'url', 'resource_type', 'source',
                     'summary', 'relevance_score', 'created_at'
@@ -89,16 +113,16 @@ def init_sheets():
             else:
                 headers = ['id', 'title', 'url', 'resource_type', 'source',
                           'summary', 'relevance_score', 'created_at']
-                if not resources_sheet.get_all_values():
+                if not resources_sheet.row_values(1):
                     resources_sheet.clear()
                     resources_sheet.append_row(headers)
 
 
             # Enhanced Content Sheet
             try:
-                enhanced_sheet = client.open("LinkedIn_Enhanced_Content").worksheet("enhanced_content")
+                enhanced_sheet = get_client().open("LinkedIn_Enhanced_Content").worksheet("enhanced_content")
             except gspread.exceptions.SpreadsheetNotFound:
-                enhanced_sheet = client.create("LinkedIn_Enhanced_Content").add_worksheet("enhanced_content", 1, 5)
+                enhanced_sheet = get_client().create("LinkedIn_Enhanced_Content").add_worksheet("enhanced_content", 1, 5)
                 enhanced_sheet.append_row([
                     'id', 'original_idea', 'enhanced_versions',
                     'add_emojis', 'created_at'
@@ -113,7 +137,7 @@ def init_sheets():
             else:
                 headers = ['id', 'original_idea', 'enhanced_versions',
                           'add_emojis', 'created_at']
-                if not enhanced_sheet.get_all_values():
+                if not enhanced_sheet.row_values(1):
                     enhanced_sheet.clear()
                     enhanced_sheet.append_row(headers)
             break
@@ -126,25 +150,87 @@ def init_sheets():
                 st.stop()
 
 
+@st.cache_resource(show_spinner="Connecting to Google Sheets...")
+def init_sheets():
+    """Run sheet initialization once per process instead of on every rerun"""
+    with startup_timer("Sheets initialization"):
+        _init_sheets()
+    return True
+
+
 init_sheets()
 
 
-# Import services
-from services.ai_service import AIService
-from services.linkedin_service import LinkedInService
-from services.curation_service import CurationService
-from services.scheduler_service import SchedulerService
+# Services are process-wide shared resources, imported and constructed on
+# first use. Every browser session gets the same instances, so there is one
+# background scheduler, one browser and one Sheets client per process.
+@st.cache_resource(show_spinner=False)
+def get_ai_service():
+    from services.ai_service import get_ai_service as shared_ai_service
+    with startup_timer("AIService"):
+        return shared_ai_service()
 
 
-# Initialize session state
-if 'ai_service' not in st.session_state:
-    st.session_state.ai_service = AIService()
-if 'linkedin_service' not in st.session_state:
-    st.session_state.linkedin_service = LinkedInService()
-if 'curation_service' not in st.session_state:
-    st.session_state.curation_service = CurationService()
-if 'scheduler_service' not in st.session_state:
-    st.session_state.scheduler_service = SchedulerService()
+@st.cache_resource(show_spinner=False)
+def get_linkedin_service():
+    from services.linkedin_service import get_linkedin_service as shared_linkedin_service
+    with startup_timer("LinkedInService"):
+        return shared_linkedin_service()
+
+
+@st.cache_resource(show_spinner=False)
+def get_curation_service():
+    from services.curation_service import get_curation_service as shared_curation_service
+    with startup_timer("CurationService"):
+        return shared_curation_service()
+
+
+@st.cache_resource(show_spinner=False)
+def get_enhancement_store():
+    from services.enhancement_store import EnhancementStore
+    with startup_timer("EnhancementStore"):
+        store = EnhancementStore()
+        # One-time import of history kept in the old enhanced_content sheet
+        if store.count() == 0:
+            try:
+                enhanced_sheet = open_worksheet("LinkedIn_Enhanced_Content", "enhanced_content")
+                imported = store.import_records(enhanced_sheet.get_all_records())
+                if imported:
+                    print(f"✨ Imported {imported} enhancements from Google Sheets")
+            except Exception as e:
+                print(f"⚠️ Could not import enhancement history: {e}")
+        return store
+
+
+@st.cache_resource(show_spinner=False)
+def load_post_index():
+    with startup_timer("PostIndex"):
+        # Backfilled from the posts sheet on first use; every queueing path
+        # below keeps it current
+        return get_post_index()
+
+
+def score_label(score):
+    """A resource's Gemini rating; resources only ranked locally have none"""
+    try:
+        return f"{float(score):.1f}/10"
+    except (TypeError, ValueError):
+        return "not rated yet"
+
+
+def warn_if_duplicate(content):
+    """Show which queued or published posts content nearly repeats"""
+    matches = load_post_index().find_similar(content)
+    if matches:
+        st.warning("⚠️ Very similar to " + ", ".join(f"{m['label']} ({m['similarity']:.0%})" for m in matches))
+    return bool(matches)
+
+
+@st.cache_resource(show_spinner=False)
+def get_scheduler_service():
+    from services.scheduler_service import SchedulerService
+    with startup_timer("SchedulerService"):
+        return SchedulerService()
 
 
 # Sidebar Navigation
@@ -154,7 +240,7 @@ st.sidebar.markdown("---")
 
 page = st.sidebar.radio(
     "Navigation",
-    ["🏠 Dashboard", "✨ Content Enhancer", "📅 Post Scheduler", "📚 Resource Curator", "⚙️ Settings"]
+    ["🏠 Dashboard", "✨ Content Enhancer", "📅 Post Scheduler", "📚 Resource Curator", "📈 Performance", "⚙️ Settings"]
 )
 
 
@@ -163,7 +249,7 @@ st.sidebar.markdown("---")
 
 # Scheduler status in sidebar
 st.sidebar.subheader("⏰ Scheduler Status")
-scheduler = st.session_state.scheduler_service
+scheduler = get_scheduler_service()
 
 
 if st.sidebar.button("▶️ Start Scheduler" if not scheduler.is_running() else "⏸️ Stop Scheduler"):
@@ -177,15 +263,26 @@ if st.sidebar.button("▶️ Start Scheduler" if not scheduler.is_running() else
 
 if scheduler.is_running():
     st.sidebar.success("✅ Running")
-    next_post_time = scheduler.get_next_run_time('daily_post')
+    next_post_time = scheduler.get_next_post_time() or scheduler.get_next_run_time('daily_post')
     next_curation_time = scheduler.get_next_run_time('daily_curation')
     if next_post_time:
-        st.sidebar.info(f"Next Post: {next_post_time.strftime('%I:%M %p')}")
+        st.sidebar.info(f"Next Post: {next_post_time.strftime('%b %d, %I:%M %p')}")
     if next_curation_time:
         st.sidebar.info(f"Next Curation: {next_curation_time.strftime('%I:%M %p')}")
 else:
     st.sidebar.warning("⏸️ Stopped")
 
+with st.sidebar.expander("📜 Run History", expanded=False):
+    run_history = scheduler.get_run_history(limit=10)
+    if run_history:
+        st.dataframe(
+            pd.DataFrame(run_history)[['job', 'started', 'duration_s', 'outcome', 'counts']],
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.caption("No job runs recorded yet.")
+
 
 st.sidebar.markdown("---")
 st.sidebar.caption("Made with ❤️ using Streamlit")
@@ -193,7 +290,8 @@ st.sidebar.caption("Made with ❤️ using Streamlit")
 
 # Helper function to convert sheet to DataFrame
 def sheet_to_df(sheet):
-    data = sheet.get_all_records()
+    # Served from the local cache until Drive reports the spreadsheet changed
+    data = get_sheet_cache().records(sheet)
     if not data:
         headers = sheet.row_values(1)
         if headers:
@@ -205,20 +303,38 @@ def sheet_to_df(sheet):
 # Helper function to append row to sheet with debugging
 def append_to_sheet(sheet, row):
     try:
-        sheet.append_row([str(v) for v in row.values])
+        with span('sheets.append', sheet=sheet.title):
+            sheet.append_row([str(v) for v in row.values])
+        get_sheet_cache().note_write(sheet)
         st.success("Row appended successfully!")
-        data = sheet.get_all_records()
-        # st.info(f"Sheet data after append: {data}")
+        return True
     except Exception as e:
         st.error(f"Append failed: {str(e)}")
+        return False
+
+
+# Helper function to append several rows in one API call
+def append_rows_to_sheet(sheet, rows):
+    with span('sheets.append', sheet=sheet.title, rows=len(rows)):
+        sheet.append_rows([[str(v) for v in row] for row in rows])
+    get_sheet_cache().note_write(sheet)
+
+
+# Helper function to get the next id from the id column only (no full-sheet read)
+def next_sheet_id(sheet):
+    with span('sheets.read', sheet=sheet.title, column='id'):
+        ids = sheet.col_values(1)[1:]
+    return max([int(v) for v in ids if str(v).isdigit()], default=0) + 1
 
 
 # Helper function to update sheet
 def update_sheet(sheet, df):
-    sheet.clear()
-    sheet.append_row(list(df.columns))
-    for _, row in df.iterrows():
-        sheet.append_row([str(v) for v in row.values])
+    with span('sheets.rewrite', sheet=sheet.title, rows=len(df)):
+        sheet.clear()
+        sheet.append_row(list(df.columns))
+        for _, row in df.iterrows():
+            sheet.append_row([str(v) for v in row.values])
+    get_sheet_cache().note_write(sheet)
 
 
 # ============================================================================
@@ -228,57 +344,61 @@ if page == "🏠 Dashboard":
     st.title("🏠 LinkedIn Automation Dashboard")
     st.markdown("### Your automation hub at a glance")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
-    resources_sheet = client.open("LinkedIn_Resources").worksheet("resources")
-    enhanced_sheet = client.open("LinkedIn_Enhanced_Content").worksheet("enhanced_content")
-    
-    posts_df = sheet_to_df(posts_sheet)
-    resources_df = sheet_to_df(resources_sheet)
-    enhanced_df = sheet_to_df(enhanced_sheet)
+    # Aggregates are maintained by every write path; the sheets are only
+    # read in full when there is nothing materialized yet
+    dashboard_stats = get_dashboard_stats()
+    snapshot = dashboard_stats.snapshot()
+    if snapshot is None:
+        with st.spinner("Building dashboard from Google Sheets..."):
+            posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
+            resources_sheet = open_worksheet("LinkedIn_Resources", "resources")
+            snapshot = dashboard_stats.rebuild(
+                sheet_to_df(posts_sheet).to_dict('records'),
+                sheet_to_df(resources_sheet).to_dict('records'),
+                get_enhancement_store().count()
+            )
+    post_counts = snapshot['posts_by_status']
     
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
-        pending_posts = len(posts_df[posts_df['status'] == 'pending']) if not posts_df.empty and 'status' in posts_df.columns else 0
-        st.metric("📝 Pending Posts", pending_posts)
+        st.metric("📝 Pending Posts", post_counts.get('pending', 0))
     with col2:
-        published_posts = len(posts_df[posts_df['status'] == 'published']) if not posts_df.empty and 'status' in posts_df.columns else 0
-        st.metric("✅ Published Posts", published_posts)
+        st.metric("✅ Published Posts", post_counts.get('published', 0))
     with col3:
-        curated_resources = len(resources_df) if not resources_df.empty else 0
-        st.metric("📚 Curated Resources", curated_resources)
+        st.metric("📚 Curated Resources", snapshot['resources'])
     with col4:
-        enhanced_content = len(enhanced_df) if not enhanced_df.empty else 0
-        st.metric("✨ Enhanced Content", enhanced_content)
+        st.metric("✨ Enhanced Content", snapshot['enhancements'])
+    
+    st.caption(f"Updated {pd.to_datetime(snapshot['updated_at']).strftime('%b %d, %I:%M %p')}")
+    if st.button("🔄 Rebuild from Sheets"):
+        dashboard_stats.invalidate()
+        st.rerun()
     
     st.markdown("---")
     
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("📅 Upcoming Posts")
-        if not posts_df.empty and 'status' in posts_df.columns and 'scheduled_date' in posts_df.columns:
-            upcoming = posts_df[posts_df['status'] == 'pending'].head(5)
-            if len(upcoming) > 0:
-                for _, post in upcoming.iterrows():
-                    with st.expander(f"📌 {post['topic']}", expanded=False):
-                        st.write(f"**Series:** {post['series']}")
-                        st.write(f"**Scheduled:** {post['scheduled_date']}")
-                        st.write(f"**Content Preview:** {post['content'][:200] + '...'}")
-            else:
-                st.info("No upcoming posts. Create some in the Post Scheduler!")
+        if snapshot['upcoming']:
+            for post in snapshot['upcoming'][:5]:
+                with st.expander(f"📌 {post['topic']}", expanded=False):
+                    st.write(f"**Series:** {post['series']}")
+                    st.write(f"**Scheduled:** {post['scheduled_date']}")
+                    st.write(f"**Content Preview:** {post['preview'] + '...'}")
+        elif sum(post_counts.values()):
+            st.info("No upcoming posts. Create some in the Post Scheduler!")
         else:
             st.info("No posts yet. Get started in the Post Scheduler!")
     with col2:
         st.subheader("📚 Recent Resources")
-        if not resources_df.empty and 'created_at' in resources_df.columns:
-            recent = resources_df.sort_values('created_at', ascending=False).head(5)
-            for _, resource in recent.iterrows():
+        if snapshot['recent_resources']:
+            for resource in snapshot['recent_resources']:
                 with st.expander(f"🔗 {resource['title']}", expanded=False):
                     st.write(f"**Type:** {resource['resource_type']}")
                     st.write(f"**Source:** {resource['source']}")
-                    st.write(f"**Relevance Score:** {resource['relevance_score']}/10")
+                    st.write(f"**Relevance Score:** {score_label(resource['relevance_score'])}")
                     st.write(f"**URL:** [{resource['url']}]({resource['url']})")
-                    if pd.notna(resource['summary']):
+                    if resource['summary']:
                         st.write(f"**Summary:** {resource['summary']}")
         else:
             st.info("No resources yet. Start curating in the Resource Curator!")
@@ -303,62 +423,87 @@ elif page == "✨ Content Enhancer":
     if submitted and idea:
         with st.spinner("🤖 AI is enhancing your content..."):
             try:
-                enhanced_versions = st.session_state.ai_service.enhance_content(idea=idea, add_emojis=add_emojis, variations=variations)
-                enhanced_sheet = client.open("LinkedIn_Enhanced_Content").worksheet("enhanced_content")
-                enhanced_df = sheet_to_df(enhanced_sheet)
-                new_id = len(enhanced_df) + 1 if not enhanced_df.empty else 1
-                new_row = pd.DataFrame([{
-                    'id': new_id,
-                    'original_idea': idea,
-                    'enhanced_versions': json.dumps(enhanced_versions),
-                    'add_emojis': add_emojis,
-                    'created_at': datetime.now().isoformat()
-                }])
-                append_to_sheet(enhanced_sheet, new_row.iloc[0])
+                enhanced_versions = get_ai_service().enhance_content(idea=idea, add_emojis=add_emojis, variations=variations)
+                get_enhancement_store().add(idea, enhanced_versions, add_emojis)
+                get_dashboard_stats().enhancement_added()
+                # Keep the versions across reruns so the queue actions below work
+                st.session_state['enhanced_result'] = {'idea': idea, 'versions': enhanced_versions}
                 st.success("✅ Content enhanced successfully!")
-                st.markdown("---")
-                for i, version in enumerate(enhanced_versions, 1):
-                    with st.expander(f"📝 Version {i}", expanded=(i == 1)):
-                        st.markdown(version)
-                        col1, col2 = st.columns([3, 1])
-                        with col1:
-                            if st.button(f"📋 Copy Version {i}", key=f"copy_{i}"):
-                                st.code(version, language=None)
-                        with col2:
-                            if st.button(f"➕ Add to Queue", key=f"add_{i}"):
-                                posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
-                                posts_df = sheet_to_df(posts_sheet)
-                                new_post_id = len(posts_df) + 1 if not posts_df.empty else 1
-                                new_post = pd.DataFrame([{
-                                    'id': new_post_id,
-                                    'series': 'Enhanced Content',
-                                    'topic': idea[:50] + "...",
-                                    'content': version,
-                                    'status': 'pending',
-                                    'scheduled_date': (datetime.now() + timedelta(days=1)).isoformat(),
-                                    'image_url': '',
-                                    'post_url': '',
-                                    'created_at': datetime.now().isoformat(),
-                                    'published_at': ''
-                                }])
-                                append_to_sheet(posts_sheet, new_post.iloc[0])
-                                st.success(f"✅ Version {i} added to post queue!")
             except Exception as e:
                 st.error(f"❌ Error: {str(e)}")
     
+    enhanced_result = st.session_state.get('enhanced_result')
+    if enhanced_result:
+        enhanced_versions = enhanced_result['versions']
+        st.markdown("---")
+        for i, version in enumerate(enhanced_versions, 1):
+            with st.expander(f"📝 Version {i}", expanded=(i == 1)):
+                warn_if_duplicate(version)
+                st.markdown(version)
+                if st.button(f"📋 Copy Version {i}", key=f"copy_{i}"):
+                    st.code(version, language=None)
+        
+        # Stage the chosen versions and queue them with one batched write
+        with st.form("queue_versions_form"):
+            selected_versions = st.multiselect(
+                "Versions to add to the queue",
+                options=list(range(1, len(enhanced_versions) + 1)),
+                default=[1],
+                format_func=lambda i: f"Version {i}"
+            )
+            col1, col2 = st.columns(2)
+            with col1:
+                first_post_date = st.date_input("First post date", value=datetime.now().date() + timedelta(days=1))
+            with col2:
+                days_between = st.number_input("Days between posts", min_value=0, max_value=30, value=1)
+            queue_submitted = st.form_submit_button("➕ Add Selected to Queue", use_container_width=True)
+        
+        if queue_submitted and selected_versions:
+            try:
+                posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
+                next_id = next_sheet_id(posts_sheet)
+                post_time = datetime.now().time().replace(second=0, microsecond=0)
+                created_at = datetime.now().isoformat()
+                new_posts = []
+                for offset, i in enumerate(selected_versions):
+                    scheduled = datetime.combine(first_post_date + timedelta(days=offset * days_between), post_time)
+                    new_posts.append({
+                        'id': next_id + offset,
+                        'series': 'Enhanced Content',
+                        'topic': enhanced_result['idea'][:50] + "...",
+                        'content': enhanced_versions[i - 1],
+                        'status': 'pending',
+                        'scheduled_date': scheduled.isoformat(),
+                        'image_url': '',
+                        'post_url': '',
+                        'created_at': created_at,
+                        'published_at': ''
+                    })
+                append_rows_to_sheet(posts_sheet, [list(p.values()) for p in new_posts])
+                get_dashboard_stats().posts_added(new_posts)
+                load_post_index().add_many((p['content'], post_label(p)) for p in new_posts)
+                get_scheduler_service().sync_post_jobs()
+                st.success(f"✅ Added {len(new_posts)} version(s) to the post queue!")
+            except Exception as e:
+                st.error(f"❌ Error adding to queue: {str(e)}")
+    
     st.markdown("---")
     st.subheader("📜 Enhancement History")
-    enhanced_sheet = client.open("LinkedIn_Enhanced_Content").worksheet("enhanced_content")
-    enhanced_df = sheet_to_df(enhanced_sheet)
-    if not enhanced_df.empty and 'created_at' in enhanced_df.columns:
-        enhanced_df['created_at'] = pd.to_datetime(enhanced_df['created_at'])
-        enhanced_df = enhanced_df.sort_values('created_at', ascending=False)
-        for _, row in enhanced_df.head(10).iterrows():
-            with st.expander(f"💡 {row['original_idea'][:60]}... - {row['created_at'].strftime('%Y-%m-%d %H:%M')}"):
+    history_query = st.text_input("🔎 Search past ideas", placeholder="e.g. fastapi async")
+    enhancement_store = get_enhancement_store()
+    history = enhancement_store.search(history_query) if history_query.strip() else enhancement_store.recent(10)
+    if history:
+        for row in history:
+            created_at = pd.to_datetime(row['created_at'])
+            with st.expander(f"💡 {row['original_idea'][:60]}... - {created_at.strftime('%Y-%m-%d %H:%M')}"):
                 st.write("**Original Idea:**")
                 st.info(row['original_idea'])
-                versions = json.loads(row['enhanced_versions'])
-                st.write(f"**Generated {len(versions)} versions** (Emojis: {'✅' if row['add_emojis'] else '❌'})")
+                st.write(f"**Generated {row['version_count']} versions** (Emojis: {'✅' if row['add_emojis'] else '❌'})")
+                for i, version in enumerate(row['versions'], 1):
+                    st.markdown(f"**Version {i}**")
+                    st.markdown(version)
+    elif history_query.strip():
+        st.info("No past ideas match your search.")
     else:
         st.info("No enhancement history yet.")
 
@@ -399,22 +544,18 @@ elif page == "📅 Post Scheduler":
             submit_queue = col_btn1.form_submit_button("➕ Add to Queue", use_container_width=True)
             submit_instant = col_btn2.form_submit_button("🚀 Post Instantly", use_container_width=True)
 
-        # Handle image upload
+        # Handle image upload: stored by content hash, upload copy prepared now
         image_path = None
         if uploaded_image is not None:
-            temp_dir = "temp_images"
-            if not os.path.exists(temp_dir):
-                os.makedirs(temp_dir)
-            image_path = os.path.join(temp_dir, uploaded_image.name)
-            with open(image_path, "wb") as f:
-                f.write(uploaded_image.getbuffer())
-            st.info(f"📸 Image '{uploaded_image.name}' ready")
+            media_store = get_media_store()
+            image_path = media_store.put(bytes(uploaded_image.getbuffer()), uploaded_image.name)
+            upload_size = os.path.getsize(media_store.prepare(image_path))
+            st.info(f"📸 Image '{uploaded_image.name}' ready ({uploaded_image.size // 1024} KB → {upload_size // 1024} KB for upload)")
 
         # ADD TO QUEUE
         if submit_queue and series and topic and content:
-            posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
-            posts_df = sheet_to_df(posts_sheet)
-            new_id = len(posts_df) + 1 if not posts_df.empty else 1
+            posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
+            new_id = next_sheet_id(posts_sheet)
 
             scheduled_datetime = datetime.combine(scheduled_date, scheduled_time)
 
@@ -431,15 +572,19 @@ elif page == "📅 Post Scheduler":
                 'published_at': ''
             }])
 
-            append_to_sheet(posts_sheet, new_post.iloc)
-            st.success(f"✅ Post added to queue! Scheduled for {scheduled_datetime.strftime('%Y-%m-%d %I:%M %p')}")
-            st.balloons()
+            warn_if_duplicate(content)
+            if append_to_sheet(posts_sheet, new_post.iloc[0]):
+                get_dashboard_stats().posts_added([new_post.iloc[0].to_dict()])
+                load_post_index().add(content, post_label(new_post.iloc[0]))
+                get_scheduler_service().sync_post_jobs()
+                st.success(f"✅ Post added to queue! Scheduled for {scheduled_datetime.strftime('%Y-%m-%d %I:%M %p')}")
+                st.balloons()
 
         # POST INSTANTLY
         if submit_instant and topic and content:
             with st.spinner("Opening browser and posting…"):
                 try:
-                    post_url = st.session_state.linkedin_service.create_post(
+                    post_url = get_linkedin_service().create_post(
                         content=content,
                         image_url=image_path
                     )
@@ -454,9 +599,8 @@ elif page == "📅 Post Scheduler":
                         st.success(f"✅ Posted instantly!")
                         st.balloons()
                     
-                    posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
-                    posts_df = sheet_to_df(posts_sheet)
-                    new_id = len(posts_df) + 1 if not posts_df.empty else 1
+                    posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
+                    new_id = next_sheet_id(posts_sheet)
                     
                     new_row = pd.DataFrame([{
                         'id': new_id,
@@ -471,7 +615,9 @@ elif page == "📅 Post Scheduler":
                         'published_at': now_iso if status == "published" else ''
                     }])
                     
-                    append_to_sheet(posts_sheet, new_row.iloc)
+                    if append_to_sheet(posts_sheet, new_row.iloc[0]):
+                        get_dashboard_stats().posts_added([new_row.iloc[0].to_dict()])
+                        load_post_index().add(content, post_label(new_row.iloc[0]))
                     
                 except Exception as e:
                     st.error(f"An error occurred: {e}")
@@ -512,10 +658,11 @@ elif page == "📅 Post Scheduler":
             with st.spinner(f"🤖 AI is generating {num_posts} posts about '{ai_topic}'... This may take 30-60 seconds..."):
                 try:
                     # Generate posts using AI
-                    generated_posts = st.session_state.ai_service.generate_post_series(
+                    generated_posts = get_ai_service().generate_post_series(
                         topic=ai_topic,
                         num_posts=num_posts,
-                        add_emojis=add_emojis
+                        add_emojis=add_emojis,
+                        is_duplicate=load_post_index().is_duplicate
                     )
                     
                     st.success(f"✅ Generated {len(generated_posts)} posts!")
@@ -529,6 +676,65 @@ elif page == "📅 Post Scheduler":
                 except Exception as e:
                     st.error(f"❌ AI generation failed: {e}")
 
+        # Long series are better planned: the scheduler writes them off-peak
+        st.markdown("---")
+        st.subheader("🗓️ Background Series Plans")
+        st.caption("The scheduler writes the next posts of each plan overnight and keeps a buffer of "
+                   "validated posts pending in the queue, so here you only review them.")
+        planner = get_series_planner()
+        
+        with st.expander("➕ New series plan"):
+            with st.form("series_plan_form"):
+                plan_series = st.text_input("📚 Series Name", key="plan_series")
+                plan_topic = st.text_area("📝 Topic/Theme", height=80, key="plan_topic")
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    plan_total = st.number_input("Total posts", min_value=1, max_value=365, value=30)
+                    plan_start = st.date_input("First post", value=datetime.now() + timedelta(days=1), key="plan_start")
+                with col2:
+                    plan_cadence = st.number_input("Days between posts", min_value=1, max_value=14, value=1, key="plan_cadence")
+                    plan_time = st.time_input("Post time", value=datetime.now().replace(hour=9, minute=0), key="plan_time")
+                with col3:
+                    plan_buffer = st.number_input("Posts kept ready", min_value=1, max_value=30, value=5)
+                    plan_emojis = st.checkbox("✨ Professional Emojis", value=True, key="plan_emojis")
+                plan_submitted = st.form_submit_button("🗓️ Create Plan", use_container_width=True)
+            
+            if plan_submitted and plan_series and plan_topic:
+                planner.add(plan_series, plan_topic, plan_total, plan_start, plan_time,
+                            cadence_days=plan_cadence, buffer=plan_buffer, add_emojis=plan_emojis)
+                st.success(f"✅ Plan created. The first {min(plan_buffer, plan_total)} posts are written on the next pre-generation run.")
+        
+        plans = planner.plans()
+        if plans:
+            queued_df = sheet_to_df(open_worksheet("LinkedIn_Posts", "posts"))
+            for plan in plans:
+                ready = SeriesPlanner.ready_posts(plan, queued_df)
+                
+                with st.expander(f"📚 {plan['series']}: {plan['generated']}/{plan['total_posts']} written, "
+                                 f"{len(ready)} ready ({plan['status']})"):
+                    st.write(f"**Topic:** {plan['topic']}")
+                    st.caption(f"Every {plan['cadence_days']} day(s) at {plan['post_time']} from {plan['start_date']}, "
+                               f"keeping {plan['buffer']} ready. Last run: {plan['last_run'] or 'never'}")
+                    for _, post in ready.iterrows():
+                        st.markdown(f"**{post['topic']}** · {post['scheduled_date']}")
+                        st.text(str(post['content'])[:500])
+                    
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        if plan['status'] != 'done':
+                            paused = plan['status'] == 'paused'
+                            if st.button("▶️ Resume" if paused else "⏸️ Pause", key=f"plan_toggle_{plan['id']}"):
+                                planner.update(plan['id'], status='active' if paused else 'paused')
+                                st.rerun()
+                    with col2:
+                        if st.button("🗑️ Remove Plan", key=f"plan_remove_{plan['id']}"):
+                            planner.remove(plan['id'])
+                            st.rerun()
+            
+            if st.button("⚡ Fill buffers now"):
+                get_scheduler_service().pregenerate_now()
+                st.info("⏳ Pre-generation started in the background; new posts appear in the queue when it finishes.")
+        
         # Display generated posts for review
         if 'generated_posts' in st.session_state:
             st.markdown("---")
@@ -551,6 +757,8 @@ elif page == "📅 Post Scheduler":
                 ):
                     st.markdown(f"**Series:** {ai_series_name}")
                     st.markdown(f"**Post Date:** {scheduled_datetime.strftime('%A, %B %d, %Y at %I:%M %p')}")
+                    if post.get('duplicate'):
+                        warn_if_duplicate(post['content'])
                     st.markdown("**Content:**")
                     st.text_area(
                         label="Post Content",
@@ -576,11 +784,11 @@ elif page == "📅 Post Scheduler":
                 if st.button("✅ Schedule All Posts to Queue", use_container_width=True, type="primary"):
                     with st.spinner("Scheduling all posts..."):
                         try:
-                            posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
-                            posts_df = sheet_to_df(posts_sheet)
-                            base_id = len(posts_df) + 1 if not posts_df.empty else 1
+                            posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
+                            base_id = next_sheet_id(posts_sheet)
                             
                             scheduled_count = 0
+                            scheduled_posts = []
                             for i, post in enumerate(generated_posts):
                                 scheduled_date = start_date + timedelta(days=i)
                                 scheduled_datetime = datetime.combine(scheduled_date, post_time)
@@ -603,10 +811,15 @@ elif page == "📅 Post Scheduler":
                                 try:
                                     posts_sheet.append_row([str(v) for v in new_post_data.values()])
                                     scheduled_count += 1
+                                    scheduled_posts.append(new_post_data)
                                 except Exception as append_error:
                                     st.error(f"Failed to schedule post {i+1}: {append_error}")
                             
                             if scheduled_count > 0:
+                                get_sheet_cache().note_write(posts_sheet)
+                                get_dashboard_stats().posts_added(scheduled_posts)
+                                load_post_index().add_many((p['content'], post_label(p)) for p in scheduled_posts)
+                                get_scheduler_service().sync_post_jobs()
                                 st.success(f"✅ Successfully scheduled {scheduled_count}/{len(generated_posts)} posts!")
                                 st.balloons()
                                 
@@ -629,11 +842,11 @@ elif page == "📅 Post Scheduler":
                 if st.button("💾 Save as Draft", use_container_width=True):
                     with st.spinner("Saving as drafts..."):
                         try:
-                            posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
-                            posts_df = sheet_to_df(posts_sheet)
-                            base_id = len(posts_df) + 1 if not posts_df.empty else 1
+                            posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
+                            base_id = next_sheet_id(posts_sheet)
                             
                             saved_count = 0
+                            saved_drafts = []
                             for i, post in enumerate(generated_posts):
                                 new_draft_data = {
                                     'id': base_id + i,
@@ -651,10 +864,14 @@ elif page == "📅 Post Scheduler":
                                 try:
                                     posts_sheet.append_row([str(v) for v in new_draft_data.values()])
                                     saved_count += 1
+                                    saved_drafts.append(new_draft_data)
                                 except Exception as append_error:
                                     st.error(f"Failed to save draft {i+1}: {append_error}")
                             
                             if saved_count > 0:
+                                get_sheet_cache().note_write(posts_sheet)
+                                get_dashboard_stats().posts_added(saved_drafts)
+                                load_post_index().add_many((p['content'], post_label(p)) for p in saved_drafts)
                                 st.success(f"✅ Saved {saved_count}/{len(generated_posts)} posts as drafts!")
                                 
                                 # Clear session state
@@ -690,7 +907,7 @@ elif page == "📅 Post Scheduler":
                     # TAB 3: POST QUEUE
                     with tab3:
                         st.subheader("Post Queue Management")
-                        posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
+                        posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
                         posts_df = sheet_to_df(posts_sheet)
                         
                         if not posts_df.empty and 'status' in posts_df.columns and 'scheduled_date' in posts_df.columns:
@@ -752,7 +969,7 @@ elif page == "📅 Post Scheduler":
                                             if st.button("🚀 Post Now", key=f"post_now_{post['id']}"):
                                                 with st.spinner("Publishing..."):
                                                     try:
-                                                        post_url = st.session_state.linkedin_service.create_post(
+                                                        post_url = get_linkedin_service().create_post(
                                                             content=post['content'],
                                                             image_url=post['image_url'] if post['image_url'] else None
                                                         )
@@ -760,6 +977,8 @@ elif page == "📅 Post Scheduler":
                                                         posts_df.loc[posts_df['id'] == post['id'], 'post_url'] = post_url
                                                         posts_df.loc[posts_df['id'] == post['id'], 'published_at'] = datetime.now().isoformat()
                                                         update_sheet(posts_sheet, posts_df)
+                                                        get_dashboard_stats().post_status_changed(post, post['status'], 'published')
+                                                        get_scheduler_service().sync_post_jobs(posts_df)
                                                         st.success(f"✅ Published!")
                                                         st.rerun()
                                                     except Exception as e:
@@ -768,6 +987,11 @@ elif page == "📅 Post Scheduler":
                                         if st.button("🗑️ Delete", key=f"delete_{post['id']}"):
                                             posts_df = posts_df[posts_df['id'] != post['id']]
                                             update_sheet(posts_sheet, posts_df)
+                                            get_dashboard_stats().posts_removed([post])
+                                            # A removed draft or pending post no longer counts as a repeat
+                                            if post['status'] != 'published':
+                                                load_post_index().remove(post['content'])
+                                            get_scheduler_service().sync_post_jobs(posts_df)
                                             st.success("Deleted!")
                                             st.rerun()
                         else:
@@ -778,7 +1002,7 @@ elif page == "📅 Post Scheduler":
                     # ============================================================================
                     with tab4:
                         st.subheader("Post Analytics")
-                        posts_sheet = client.open("LinkedIn_Posts").worksheet("posts")
+                        posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
                         posts_df = sheet_to_df(posts_sheet)
                         
                         if not posts_df.empty and 'status' in posts_df.columns:
@@ -859,6 +1083,11 @@ elif page == "📚 Resource Curator":
                 for i, topic in enumerate(topics, 1):
                     st.write(f"{i}. {topic}")
         
+        with st.expander("📊 Search source performance", expanded=False):
+            source_stats = get_curation_service().get_source_stats()
+            st.dataframe(pd.DataFrame(source_stats), use_container_width=True)
+            st.caption("Sources are tried best-first by unique results per second; failing or slow sources are skipped until their cooldown ends.")
+        
         # Search button
         if st.button("🚀 Search SlideShare & Download PDFs", type="primary", disabled=not topics):
             
@@ -873,7 +1102,7 @@ elif page == "📚 Resource Curator":
             # Run curation
             with st.spinner("Searching SlideShare..."):
                 try:
-                    resources = st.session_state.curation_service.curate_resources_from_topics(
+                    resources = get_curation_service().curate_resources_from_topics(
                         topics=topics,
                         max_per_topic=max_per_topic,
                         progress_callback=update_progress
@@ -887,7 +1116,7 @@ elif page == "📚 Resource Curator":
                         st.subheader("📥 Downloaded Resources")
                         
                         for resource in resources:
-                            with st.expander(f"📄 {resource['title']} (Score: {resource['relevance_score']:.1f}/10)"):
+                            with st.expander(f"📄 {resource['title']} (Score: {score_label(resource['relevance_score'])})"):
                                 col1, col2 = st.columns([2, 1])
                                 
                                 with col1:
@@ -897,6 +1126,8 @@ elif page == "📚 Resource Curator":
                                     
                                     if resource.get('draft_post'):
                                         st.markdown("**📝 LinkedIn Draft Post:**")
+                                        if resource.get('duplicate_of'):
+                                            st.warning(f"⚠️ Very similar to {resource['duplicate_of']}")
                                         st.text_area(
                                             "Draft",
                                             value=resource['draft_post'],
@@ -910,15 +1141,16 @@ elif page == "📚 Resource Curator":
                                         with st.spinner("Posting to LinkedIn..."):
                                             try:
                                                 if resource.get('local_pdf_path'):
-                                                    post_url = st.session_state.linkedin_service.create_post_with_pdf(
+                                                    post_url = get_linkedin_service().create_post_with_pdf(
                                                         content=resource['draft_post'],
                                                         pdf_path=resource['local_pdf_path']
                                                     )
                                                 else:
-                                                    post_url = st.session_state.linkedin_service.create_post(
+                                                    post_url = get_linkedin_service().create_post(
                                                         content=resource['draft_post']
                                                     )
                                                 
+                                                load_post_index().add(resource['draft_post'], f"resource post: {resource['title'][:40]}")
                                                 st.success(f"✅ Posted! {post_url}")
                                             except Exception as e:
                                                 st.error(f"❌ Failed: {e}")
@@ -929,14 +1161,15 @@ elif page == "📚 Resource Curator":
                             top_resource = resources[0]
                             try:
                                 if top_resource.get('local_pdf_path'):
-                                    post_url = st.session_state.linkedin_service.create_post_with_pdf(
+                                    post_url = get_linkedin_service().create_post_with_pdf(
                                         content=top_resource['draft_post'],
                                         pdf_path=top_resource.get('local_pdf_path', '')
                                     )
                                 else:
-                                    post_url = st.session_state.linkedin_service.create_post(
+                                    post_url = get_linkedin_service().create_post(
                                         content=top_resource['draft_post']
                                     )
+                                load_post_index().add(top_resource['draft_post'], f"resource post: {top_resource['title'][:40]}")
                                 st.success(f"✅ Auto-posted: {post_url}")
                             except Exception as e:
                                 st.error(f"❌ Auto-post failed: {e}")
@@ -955,7 +1188,7 @@ elif page == "📚 Resource Curator":
         
         # Load from Google Sheets
         try:
-            resources_sheet = client.open("LinkedIn_Resources").worksheet("resources")
+            resources_sheet = open_worksheet("LinkedIn_Resources", "resources")
             resources_df = sheet_to_df(resources_sheet)
             
             if not resources_df.empty:
@@ -983,14 +1216,15 @@ elif page == "📚 Resource Curator":
                         with st.spinner("Posting..."):
                             try:
                                 if resource_row.get('local_pdf_path'):
-                                    post_url = st.session_state.linkedin_service.create_post_with_pdf(
+                                    post_url = get_linkedin_service().create_post_with_pdf(
                                         content=resource_row['draft_post'],
                                         pdf_path=resource_row.get('local_pdf_path', '')
                                     )
                                 else:
-                                    post_url = st.session_state.linkedin_service.create_post(
+                                    post_url = get_linkedin_service().create_post(
                                         content=resource_row['draft_post']
                                     )
+                                load_post_index().add(resource_row['draft_post'], f"resource post: {selected_title[:40]}")
                                 st.success(f"✅ Posted! {post_url}")
                             except Exception as e:
                                 st.error(f"❌ Failed: {e}")
@@ -1000,6 +1234,76 @@ elif page == "📚 Resource Curator":
         except Exception as e:
             st.error(f"❌ Error loading resources: {e}")
 
+# ============================================================================
+# PAGE: PERFORMANCE
+# ============================================================================
+elif page == "📈 Performance":
+    st.title("📈 Performance")
+    st.markdown("### Where time goes in Gemini, search, downloads, Sheets and Selenium")
+    
+    span_limit = st.selectbox("Spans to analyze", [500, 2000, 5000, 20000], index=2)
+    spans = read_spans(limit=span_limit)
+    
+    if not spans:
+        st.info("No traces recorded yet. Spans are written to state/traces.jsonl as the app and scheduler run.")
+    else:
+        summary_df = pd.DataFrame(summarize(spans))
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Spans", len(spans))
+        with col2:
+            st.metric("Errors", int(summary_df['errors'].sum()))
+        with col3:
+            st.metric("Since", datetime.fromtimestamp(spans[0]['start']).strftime('%b %d, %H:%M'))
+        
+        st.markdown("#### Summary by span")
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+        st.bar_chart(summary_df.set_index('span')['total_s'])
+        
+        st.markdown("#### Slowest spans")
+        selected = st.multiselect("Filter by span", summary_df['span'].tolist())
+        slowest = [r for r in spans if not selected or r['name'] in selected]
+        slowest = sorted(slowest, key=lambda r: -r['duration_ms'])[:50]
+        st.dataframe(pd.DataFrame([{
+            'span': r['name'],
+            'started': datetime.fromtimestamp(r['start']).strftime('%Y-%m-%d %H:%M:%S'),
+            'duration_ms': r['duration_ms'],
+            'status': r['status'],
+            'attributes': json.dumps(r.get('attributes', {}), default=str),
+            'error': r.get('error', '')
+        } for r in slowest]), use_container_width=True, hide_index=True)
+    
+    st.markdown("---")
+    st.markdown("#### 💰 Gemini token usage")
+    ledger = get_token_ledger()
+    usage_rows = ledger.usage(days=30)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        daily_budget = ledger.budget()
+        st.metric("Tokens today", f"{ledger.used_today():,}",
+                  help=f"Daily budget: {daily_budget:,}" if daily_budget else "No daily budget set")
+    with col2:
+        st.metric("Calls today", sum(r['calls'] for r in usage_rows if r['day'] == datetime.now().date().isoformat()))
+    
+    if usage_rows:
+        usage_df = pd.DataFrame(usage_rows)
+        st.bar_chart(usage_df.pivot_table(index='day', columns='task', values='total_tokens', aggfunc='sum'))
+        st.dataframe(usage_df, use_container_width=True, hide_index=True)
+    else:
+        st.info("No Gemini usage recorded yet.")
+    
+    st.markdown("---")
+    st.markdown("#### 🎯 LinkedIn selector hit rate")
+    st.caption("How often the selector that worked last time found each composer element on the first try.")
+    from services.selector_registry import get_selector_registry
+    selector_rows = get_selector_registry().summary()
+    if selector_rows:
+        st.dataframe(pd.DataFrame(selector_rows), use_container_width=True, hide_index=True)
+    else:
+        st.info("No composer lookups recorded yet.")
+
 # ============================================================================
 # PAGE: SETTINGS
 # ============================================================================
@@ -1007,7 +1311,7 @@ elif page == "⚙️ Settings":
     st.title("⚙️ Settings")
     st.markdown("### Configure your automation")
     
-    tab1, tab2 = st.tabs(["🔑 API Keys", "📅 Schedule"])
+    tab1, tab2, tab3 = st.tabs(["🔑 API Keys", "📅 Schedule", "⏱️ Startup"])
     
     with tab1:
         st.subheader("API Configuration")
@@ -1026,7 +1330,7 @@ elif page == "⚙️ Settings":
     
     with tab2:
         st.subheader("Automation Schedule")
-        col1, col2 = st.columns(2)
+        col1, col2, col3 = st.columns(3)
         with col1:
             st.markdown("#### 📅 Post Schedule")
             post_hour = st.slider("Hour (24h)", 0, 23, 9, key="post_hour")
@@ -1037,8 +1341,27 @@ elif page == "⚙️ Settings":
             curation_hour = st.slider("Hour (24h)", 0, 23, 8, key="curation_hour")
             curation_minute = st.slider("Minute", 0, 59, 0, key="curation_minute")
             st.info(f"Curation will run daily at {curation_hour:02d}:{curation_minute:02d}")
+        with col3:
+            st.markdown("#### 🗓️ Series Pre-generation")
+            pregenerate_hour = st.slider("Hour (24h)", 0, 23, 3, key="pregenerate_hour")
+            pregenerate_minute = st.slider("Minute", 0, 59, 0, key="pregenerate_minute")
+            st.info(f"Series plans will be topped up daily at {pregenerate_hour:02d}:{pregenerate_minute:02d}")
         if st.button("💾 Update Schedule"):
-            scheduler = st.session_state.scheduler_service
+            scheduler = get_scheduler_service()
             scheduler.update_schedule('daily_post', post_hour, post_minute)
             scheduler.update_schedule('daily_curation', curation_hour, curation_minute)
+            scheduler.update_schedule('pregenerate_series', pregenerate_hour, pregenerate_minute)
             st.success("✅ Schedule updated!")
+    
+    with tab3:
+        st.subheader("Startup Timing")
+        st.caption("Time spent on first-time initialization in this process. Services are created on first use, so entries appear as pages need them.")
+        timings = get_startup_timings()
+        if timings:
+            timings_df = pd.DataFrame(
+                [{'step': label, 'seconds': round(elapsed, 3)} for label, elapsed in timings.items()]
+            )
+            st.dataframe(timings_df, use_container_width=True)
+            st.metric("Total", f"{sum(timings.values()):.2f}s")
+        else:
+            st.info("No startup timings recorded yet.")
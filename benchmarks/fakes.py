@@ -0,0 +1,277 @@
+"""In-process stand-ins for gspread and Gemini used by the benchmarks"""
+import json
+import re
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Dict, List
+
+_A1_RE = re.compile(r'^([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?$')
+
+
+def _col_index(letters: str) -> int:
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - ord('A') + 1)
+    return index
+
+
+def _numericise(value):
+    """Mimic gspread's get_all_records() number conversion"""
+    if not isinstance(value, str) or value == '':
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+class QuotaExceeded(Exception):
+    """Raised like gspread's APIError when the per-minute request quota is used up"""
+
+    def __init__(self, message: str = '429 RESOURCE_EXHAUSTED: quota exceeded'):
+        super().__init__(message)
+        self.response = SimpleNamespace(status_code=429, headers={'Retry-After': '60'})
+
+
+class FakeSheetsClient:
+    """gspread client substitute with per-request latency and a rolling quota.
+
+    Every worksheet call counts as one API request, as it would against the
+    real Sheets API; set quota_per_minute=None to disable the quota.
+    """
+
+    def __init__(self, latency: float = 0.05, quota_per_minute: int = 60):
+        self.latency = latency
+        self.quota_per_minute = quota_per_minute
+        self.request_count = 0
+        self.quota_errors = 0
+        self._recent = deque()
+        self._lock = threading.Lock()
+        self._spreadsheets: Dict[str, 'FakeSpreadsheet'] = {}
+
+    def _request(self):
+        with self._lock:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] > 60:
+                self._recent.popleft()
+            if self.quota_per_minute is not None and len(self._recent) >= self.quota_per_minute:
+                self.quota_errors += 1
+                raise QuotaExceeded()
+            self._recent.append(now)
+            self.request_count += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def reset_quota(self):
+        with self._lock:
+            self._recent.clear()
+
+    def seed(self, title: str, worksheet: str, headers: List[str], rows: List[List] = None) -> 'FakeWorksheet':
+        """Create (or replace) a worksheet with headers and rows, without using quota"""
+        spreadsheet = self._spreadsheets.setdefault(title, FakeSpreadsheet(self, title))
+        ws = FakeWorksheet(spreadsheet, worksheet)
+        ws.rows = [list(headers)] + [[str(v) for v in row] for row in (rows or [])]
+        spreadsheet.worksheets[worksheet] = ws
+        spreadsheet.touch()
+        return ws
+
+    def list_spreadsheet_files(self) -> List[Dict]:
+        """Drive listing with each spreadsheet's modifiedTime (one request)"""
+        self._request()
+        return [{'id': title, 'name': title, 'modifiedTime': s.modified_time}
+                for title, s in self._spreadsheets.items()]
+
+    def open(self, title: str) -> 'FakeSpreadsheet':
+        self._request()
+        if title not in self._spreadsheets:
+            self._spreadsheets[title] = FakeSpreadsheet(self, title)
+        return self._spreadsheets[title]
+
+    def create(self, title: str) -> 'FakeSpreadsheet':
+        self._request()
+        self._spreadsheets[title] = FakeSpreadsheet(self, title)
+        return self._spreadsheets[title]
+
+
+class FakeSpreadsheet:
+    def __init__(self, client: FakeSheetsClient, title: str):
+        self.client = client
+        self.title = title
+        self.worksheets: Dict[str, FakeWorksheet] = {}
+        self.revision = 0
+        self.modified_time = ''
+        self.touch()
+
+    def touch(self):
+        """Advance the Drive modifiedTime, as any edit does"""
+        self.revision += 1
+        self.modified_time = f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime())}.{self.revision:03d}Z"
+
+    def worksheet(self, name: str) -> 'FakeWorksheet':
+        self.client._request()
+        if name not in self.worksheets:
+            self.worksheets[name] = FakeWorksheet(self, name)
+        return self.worksheets[name]
+
+    def add_worksheet(self, name: str, rows: int = 1, cols: int = 1) -> 'FakeWorksheet':
+        self.client._request()
+        self.worksheets[name] = FakeWorksheet(self, name)
+        self.touch()
+        return self.worksheets[name]
+
+
+class FakeWorksheet:
+    """A worksheet held as a list of string rows (row 1 is the header)"""
+
+    def __init__(self, spreadsheet: FakeSpreadsheet, title: str):
+        self.spreadsheet = spreadsheet
+        self.client = spreadsheet.client
+        self.title = title
+        self.rows: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def row_count(self) -> int:
+        return len(self.rows)
+
+    def get_all_values(self) -> List[List[str]]:
+        self.client._request()
+        with self._lock:
+            return [list(row) for row in self.rows]
+
+    def get_all_records(self, **kwargs) -> List[Dict]:
+        self.client._request()
+        with self._lock:
+            if not self.rows:
+                return []
+            headers = self.rows[0]
+            return [
+                {h: _numericise(row[i] if i < len(row) else '') for i, h in enumerate(headers)}
+                for row in self.rows[1:]
+            ]
+
+    def row_values(self, index: int) -> List[str]:
+        self.client._request()
+        with self._lock:
+            return list(self.rows[index - 1]) if index <= len(self.rows) else []
+
+    def col_values(self, col: int) -> List[str]:
+        self.client._request()
+        with self._lock:
+            return [row[col - 1] for row in self.rows if len(row) >= col]
+
+    def append_row(self, values: List, **kwargs):
+        self.client._request()
+        self.spreadsheet.touch()
+        with self._lock:
+            self.rows.append([str(v) for v in values])
+
+    def append_rows(self, values: List[List], **kwargs):
+        self.client._request()
+        self.spreadsheet.touch()
+        with self._lock:
+            self.rows.extend([str(v) for v in row] for row in values)
+
+    def update_cell(self, row: int, col: int, value):
+        self.client._request()
+        self.spreadsheet.touch()
+        with self._lock:
+            self._set(row, col, value)
+
+    def batch_update(self, data: List[Dict], **kwargs):
+        self.client._request()
+        self.spreadsheet.touch()
+        with self._lock:
+            for item in data:
+                match = _A1_RE.match(item['range'])
+                if not match:
+                    raise ValueError(f"Unsupported range {item['range']}")
+                start_row, start_col = int(match.group(2)), _col_index(match.group(1))
+                for r, row in enumerate(item['values']):
+                    for c, value in enumerate(row):
+                        self._set(start_row + r, start_col + c, value)
+
+    def delete_rows(self, start_index: int, end_index: int = None):
+        self.client._request()
+        self.spreadsheet.touch()
+        with self._lock:
+            del self.rows[start_index - 1:(end_index or start_index)]
+
+    def clear(self):
+        self.client._request()
+        self.spreadsheet.touch()
+        with self._lock:
+            self.rows = []
+
+    def _set(self, row: int, col: int, value):
+        while len(self.rows) < row:
+            self.rows.append([])
+        cells = self.rows[row - 1]
+        while len(cells) < col:
+            cells.append('')
+        cells[col - 1] = str(value)
+
+
+class StubGenerativeModel:
+    """Gemini GenerativeModel substitute returning well-formed canned output.
+
+    The reply shape is chosen from the prompt the same way the real prompts
+    ask for it: a number for relevance ratings, a JSON array for post
+    series and enhancement variations, plain text otherwise.
+    """
+
+    _SERIES_RE = re.compile(r'Create (\d+) LinkedIn posts.*?Day (\d+) to Day (\d+)', re.S)
+    _VARIATIONS_RE = re.compile(r'into (\d+) different professional LinkedIn posts')
+
+    def __init__(self, latency: float = 0.2, model_name: str = 'models/stub-gemini'):
+        self.latency = latency
+        self.model_name = model_name
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, generation_config=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        text = self._reply(prompt)
+        return SimpleNamespace(
+            text=text,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=len(prompt) // 4,
+                candidates_token_count=len(text) // 4,
+                total_token_count=(len(prompt) + len(text)) // 4
+            )
+        )
+
+    def _reply(self, prompt: str) -> str:
+        if 'Return ONLY a number' in prompt:
+            return str(5 + len(prompt) % 5)
+
+        series = self._SERIES_RE.search(prompt)
+        if series:
+            first, last = int(series.group(2)), int(series.group(3))
+            return json.dumps([
+                {'day': day, 'title': f'Concept {day}', 'content': self._post_text(f'day {day}')}
+                for day in range(first, last + 1)
+            ])
+
+        variations = self._VARIATIONS_RE.search(prompt)
+        if variations:
+            return json.dumps([
+                {'version': v, 'content': self._post_text(f'version {v}')}
+                for v in range(1, int(variations.group(1)) + 1)
+            ])
+
+        return self._post_text('draft')
+
+    @staticmethod
+    def _post_text(label: str) -> str:
+        body = ' '.join(['Practical insight for developers building better software.'] * 20)
+        return f"🚀 {label.title()}: {body}\n\n#Python #Learning #Tech"
@@ -0,0 +1,153 @@
+"""Local HTTP site standing in for the search engines, PDF hosts and LinkedIn"""
+import html
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse, urlunparse
+
+COMPOSER_PAGE = """<!DOCTYPE html>
+<html>
+<head><title>Feed | LinkedIn</title></head>
+<body style="height: 3000px">
+  <input id="global-nav-search" placeholder="Search">
+  <button class="share-box-feed-entry__trigger" onclick="openComposer()">Start a post</button>
+  <div id="composer" style="display: none">
+    <div class="ql-editor" contenteditable="true" style="min-height: 100px"></div>
+    <button aria-label="Add media" onclick="showUpload()">Media</button>
+    <button aria-label="Add a document" onclick="showUpload()">Document</button>
+    <div id="upload" style="display: none">
+      <input type="file">
+      <button onclick="this.parentNode.style.display='none'">Done</button>
+    </div>
+    <button class="share-actions__primary-action" onclick="publish()">Post</button>
+  </div>
+  <div id="status"></div>
+  <script>
+    function openComposer() {
+      setTimeout(function () { document.getElementById('composer').style.display = 'block'; }, 200);
+    }
+    function showUpload() { document.getElementById('upload').style.display = 'block'; }
+    function publish() {
+      document.getElementById('composer').style.display = 'none';
+      document.getElementById('status').textContent = 'Post successful';
+    }
+  </script>
+</body>
+</html>
+"""
+
+LOGIN_PAGE = """<!DOCTYPE html>
+<html>
+<body>
+  <form action="/feed/" method="get">
+    <input id="username" name="u">
+    <input id="password" name="p" type="password">
+  </form>
+</body>
+</html>
+"""
+
+
+def make_pdf(title: str, size: int = 20000) -> bytes:
+    """A minimal valid-looking PDF padded to size bytes"""
+    header = f"%PDF-1.4\n% {title}\n".encode('utf-8')
+    return header + b'0' * max(0, size - len(header) - 6) + b'\n%%EOF'
+
+
+class LocalSite:
+    """Threaded HTTP server serving fake search results, PDFs and a composer.
+
+    - /html/?q=...     DuckDuckGo-style result page linking to local PDFs
+    - /search?q=...    GitHub code-search-style page
+    - *.pdf            a PDF of pdf_size bytes
+    - /feed/, /login   LinkedIn-like composer and login pages
+    """
+
+    def __init__(self, results_per_query: int = 5, latency: float = 0.05, pdf_size: int = 20000):
+        self.results_per_query = results_per_query
+        self.latency = latency
+        self.pdf_size = pdf_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def localize(self, url: str) -> str:
+        """Point an external URL at this site, keeping its path and query"""
+        parsed = urlparse(url)
+        local = urlparse(self.base_url)
+        return urlunparse(parsed._replace(scheme=local.scheme, netloc=local.netloc))
+
+    def start(self) -> 'LocalSite':
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with site._lock:
+                    site.requests += 1
+                if site.latency:
+                    time.sleep(site.latency)
+
+                parsed = urlparse(self.path)
+                query = parse_qs(parsed.query).get('q', [''])[0]
+                if parsed.path.lower().endswith('.pdf'):
+                    self._send(make_pdf(parsed.path, site.pdf_size), 'application/pdf')
+                elif parsed.path.startswith('/html'):
+                    self._send(site._search_page(query).encode('utf-8'))
+                elif parsed.path.startswith('/search'):
+                    self._send(site._code_search_page(query).encode('utf-8'))
+                elif parsed.path.startswith('/feed'):
+                    self._send(COMPOSER_PAGE.encode('utf-8'))
+                elif parsed.path.startswith('/login'):
+                    self._send(LOGIN_PAGE.encode('utf-8'))
+                else:
+                    self.send_error(404)
+
+            def _send(self, body: bytes, content_type: str = 'text/html; charset=utf-8'):
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._server.serve_forever, name='bench-site', daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    @staticmethod
+    def _slug(query: str) -> str:
+        return re.sub(r'[^a-z0-9]+', '-', query.lower()).strip('-') or 'topic'
+
+    def _search_page(self, query: str) -> str:
+        topic = query.replace('filetype:pdf', '').strip()
+        slug = self._slug(topic)
+        links = '\n'.join(
+            f'<a class="result__a" href="{self.base_url}/docs/{slug}-guide-{i}.pdf">'
+            f'{html.escape(topic)} guide part {i}</a>'
+            for i in range(1, self.results_per_query + 1)
+        )
+        return f"<html><body>{links}</body></html>"
+
+    def _code_search_page(self, query: str) -> str:
+        topic = query.replace('extension:pdf', '').strip()
+        slug = self._slug(topic)
+        results = '\n'.join(
+            f'<div class="f4"><a href="/{slug}/notes/blob/main/{slug}-notes-{i}.pdf">'
+            f'{html.escape(topic)} notes {i}</a></div>'
+            for i in range(1, self.results_per_query + 1)
+        )
+        return f"<html><body>{results}</body></html>"
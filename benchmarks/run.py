@@ -0,0 +1,336 @@
+"""Offline benchmarks for curation, series generation, queue rendering and publishing.
+
+Run from the repository root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --only curation,series --json results.json
+    python -m benchmarks.run --baseline previous.json --max-regression 0.25
+
+Everything runs against local stand-ins (fake Sheets, stub Gemini, a local
+HTTP site and composer page), so no credentials or network are needed.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCHMARKS = ['curation', 'series', 'queue', 'publish']
+
+TOPICS = [
+    'Python automation',
+    'data structures and algorithms',
+    'machine learning basics',
+    'FastAPI tutorial',
+    'system design interview',
+    'docker containers',
+    'SQL performance tuning',
+    'git workflows'
+]
+
+POSTS_HEADERS = ['id', 'series', 'topic', 'content', 'status', 'scheduled_date',
+                 'image_url', 'post_url', 'created_at', 'published_at']
+RESOURCES_HEADERS = ['id', 'title', 'url', 'resource_type', 'source', 'search_query', 'summary',
+                     'relevance_score', 'local_pdf_path', 'draft_post', 'download_status', 'created_at']
+ENHANCED_HEADERS = ['id', 'original_idea', 'enhanced_versions', 'created_at', 'used']
+
+
+class BenchResult:
+    def __init__(self, name: str, times: List[float], **extra):
+        self.name = name
+        self.times = times
+        self.extra = extra
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'runs': len(self.times),
+            'mean_s': round(statistics.mean(self.times), 4),
+            'p50_s': round(statistics.median(self.times), 4),
+            'min_s': round(min(self.times), 4),
+            'max_s': round(max(self.times), 4),
+            **self.extra
+        }
+
+
+def _timed(func: Callable, repeat: int, before: Callable = None):
+    """Run func repeat times, returning the durations and the last result"""
+    times, result = [], None
+    for _ in range(repeat):
+        if before:
+            before()
+        started = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - started)
+    return times, result
+
+
+def _prepare_environment(workdir: str):
+    """Keep benchmark state, downloads and pacing away from the real setup"""
+    os.environ['STATE_DIR'] = os.path.join(workdir, 'state')
+    os.environ['SCHEDULER_METRICS_PORT'] = '0'
+    # Host pacing is politeness towards real sites, not work we want to time
+    os.environ.setdefault('CURATION_HOST_RATE', '1000')
+    os.environ.setdefault('CURATION_HOST_BURST', '1000')
+    os.chdir(workdir)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+
+def bench_curation(args, site, client) -> List[BenchResult]:
+    from services.ai_service import AIService
+    from services.curation_service import SEEN_RESOURCES_FILE, CurationService
+    from services.local_state import state_path
+    from services.pdf_sources import CuratedSource, DuckDuckGoSource, GitHubSource, SourceRegistry
+    from services.sheet_cache import get_sheet_cache
+    from benchmarks.fakes import StubGenerativeModel
+
+    model = StubGenerativeModel(latency=args.model_latency)
+    service = CurationService(ai_service=AIService(model=model))
+
+    # Route every outbound fetch (searches and downloads) to the local site
+    def local_get(url, **kwargs):
+        return CurationService._http_get(service, site.localize(url), **kwargs)
+
+    service._http_get = local_get
+    service.sources = SourceRegistry(stats_file='bench_source_stats.json')
+    service.sources.register(CuratedSource())
+    service.sources.register(GitHubSource(local_get))
+    service.sources.register(DuckDuckGoSource(local_get))
+
+    topics = TOPICS[:args.topics]
+
+    def fresh_sheet():
+        client.seed('LinkedIn_Resources', 'resources', RESOURCES_HEADERS)
+        # Like a hand edit between polls, so drop what the sheet cache holds
+        get_sheet_cache().invalidate()
+        if os.path.exists(state_path(SEEN_RESOURCES_FILE)):
+            os.remove(state_path(SEEN_RESOURCES_FILE))
+        client.reset_quota()
+
+    def curate():
+        return service.curate_resources_from_topics(topics, max_per_topic=5)
+
+    results = []
+    for label, before in (('cold', fresh_sheet), ('warm', client.reset_quota)):
+        requests_before, calls_before, site_before = client.request_count, model.calls, site.requests
+        times, resources = _timed(curate, args.repeat, before=before)
+        results.append(BenchResult(
+            f'curation.{label}', times,
+            topics=len(topics),
+            resources=len(resources),
+            sheet_requests_per_run=round((client.request_count - requests_before) / args.repeat, 1),
+            gemini_calls_per_run=round((model.calls - calls_before) / args.repeat, 1),
+            http_requests_per_run=round((site.requests - site_before) / args.repeat, 1),
+            quota_errors=client.quota_errors
+        ))
+    return results
+
+
+def bench_series(args, site, client) -> List[BenchResult]:
+    from services.ai_service import AIService
+    from benchmarks.fakes import StubGenerativeModel
+
+    model = StubGenerativeModel(latency=args.model_latency)
+    ai_service = AIService(model=model)
+
+    times, posts = _timed(lambda: ai_service.generate_post_series('Python Mastery', args.series_posts), args.repeat)
+    placeholders = sum(1 for p in posts if p['content'].startswith('[Placeholder]'))
+    return [BenchResult(
+        'series.generate', times,
+        posts=len(posts),
+        placeholders=placeholders,
+        gemini_calls_per_run=round(model.calls / args.repeat, 1),
+        posts_per_s=round(len(posts) / statistics.mean(times), 2)
+    )]
+
+
+def bench_queue(args, site, client) -> List[BenchResult]:
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("⏭️ queue: streamlit.testing is not available (needs streamlit >= 1.28)")
+        return []
+
+    now = time.time()
+    rows = []
+    for i in range(1, args.queue_posts + 1):
+        status = 'pending' if i % 3 else 'published'
+        scheduled = time.strftime('%Y-%m-%d %H:%M', time.localtime(now + i * 3600))
+        rows.append([i, 'Bench Series', f'Topic {i}', f'Post body {i} ' * 40, status,
+                     scheduled, '', '', scheduled, ''])
+    client.seed('LinkedIn_Posts', 'posts', POSTS_HEADERS, rows)
+    client.seed('LinkedIn_Resources', 'resources', RESOURCES_HEADERS)
+    client.seed('LinkedIn_Enhanced_Content', 'enhanced_content', ENHANCED_HEADERS)
+    client.reset_quota()
+
+    app = AppTest.from_file(os.path.join(REPO_ROOT, 'app.py'), default_timeout=args.app_timeout)
+    started = time.perf_counter()
+    app.run()
+    startup = time.perf_counter() - started
+    if app.exception:
+        print(f"❌ queue: app raised {app.exception[0].value}")
+        return []
+
+    def render():
+        client.reset_quota()
+        app.sidebar.radio[0].set_value('📅 Post Scheduler').run()
+        return app
+
+    requests_before = client.request_count
+    times, app = _timed(render, args.repeat)
+    if app.exception:
+        print(f"❌ queue: app raised {app.exception[0].value}")
+        return []
+
+    return [
+        BenchResult('app.first_run', [startup]),
+        BenchResult(
+            'queue.render', times,
+            posts=args.queue_posts,
+            sheet_requests_per_run=round((client.request_count - requests_before) / args.repeat, 1),
+            quota_errors=client.quota_errors
+        )
+    ]
+
+
+def bench_publish(args, site, client) -> List[BenchResult]:
+    os.environ['LINKEDIN_BASE_URL'] = site.base_url
+    os.environ.setdefault('LINKEDIN_EMAIL', 'bench@example.com')
+    os.environ.setdefault('LINKEDIN_PASSWORD', 'bench')
+
+    try:
+        from services.linkedin_service import LinkedInService
+    except ImportError as e:
+        print(f"⏭️ publish: {e}")
+        return []
+
+    service = LinkedInService()
+    if not args.human_delays:
+        # The randomized pauses are deliberate anti-detection policy; timing
+        # them only adds noise, so by default they are skipped here
+        service._human_delay = lambda *a, **k: None
+        service._human_type = lambda element, text: element.send_keys(text)
+
+    try:
+        started = time.perf_counter()
+        service._init_driver()
+        driver_start = time.perf_counter() - started
+    except Exception as e:
+        print(f"⏭️ publish: Chrome is not available ({e})")
+        return []
+
+    content = "Benchmark post about shipping faster. " * 10 + "#Bench"
+    js_heap_mb = None
+    try:
+        times, outcome = _timed(lambda: service.create_post(content), args.publish_posts)
+        try:
+            used = service.driver.execute_script("return performance.memory && performance.memory.usedJSHeapSize")
+            js_heap_mb = round(used / 2 ** 20, 1) if used else None
+        except Exception:
+            pass
+    finally:
+        service.quit_driver()
+
+    failed = not outcome.startswith(('http://', 'https://')) or 'failed' in outcome.lower()
+    return [
+        BenchResult('publish.driver_start', [driver_start]),
+        BenchResult(
+            'publish.create_post', times,
+            posts_per_min=round(60 / statistics.mean(times), 2),
+            js_heap_mb=js_heap_mb,
+            last_outcome='failed' if failed else 'published'
+        )
+    ]
+
+
+def compare(results: List[Dict], baseline_path: str, max_regression: float) -> List[str]:
+    """Names of benchmarks whose mean is more than max_regression slower than the baseline"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {r['name']: r for r in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result['name'])
+        if not previous or not previous['mean_s']:
+            continue
+        change = result['mean_s'] / previous['mean_s'] - 1
+        result['vs_baseline'] = f"{change:+.0%}"
+        if change > max_regression:
+            regressions.append(result['name'])
+    return regressions
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help='comma-separated: ' + ', '.join(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--topics', type=int, default=4, help='curation topics (max %d)' % len(TOPICS))
+    parser.add_argument('--series-posts', type=int, default=20)
+    parser.add_argument('--queue-posts', type=int, default=200)
+    parser.add_argument('--publish-posts', type=int, default=3)
+    parser.add_argument('--sheet-latency', type=float, default=0.05, help='seconds per Sheets request')
+    parser.add_argument('--sheet-quota', type=int, default=60, help='Sheets requests per minute (0 = unlimited)')
+    parser.add_argument('--model-latency', type=float, default=0.2, help='seconds per Gemini call')
+    parser.add_argument('--http-latency', type=float, default=0.05, help='seconds per local HTTP response')
+    parser.add_argument('--app-timeout', type=float, default=120)
+    parser.add_argument('--human-delays', action='store_true', help='keep LinkedIn human-like pauses')
+    parser.add_argument('--json', help='write results to this file')
+    parser.add_argument('--baseline', help='earlier --json output to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.25, help='allowed slowdown vs baseline')
+    args = parser.parse_args(argv)
+
+    selected = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    workdir = tempfile.mkdtemp(prefix='linkedin-bench-')
+    baseline_path = os.path.abspath(args.baseline) if args.baseline else None
+    json_path = os.path.abspath(args.json) if args.json else None
+    _prepare_environment(workdir)
+
+    from services.sheets import set_sheets_client
+    from benchmarks.fakes import FakeSheetsClient
+    from benchmarks.local_server import LocalSite
+
+    client = FakeSheetsClient(latency=args.sheet_latency, quota_per_minute=args.sheet_quota or None)
+    set_sheets_client(client)
+    site = LocalSite(latency=args.http_latency).start()
+
+    runners = {'curation': bench_curation, 'series': bench_series, 'queue': bench_queue, 'publish': bench_publish}
+    results = []
+    try:
+        for name in selected:
+            print(f"⏱️ Running {name} benchmark...")
+            results.extend(r.to_dict() for r in runners[name](args, site, client))
+    finally:
+        site.stop()
+
+    regressions = compare(results, baseline_path, args.max_regression) if baseline_path else []
+
+    print()
+    for result in results:
+        extra = {k: v for k, v in result.items() if k not in ('name', 'runs', 'mean_s', 'p50_s', 'min_s', 'max_s')}
+        print(f"{result['name']:<24} mean {result['mean_s']:>8.3f}s  p50 {result['p50_s']:>8.3f}s  "
+              f"min {result['min_s']:>8.3f}s  runs {result['runs']}  "
+              + ' '.join(f"{k}={v}" for k, v in extra.items()))
+
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'args': vars(args), 'results': results}, f, indent=2)
+        print(f"\n💾 Results written to {json_path}")
+
+    if regressions:
+        print(f"\n❌ Slower than baseline by more than {args.max_regression:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,19 @@
-from .ai_service import AIService
-from .linkedin_service import LinkedInService
-from .curation_service import CurationService
-from .scheduler_service import SchedulerService
+import importlib
+
+# Services are imported on first attribute access so that importing one of
+# them (or this package) doesn't pull in Selenium, Gemini and gspread at once.
+_SERVICE_MODULES = {
+    'AIService': '.ai_service',
+    'LinkedInService': '.linkedin_service',
+    'CurationService': '.curation_service',
+    'SchedulerService': '.scheduler_service',
+}
 
 __all__ = ['AIService', 'LinkedInService', 'CurationService', 'SchedulerService']
+
+
+def __getattr__(name):
+    if name in _SERVICE_MODULES:
+        module = importlib.import_module(_SERVICE_MODULES[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,26 +1,114 @@
 import google.generativeai as genai
-from typing import List
+from typing import Callable, Dict, List
+from types import SimpleNamespace
 import json
 import os
+import threading
 from dotenv import load_dotenv
 
+from services.token_ledger import BudgetExceeded, get_token_ledger
+from services.tracing import span
+
+DEFAULT_MODEL = 'gemini-2.5-flash'
+
+# Output cap for writing tasks. 2.5 models count thinking tokens as output
+# and this SDK can't limit thinking, so the cap leaves room for both
+WRITING_MAX_OUTPUT_TOKENS = 8192
+
+# Model and generation settings per task kind. One-number ratings and short
+# summaries run on the fastest tier; writing stays on the default model.
+# GEMINI_MODEL changes the default model; GEMINI_MODEL_<TASK> (e.g.
+# GEMINI_MODEL_SCORE) overrides one route's model.
+MODEL_ROUTES: Dict[str, Dict] = {
+    'score': {'model': 'gemini-2.5-flash-lite', 'generation_config': {'temperature': 0.0}},
+    'summarize': {'model': 'gemini-2.5-flash-lite', 'generation_config': {'temperature': 0.3}},
+    'draft': {'model': DEFAULT_MODEL, 'generation_config': {
+        'temperature': 0.8, 'max_output_tokens': WRITING_MAX_OUTPUT_TOKENS}},
+    'series': {'model': DEFAULT_MODEL, 'generation_config': {
+        'temperature': 0.8, 'top_p': 0.95, 'top_k': 40, 'max_output_tokens': WRITING_MAX_OUTPUT_TOKENS}},
+    'enhance': {'model': DEFAULT_MODEL, 'generation_config': {
+        'temperature': 0.9, 'max_output_tokens': WRITING_MAX_OUTPUT_TOKENS}},
+}
+
+# GenerativeModel instances by name, shared by every AIService in the process
+_models: Dict[str, object] = {}
+_models_lock = threading.Lock()
+
+
+def _get_model(name: str):
+    with _models_lock:
+        if name not in _models:
+            _models[name] = genai.GenerativeModel(name)
+        return _models[name]
+
+
+def route_for(task: str) -> Dict:
+    """Model name and generation config for a task kind"""
+    route = MODEL_ROUTES.get(task, {'model': DEFAULT_MODEL, 'generation_config': {}})
+    model = route['model']
+    if model == DEFAULT_MODEL:
+        model = os.getenv('GEMINI_MODEL', DEFAULT_MODEL)
+    return {
+        'model': os.getenv(f"GEMINI_MODEL_{task.upper()}", model),
+        'generation_config': dict(route['generation_config'])
+    }
+
+
 class AIService:
-    def __init__(self):
+    def __init__(self, model=None):
         # Load environment variables from .env file
         load_dotenv()
         
+        # A ready-made model (e.g. the benchmark stub) skips API key setup
+        # and serves every task
+        self._fixed_model = model
+        if model is not None:
+            return
+        
         api_key = os.getenv('GEMINI_API_KEY')
-        if api_key:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-2.5-flash')
-        else:
-            self.model = None
+        if not api_key:
             raise Exception("Gemini API key not configured. Please set GEMINI_API_KEY in .env file.")
+        genai.configure(api_key=api_key)
 
-    def enhance_content(self, idea: str, add_emojis: bool = False, variations: int = 3) -> List[str]:
-        if not self.model:
-            raise Exception("Gemini API key not configured")
+    def _model_for(self, task: str):
+        if self._fixed_model is not None:
+            return self._fixed_model
+        return _get_model(route_for(task)['model'])
 
+    def _generate(self, task: str, prompt: str, **kwargs):
+        """Call Gemini inside a tracing span tagged with the task kind.
+
+        Token usage is recorded per task. Once a daily budget is spent, the
+        last answer to an identical prompt is reused if there is one;
+        otherwise BudgetExceeded lets the caller fall back to its template.
+        """
+        ledger = get_token_ledger()
+        try:
+            ledger.check(task)
+        except BudgetExceeded as e:
+            cached = ledger.cached(task, prompt)
+            if cached is None:
+                raise
+            print(f"💰 {e}; reusing a cached {task} response")
+            return SimpleNamespace(text=cached)
+
+        # Call-specific settings (e.g. max_output_tokens) win over the route's
+        generation_config = {**route_for(task)['generation_config'], **(kwargs.pop('generation_config', None) or {})}
+        model = self._model_for(task)
+        with span('gemini.generate', task=task, model=model.model_name, prompt_chars=len(prompt)) as s:
+            response = model.generate_content(prompt, generation_config=generation_config, **kwargs)
+            s.set_attribute('response_chars', len(response.text or ''))
+            usage = getattr(response, 'usage_metadata', None)
+            if usage is not None:
+                for key, value in ledger.record(task, usage).items():
+                    s.set_attribute(key, value)
+        # Ratings are cheap to redo and come in bulk, so only writing is
+        # kept for over-budget reuse
+        if task != 'score':
+            ledger.remember(task, prompt, response.text)
+        return response
+
+    def enhance_content(self, idea: str, add_emojis: bool = False, variations: int = 3) -> List[str]:
         emoji_instruction = "Include relevant professional emojis strategically." if add_emojis else "Do not use any emojis."
 
         prompt = f"Transform this idea into {variations} different professional LinkedIn posts:\n\n" \
@@ -35,7 +123,7 @@ class AIService:
                  f'[{{"version": 1, "content": "post text"}}, {{"version": 2, "content": "post text"}}]'
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate('enhance', prompt)
             result_text = response.text.strip()
 
             triple_backticks = "```"
@@ -54,37 +142,36 @@ class AIService:
             raise Exception(f"AI enhancement failed: {str(e)}")
 
     def summarize_resource(self, text: str) -> str:
-        if not self.model:
-            return "Summary unavailable - API key not configured"
-
         prompt = f"Summarize in 2-3 sentences for a tech professional:\n\n{text[:2000]}"
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate('summarize', prompt)
             return response.text.strip()
         except:
             return "Summary unavailable"
 
     def score_relevance(self, resource: dict, interests: List[str]) -> float:
-        if not self.model:
-            return 5.0
-
         prompt = f"Rate 0-10 relevance for developer interested in: {', '.join(interests)}\n\n" \
                  f"Resource: {resource['title']}\nDescription: {resource.get('summary', '')}\n\n" \
                  f"Return ONLY a number 0-10."
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate('score', prompt)
             score = float(response.text.strip())
             return min(max(score, 0), 10)
         except:
             return 5.0
 
-    def generate_post_series(self, topic: str, num_posts: int, add_emojis: bool = True) -> List[dict]:
-        """Generate a series of posts for a topic (e.g., 10-day Python Mastery series)"""
-        if not self.model:
-            raise Exception("Gemini API key not configured")
+    def generate_post_series(self, topic: str, num_posts: int, add_emojis: bool = True,
+                             is_duplicate: Callable[[str], bool] = None,
+                             first_day: int = 1, series_length: int = None) -> List[dict]:
+        """Generate a series of posts for a topic (e.g., 10-day Python Mastery series)
 
+        Posts that is_duplicate flags (near-copies of queued or published
+        posts) are regenerated once in a single extra call. first_day and
+        series_length generate a later slice of a longer series, e.g. days
+        11-15 of 30.
+        """
         emoji_instruction = "Include relevant professional emojis strategically." if add_emojis else "Do not use any emojis."
 
         # Generate in batches if num_posts > 5 to avoid token limits
@@ -93,11 +180,11 @@ class AIService:
         
         for batch_num in range(0, num_posts, batch_size):
             posts_in_batch = min(batch_size, num_posts - batch_num)
-            start_day = batch_num + 1
+            start_day = first_day + batch_num
             
             prompt = f"""Create {posts_in_batch} LinkedIn posts for a series about: {topic}
 
-    This is part of a {num_posts}-post series. Generate posts for Day {start_day} to Day {start_day + posts_in_batch - 1}.
+    This is part of a {series_length or num_posts}-post series. Generate posts for Day {start_day} to Day {start_day + posts_in_batch - 1}.
 
     Requirements:
     - Each post should be 150-300 words
@@ -114,18 +201,8 @@ Format:
 ]"""
 
             try:
-                # Configure generation for JSON output
-                generation_config = {
-                    "temperature": 0.8,
-                    "top_p": 0.95,
-                    "top_k": 40,
-                    "max_output_tokens": 8192,
-                }
-                
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config=generation_config
-                )
+                # Sampling settings and the output cap come from the series route
+                response = self._generate('series', prompt)
                 result_text = response.text.strip()
 
                 # Clean markdown code blocks if present
@@ -160,15 +237,57 @@ Format:
         
         # Sort by day number and return
         all_posts.sort(key=lambda x: x.get('day', 0))
-        return all_posts[:num_posts]  # Ensure we return exactly num_posts
+        all_posts = all_posts[:num_posts]  # Ensure we return exactly num_posts
+
+        if is_duplicate:
+            repeats = [p for p in all_posts
+                       if not p['content'].startswith('[Placeholder]') and is_duplicate(p['content'])]
+            if repeats:
+                fresh = self._regenerate_posts(topic, repeats, emoji_instruction)
+                for post in repeats:
+                    replacement = fresh.get(post['day'])
+                    if replacement and not is_duplicate(replacement['content']):
+                        post.update(replacement)
+                    else:
+                        post['duplicate'] = True
+        return all_posts
+
+    def _regenerate_posts(self, topic: str, posts: List[dict], emoji_instruction: str) -> dict:
+        """New takes on series posts that repeat earlier ones, keyed by day"""
+        listing = '\n'.join(f"- Day {p['day']}: {p['title']}" for p in posts)
+        prompt = f"""These posts from a LinkedIn series about {topic} are too close to posts already published:
+{listing}
+
+Write a replacement for each with a different angle, example and hook, keeping the same day numbers.
+
+Requirements:
+- Each post should be 150-300 words
+- Add relevant hashtags (3-5 per post)
+- {emoji_instruction}
+
+CRITICAL: Return ONLY valid JSON array, no markdown, no extra text.
+Format:
+[
+  {{"day": {posts[0]['day']}, "title": "Topic Title", "content": "Full post text..."}}
+]"""
+
+        try:
+            response = self._generate('series', prompt)
+            result_text = response.text.strip()
+            if result_text.startswith("```"):
+                result_text = '\n'.join(result_text.split('\n')[1:-1])
+                if result_text.startswith('json'):
+                    result_text = result_text[4:].strip()
+            fresh = json.loads(result_text)
+            return {p['day']: p for p in fresh
+                    if isinstance(p, dict) and all(key in p for key in ['day', 'title', 'content'])}
+        except Exception:
+            return {}
 
 
 
     def score_slideshare_relevance(self, resource: dict, user_topics: List[str]) -> float:
         """Score SlideShare presentation relevance based on user topics"""
-        if not self.model:
-            return 7.0
-        
         prompt = f"""Rate the relevance (0-10) of this SlideShare presentation for someone interested in: {', '.join(user_topics)}
 
     Presentation Title: {resource['title']}
@@ -183,7 +302,7 @@ Format:
     Return ONLY a number between 0-10."""
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate('score', prompt)
             score = float(response.text.strip())
             return min(max(score, 0), 10)
         except:
@@ -191,9 +310,6 @@ Format:
 
     def generate_pdf_post_draft(self, resource: dict) -> str:
         """Generate LinkedIn post draft for SlideShare PDF resource"""
-        if not self.model:
-            raise Exception("Gemini API key not configured")
-        
         prompt = f"""Create a professional LinkedIn post to share this SlideShare presentation:
 
     Title: {resource['title']}
@@ -214,7 +330,7 @@ Format:
     Return ONLY the post text, no formatting or extra text."""
 
         try:
-            response = self.model.generate_content(prompt)
+            response = self._generate('draft', prompt)
             return response.text.strip()
         except Exception as e:
             # Fallback
@@ -233,3 +349,16 @@ Format:
     What resources have you found useful lately? Drop them below! 👇
 
     #{resource.get('search_query', 'Tech').replace(' ', '')} #Learning #TechResources #SlideShare #ContinuousLearning #SoftwareDevelopment"""
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_ai_service() -> AIService:
+    """Process-wide service shared by the app, scheduler and curation"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = AIService()
+        return _shared_service
@@ -0,0 +1,93 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Tuple
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(__file__), 'data', 'curated_pdfs.json')
+
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with a light plural fold ('structures' -> 'structure')"""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) > 4 and token.endswith('s') and not token.endswith('ss'):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class PhraseIndex:
+    """Maps token phrases to values, keyed by each phrase's first token.
+
+    Matching a query scans its tokens once and only compares phrases that
+    start with the current token, so lookups stay fast as the catalog grows.
+    """
+
+    def __init__(self):
+        self._by_first: Dict[str, List[Tuple[Tuple[str, ...], object]]] = {}
+
+    def add(self, phrase: str, value):
+        tokens = tuple(tokenize(phrase))
+        if tokens:
+            self._by_first.setdefault(tokens[0], []).append((tokens, value))
+
+    def find(self, tokens: List[str]) -> List:
+        """Values of every phrase that occurs as a token run in tokens"""
+        found = []
+        for i, token in enumerate(tokens):
+            for phrase, value in self._by_first.get(token, ()):
+                if tuple(tokens[i:i + len(phrase)]) == phrase:
+                    found.append(value)
+        return found
+
+
+class CuratedCatalog:
+    """Curated educational PDFs with a prebuilt keyword + synonym index"""
+
+    def __init__(self, entries: List[Dict], synonyms: Dict[str, str] = None):
+        self.entries = entries
+
+        self._keywords = PhraseIndex()
+        for idx, entry in enumerate(entries):
+            for keyword in entry.get('keywords', []):
+                self._keywords.add(keyword, idx)
+
+        self._synonyms = PhraseIndex()
+        for alias, canonical in (synonyms or {}).items():
+            self._synonyms.add(alias, tokenize(canonical))
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_CATALOG_PATH) -> 'CuratedCatalog':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('entries', []), data.get('synonyms', {}))
+
+    def match(self, query: str) -> List[Dict]:
+        """Catalog entries whose keywords (or their synonyms) appear in query"""
+        tokens = tokenize(query)
+
+        # Synonyms add their canonical phrase as an extra token run to scan
+        runs = [tokens] + self._synonyms.find(tokens)
+
+        matched = set()
+        for run in runs:
+            matched.update(self._keywords.find(run))
+        return [self.entries[idx] for idx in sorted(matched)]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> CuratedCatalog:
+    """Load the curated catalog once per process"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            path = os.getenv('CURATED_CATALOG_PATH', DEFAULT_CATALOG_PATH)
+            _catalog = CuratedCatalog.load(path)
+            print(f"📚 Loaded {len(_catalog.entries)} curated PDFs from {path}")
+        return _catalog
@@ -1,31 +1,65 @@
 import requests
-from bs4 import BeautifulSoup
 from typing import List, Dict, Callable
-import pandas as pd
 from datetime import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 import os
-import time
-import re
-from urllib.parse import quote_plus, urlparse
 import hashlib
-from googlesearch import search as google_search  # pip install googlesearch-python
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from gspread.utils import rowcol_to_a1
+from services.rate_limiter import get_rate_limiter
+from services.sheets import get_sheets_client, open_worksheet
+from services.sheet_cache import get_sheet_cache
+from services.dashboard_stats import get_dashboard_stats
+from services.post_index import get_post_index
+from services.lexical_ranker import LexicalRanker
+from services.local_state import load_json, save_json
+from services.tracing import span, traced
+from services.pdf_sources import (
+    SourceRegistry, CuratedSource, GoogleSearchSource, GitHubSource, DuckDuckGoSource
+)
+
+# Every resource a run has scored or ranked, keyed by URL, including the
+# ones below the download cut that never reach the sheet
+SEEN_RESOURCES_FILE = 'seen_resources.json'
+
+# One curation run at a time per process, so concurrent runs from several
+# sessions or the scheduler don't save the same new resources twice
+_curation_lock = threading.Lock()
 
 
 class CurationService:
     """PDF search and download service with multiple methods"""
     
-    def __init__(self):
+    def __init__(self, ai_service=None):
         # PDF download directory
         self.pdf_dir = "curated_pdfs"
         if not os.path.exists(self.pdf_dir):
             os.makedirs(self.pdf_dir)
         
-        # Initialize Google Sheets client
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-        self.client = gspread.authorize(creds)
+        # Shared Google Sheets client (authorized once per process)
+        self.client = get_sheets_client()
+        
+        # Shared per-host limiter replaces fixed sleeps between requests
+        self.rate_limiter = get_rate_limiter()
+        self.max_workers = int(os.getenv('CURATION_WORKERS', '6'))
+        
+        # Created on first use; only runs with new resources need Gemini
+        self._ai_service = ai_service
+        
+        # Local BM25 shortlist, so Gemini only rates the most promising new resources
+        self.ranker = LexicalRanker()
+        self.score_top_k = int(os.getenv('CURATION_SCORE_TOP_K', '15'))
+        
+        # Search sources, ordered by observed latency/yield on each run
+        self.sources = SourceRegistry(
+            max_latency=float(os.getenv('CURATION_SOURCE_MAX_LATENCY', '20')),
+            cooldown=float(os.getenv('CURATION_SOURCE_COOLDOWN', '3600'))
+        )
+        self.sources.register(CuratedSource())
+        self.sources.register(GoogleSearchSource(self.rate_limiter))
+        self.sources.register(GitHubSource(self._http_get))
+        self.sources.register(DuckDuckGoSource(self._http_get))
         
         # Predefined educational PDF sources
         self.pdf_sources = [
@@ -35,236 +69,52 @@ class CurationService:
             "https://archive.org/",
         ]
     
+    def _http_get(self, url: str, max_retries: int = 2, **kwargs) -> requests.Response:
+        """GET through the per-host rate limiter, retrying throttled responses"""
+        for attempt in range(max_retries + 1):
+            self.rate_limiter.acquire(url)
+            with span('http.get', host=urlparse(url).netloc, attempt=attempt + 1) as s:
+                response = requests.get(url, **kwargs)
+                s.set_attribute('status', response.status_code)
+            self.rate_limiter.report(url, response.status_code, response.headers.get('Retry-After'))
+            
+            # Hand back the last response even if it is still throttled
+            if response.status_code not in (429, 503) or attempt == max_retries:
+                break
+            response.close()
+        return response
+    
+    def _get_ai_service(self):
+        if self._ai_service is None:
+            from services.ai_service import get_ai_service
+            self._ai_service = get_ai_service()
+        return self._ai_service
+    
+    def _run_source(self, name: str, search_query: str, max_results: int) -> List[Dict]:
+        """Run a single registered source by name"""
+        return self.sources.search(self.sources.get(name), search_query, max_results)
+    
     def search_google_pdfs_method1(self, search_query: str, max_results: int = 10) -> List[Dict]:
         """Method 1: Use googlesearch-python library"""
-        
-        pdfs = []
-        
-        try:
-            query = f"{search_query} filetype:pdf"
-            print(f"🔍 Method 1: Searching with googlesearch library: {query}")
-            
-            # Use googlesearch library
-            search_results = google_search(query, num_results=max_results, lang='en', sleep_interval=2)
-            
-            for idx, url in enumerate(search_results):
-                if idx >= max_results:
-                    break
-                    
-                try:
-                    # Extract title from URL
-                    title = urlparse(url).path.split('/')[-1]
-                    title = title.replace('.pdf', '').replace('_', ' ').replace('-', ' ')
-                    title = re.sub(r'\s+', ' ', title).strip()
-                    
-                    if len(title) < 5:
-                        title = f"PDF about {search_query} - {idx+1}"
-                    
-                    pdfs.append({
-                        'title': title[:200],
-                        'url': url,
-                        'resource_type': 'PDF',
-                        'source': 'Google Search',
-                        'search_query': search_query,
-                        'summary': f"Educational PDF about {search_query}"
-                    })
-                    print(f"✅ Found: {title[:60]}")
-                    
-                except Exception as e:
-                    print(f"⚠️ Error processing URL: {e}")
-                    continue
-            
-            print(f"📚 Method 1 found {len(pdfs)} PDFs")
-            return pdfs
-            
-        except Exception as e:
-            print(f"❌ Method 1 failed: {e}")
-            return []
+        return self._run_source('google', search_query, max_results)
     
     def search_google_pdfs_method2(self, search_query: str, max_results: int = 10) -> List[Dict]:
-        """Method 2: Use SerpAPI or similar service (requires API key)"""
-        
-        pdfs = []
-        
-        try:
-            # Alternative: Use DuckDuckGo search (doesn't require API key)
-            search_url = f"https://duckduckgo.com/html/?q={quote_plus(search_query + ' filetype:pdf')}"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            
-            print(f"🔍 Method 2: Searching DuckDuckGo: {search_query}")
-            response = requests.get(search_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find all result links
-                links = soup.find_all('a', class_='result__a')
-                
-                for link in links[:max_results]:
-                    try:
-                        url = link.get('href', '')
-                        if url and '.pdf' in url.lower():
-                            title = link.get_text(strip=True)
-                            
-                            pdfs.append({
-                                'title': title[:200] if title else f"PDF about {search_query}",
-                                'url': url,
-                                'resource_type': 'PDF',
-                                'source': 'DuckDuckGo Search',
-                                'search_query': search_query,
-                                'summary': f"Educational PDF about {search_query}"
-                            })
-                            print(f"✅ Found: {title[:60]}")
-                    except:
-                        continue
-            
-            print(f"📚 Method 2 found {len(pdfs)} PDFs")
-            return pdfs
-            
-        except Exception as e:
-            print(f"❌ Method 2 failed: {e}")
-            return []
+        """Method 2: Search DuckDuckGo (doesn't require API key)"""
+        return self._run_source('duckduckgo', search_query, max_results)
     
     def search_github_pdfs(self, search_query: str, max_results: int = 5) -> List[Dict]:
         """Method 3: Search GitHub for educational PDFs"""
-        
-        pdfs = []
-        
-        try:
-            # GitHub search
-            search_url = f"https://github.com/search?q={quote_plus(search_query + ' extension:pdf')}&type=code"
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-            }
-            
-            print(f"🔍 Method 3: Searching GitHub: {search_query}")
-            response = requests.get(search_url, headers=headers, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find PDF file results
-                results = soup.find_all('div', class_='f4')
-                
-                for result in results[:max_results]:
-                    try:
-                        link = result.find('a')
-                        if link:
-                            github_url = "https://github.com" + link.get('href', '')
-                            
-                            # Convert to raw content URL
-                            raw_url = github_url.replace('/blob/', '/raw/')
-                            
-                            title = link.get_text(strip=True)
-                            
-                            pdfs.append({
-                                'title': title[:200] if title else f"GitHub PDF about {search_query}",
-                                'url': raw_url,
-                                'resource_type': 'PDF',
-                                'source': 'GitHub',
-                                'search_query': search_query,
-                                'summary': f"Open-source PDF about {search_query}"
-                            })
-                            print(f"✅ Found on GitHub: {title[:60]}")
-                    except:
-                        continue
-            
-            print(f"📚 Method 3 found {len(pdfs)} PDFs")
-            return pdfs
-            
-        except Exception as e:
-            print(f"❌ Method 3 failed: {e}")
-            return []
+        return self._run_source('github', search_query, max_results)
     
     def get_curated_pdfs(self, search_query: str) -> List[Dict]:
         """Method 4: Use curated list of known educational PDFs"""
-        
-        pdfs = []
-        
-        # Curated educational PDF sources based on topic
-        curated_sources = {
-            'python': [
-                {
-                    'title': 'Python Tutorial - Tutorialspoint',
-                    'url': 'https://www.tutorialspoint.com/python/python_tutorial.pdf',
-                    'summary': 'Complete Python programming tutorial'
-                },
-                {
-                    'title': 'Python for Everybody',
-                    'url': 'https://www.py4e.com/lectures3/Pythonlearn-01-Intro.pdf',
-                    'summary': 'Python basics for beginners'
-                },
-                {
-                    'title': 'Automate the Boring Stuff with Python',
-                    'url': 'https://automatetheboringstuff.com/2e/chapter0/automate_the_boring_stuff_with_python.pdf',
-                    'summary': 'Practical Python automation'
-                }
-            ],
-            'java': [
-                {
-                    'title': 'Java Programming Tutorial',
-                    'url': 'https://www.tutorialspoint.com/java/java_tutorial.pdf',
-                    'summary': 'Complete Java programming guide'
-                }
-            ],
-            'data structures': [
-                {
-                    'title': 'Data Structures and Algorithms',
-                    'url': 'https://www.tutorialspoint.com/data_structures_algorithms/data_structures_algorithms_tutorial.pdf',
-                    'summary': 'DSA fundamentals'
-                }
-            ],
-            'machine learning': [
-                {
-                    'title': 'Introduction to Machine Learning',
-                    'url': 'https://www.tutorialspoint.com/machine_learning/machine_learning_tutorial.pdf',
-                    'summary': 'ML basics and algorithms'
-                }
-            ],
-            'web development': [
-                {
-                    'title': 'HTML Tutorial',
-                    'url': 'https://www.tutorialspoint.com/html/html_tutorial.pdf',
-                    'summary': 'HTML web development guide'
-                },
-                {
-                    'title': 'JavaScript Tutorial',
-                    'url': 'https://www.tutorialspoint.com/javascript/javascript_tutorial.pdf',
-                    'summary': 'JavaScript programming guide'
-                }
-            ],
-            'react': [
-                {
-                    'title': 'React Tutorial',
-                    'url': 'https://www.tutorialspoint.com/reactjs/reactjs_tutorial.pdf',
-                    'summary': 'React JS framework guide'
-                }
-            ]
-        }
-        
-        # Match query to curated sources
-        query_lower = search_query.lower()
-        
-        for keyword, sources in curated_sources.items():
-            if keyword in query_lower:
-                for source in sources:
-                    pdfs.append({
-                        'title': source['title'],
-                        'url': source['url'],
-                        'resource_type': 'PDF',
-                        'source': 'Curated Educational Resources',
-                        'search_query': search_query,
-                        'summary': source['summary']
-                    })
-                    print(f"✅ Curated PDF: {source['title']}")
-        
-        print(f"📚 Method 4 found {len(pdfs)} curated PDFs")
-        return pdfs
+        return self._run_source('curated', search_query, 100)
+    
+    def get_source_stats(self) -> List[Dict]:
+        """Latency, success rate and unique yield for each search source"""
+        return self.sources.summary()
     
+    @traced('curation.run')
     def curate_resources_from_topics(
         self,
         topics: List[str],
@@ -273,30 +123,45 @@ class CurationService:
     ) -> List[Dict]:
         """Search for PDFs using multiple methods"""
         
-        all_resources = []
-        total_topics = len(topics)
+        with _curation_lock:
+            return self._curate(topics, max_per_topic, progress_callback)
+    
+    def _curate(
+        self,
+        topics: List[str],
+        max_per_topic: int,
+        progress_callback: Callable[[int, str], None]
+    ) -> List[Dict]:
+        # Sources run in stages, best performer first. Each stage searches all
+        # topics that still need results in parallel (the shared per-host
+        # limiter keeps each engine politely paced), and later sources are
+        # only tried for topics the earlier ones couldn't fill.
+        found = {topic: [] for topic in topics}
+        seen_urls = set()
+        plan = self.sources.plan()
         
-        for i, topic in enumerate(topics):
-            if progress_callback:
-                progress = int((i / total_topics) * 30)
-                progress_callback(progress, f"🔍 Searching for: {topic}...")
-            
-            # Try all methods and combine results
-            methods = [
-                self.get_curated_pdfs(topic),  # Start with curated (most reliable)
-                self.search_google_pdfs_method1(topic, max_per_topic),
-                self.search_github_pdfs(topic, 3),
-                self.search_google_pdfs_method2(topic, max_per_topic)
-            ]
-            
-            topic_pdfs = []
-            for method_results in methods:
-                topic_pdfs.extend(method_results)
-                if len(topic_pdfs) >= max_per_topic:
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for stage, source in enumerate(plan):
+                pending = [t for t in topics if len(found[t]) < max_per_topic]
+                if not pending:
                     break
-            
-            all_resources.extend(topic_pdfs[:max_per_topic])
-            time.sleep(2)
+                
+                if progress_callback:
+                    progress = int((stage / len(plan)) * 30)
+                    progress_callback(progress, f"🔍 Searching {source.name} for {len(pending)} topics...")
+                
+                futures = {
+                    executor.submit(self.sources.search, source, topic, max_per_topic, seen_urls): topic
+                    for topic in pending
+                }
+                for future in as_completed(futures):
+                    found[futures[future]].extend(future.result())
+        
+        self.sources.save()
+        
+        all_resources = []
+        for topic in topics:
+            all_resources.extend(found[topic][:max_per_topic])
         
         if not all_resources:
             if progress_callback:
@@ -305,59 +170,119 @@ class CurationService:
         
         print(f"📚 Total PDFs found: {len(all_resources)}")
         
+        # Split off resources already processed on earlier runs, whether saved
+        # to the sheet or only seen and scored
+        known_index = self._load_known_resources()
+        seen_index = load_json(SEEN_RESOURCES_FILE, default={})
+        unique_resources = []
+        new_resources = []
+        seen_urls = set()
+        for resource in all_resources:
+            if resource['url'] in seen_urls:
+                continue
+            seen_urls.add(resource['url'])
+            unique_resources.append(resource)
+
+            known = known_index.get(resource['url'])
+            if known:
+                self._reuse_known_resource(resource, known)
+            elif resource['url'] in seen_index:
+                resource['relevance_score'] = seen_index[resource['url']].get('relevance_score', '')
+            else:
+                resource['relevance_score'] = ''
+                new_resources.append(resource)
+
+        all_resources = unique_resources
+        print(f"♻️ Reusing {len(all_resources) - len(new_resources)} known resources, {len(new_resources)} new")
+        
         if progress_callback:
             progress_callback(40, "🤖 Scoring with AI...")
         
-        # Score resources
-        from services.ai_service import AIService
-        ai_service = AIService()
-        
-        for resource in all_resources:
+        # Rank every resource without a Gemini rating, including ones that
+        # missed the shortlist before, but only send as many to Gemini as
+        # there are new resources, so a run with nothing new costs nothing
+        unrated = [r for r in all_resources if r['relevance_score'] == '']
+        lexical = self.ranker.score(unrated, topics)
+        shortlist = set(self.ranker.top_k(lexical, min(self.score_top_k, len(new_resources))))
+        print(f"🤖 Gemini scoring {len(shortlist)} of {len(unrated)} unrated resources")
+        rescored = []
+        for i, resource in enumerate(unrated):
+            # The BM25 score only orders resources; it is never shown as a rating
+            resource['local_score'] = float(lexical[i])
+            if i not in shortlist:
+                continue
             try:
-                resource['relevance_score'] = ai_service.score_slideshare_relevance(resource, topics)
+                resource['relevance_score'] = self._get_ai_service().score_slideshare_relevance(resource, topics)
+                if resource.get('known'):
+                    rescored.append(resource)
             except:
                 resource['relevance_score'] = 7.0
+        if rescored:
+            self._save_scores(rescored, known_index)
         
-        # Sort by relevance
-        all_resources.sort(key=lambda x: x['relevance_score'], reverse=True)
+        seen_at = datetime.now().isoformat()
+        for resource in all_resources:
+            seen_index[resource['url']] = {'relevance_score': resource['relevance_score'], 'seen_at': seen_at}
+        save_json(SEEN_RESOURCES_FILE, seen_index)
+        
+        # Gemini-rated resources first, then unrated ones by local rank
+        all_resources.sort(
+            key=lambda x: (x['relevance_score'] != '', x['relevance_score'] or 0.0, x.get('local_score', 0.0)),
+            reverse=True
+        )
         
         if progress_callback:
             progress_callback(50, "📥 Downloading PDFs...")
         
-        # Download top 10
-        downloaded = []
-        for idx, resource in enumerate(all_resources[:10]):
-            if progress_callback:
-                progress_callback(50 + idx * 4, f"📥 {resource['title'][:40]}...")
-            
-            try:
-                local_path = self._download_pdf(resource['url'], resource['title'])
+        # Download top 10 in parallel (known resources keep their local copy)
+        top_resources = all_resources[:10]
+        to_download = [r for r in top_resources if 'download_status' not in r]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(self._download_pdf, r['url'], r['title']): r
+                for r in to_download
+            }
+            for idx, future in enumerate(as_completed(futures)):
+                resource = futures[future]
+                if progress_callback:
+                    progress_callback(50 + idx * 4, f"📥 {resource['title'][:40]}...")
+                
+                try:
+                    local_path = future.result()
+                except Exception as e:
+                    print(f"❌ Download error: {e}")
+                    local_path = None
                 resource['local_pdf_path'] = local_path if local_path else ''
                 resource['download_status'] = 'success' if local_path else 'failed'
-                downloaded.append(resource)
-                time.sleep(1)
-            except Exception as e:
-                print(f"❌ Download error: {e}")
-                resource['local_pdf_path'] = ''
-                resource['download_status'] = 'failed'
-                downloaded.append(resource)
+        
+        downloaded = top_resources
         
         if progress_callback:
             progress_callback(90, "✍️ Generating LinkedIn posts...")
         
-        # Generate drafts
+        # Generate drafts for resources without a stored one
         for resource in downloaded:
+            if resource.get('draft_post'):
+                continue
             try:
-                resource['draft_post'] = ai_service.generate_pdf_post_draft(resource)
+                resource['draft_post'] = self._get_ai_service().generate_pdf_post_draft(resource)
             except:
                 resource['draft_post'] = self._create_simple_draft(resource)
         
+        # Flag drafts that repeat a post already queued or published
+        post_index = get_post_index()
+        for resource in downloaded:
+            matches = post_index.find_similar(resource.get('draft_post', ''), limit=1)
+            resource['duplicate_of'] = matches[0]['label'] if matches else ''
+        
         if progress_callback:
             progress_callback(95, "💾 Saving...")
         
-        # Save to sheets
-        if downloaded:
-            self._save_to_sheets(downloaded)
+        # Save to sheets (known resources are already there)
+        new_downloaded = [r for r in downloaded if not r.get('known')]
+        if new_downloaded:
+            self._save_to_sheets(new_downloaded, known_index)
         
         success = len([r for r in downloaded if r['download_status'] == 'success'])
         if progress_callback:
@@ -365,6 +290,7 @@ class CurationService:
         
         return downloaded
     
+    @traced('curation.download')
     def _download_pdf(self, url: str, title: str) -> str:
         """Download PDF from URL"""
         try:
@@ -373,7 +299,7 @@ class CurationService:
                 'Accept': 'application/pdf,*/*'
             }
             
-            response = requests.get(url, headers=headers, stream=True, timeout=30, allow_redirects=True)
+            response = self._http_get(url, headers=headers, stream=True, timeout=30, allow_redirects=True)
             
             if response.status_code == 200:
                 safe_title = "".join([c if c.isalnum() or c in (' ', '-', '_') else '_' for c in title])
@@ -409,14 +335,76 @@ Perfect for learning {resource['search_query']}! 🚀
 
 #{resource['search_query'].replace(' ', '')} #Learning #FreePDF #TechEducation"""
     
-    def _save_to_sheets(self, resources: List[Dict]):
+    def _load_known_resources(self) -> Dict[str, Dict]:
+        """Index of resources saved on earlier runs, keyed by URL"""
         try:
-            sheet = self.client.open("LinkedIn_Resources").worksheet("resources")
-            existing = pd.DataFrame(sheet.get_all_records())
+            sheet = open_worksheet("LinkedIn_Resources", "resources")
+            records = get_sheet_cache().records(sheet)
+        except Exception as e:
+            print(f"⚠️ Could not load known resources: {e}")
+            return {}
+        
+        # Remember each record's sheet row so a later Gemini rating can be written back
+        return {str(r.get('url', '')): {**r, '_row': row} for row, r in enumerate(records, 2) if r.get('url')}
+    
+    def _reuse_known_resource(self, resource: Dict, known: Dict):
+        """Copy stored score, local path and draft onto a freshly found resource"""
+        resource['known'] = True
+        resource['id'] = known.get('id', '')
+        
+        # A blank score means it was never rated by Gemini; it may be this time
+        stored = known.get('relevance_score', 7.0)
+        try:
+            resource['relevance_score'] = float(stored) if stored != '' else ''
+        except (TypeError, ValueError):
+            resource['relevance_score'] = 7.0
+        
+        # Only trust the stored path if the file is still on disk
+        local_path = str(known.get('local_pdf_path', '') or '')
+        if local_path and os.path.exists(local_path):
+            resource['local_pdf_path'] = local_path
+            resource['download_status'] = 'success'
+        elif known.get('download_status') == 'failed':
+            # Don't spend bandwidth retrying URLs that already failed
+            resource['local_pdf_path'] = ''
+            resource['download_status'] = 'failed'
+        
+        if known.get('draft_post'):
+            resource['draft_post'] = str(known['draft_post'])
+    
+    @traced('sheets.write', sheet='resources')
+    def _save_scores(self, resources: List[Dict], known_index: Dict[str, Dict]):
+        """Write Gemini ratings of resources saved unrated on an earlier run"""
+        try:
+            sheet = open_worksheet("LinkedIn_Resources", "resources")
+            columns = sheet.row_values(1)
+            if 'relevance_score' not in columns:
+                return
+            column = columns.index('relevance_score') + 1
+            sheet.batch_update([
+                {
+                    'range': rowcol_to_a1(known_index[r['url']]['_row'], column),
+                    'values': [[str(r['relevance_score'])]]
+                }
+                for r in resources if known_index.get(r['url'], {}).get('_row')
+            ])
+            get_sheet_cache().note_write(sheet)
+        except Exception as e:
+            print(f"⚠️ Could not save scores: {e}")
+    
+    @traced('sheets.write', sheet='resources')
+    def _save_to_sheets(self, resources: List[Dict], known_index: Dict[str, Dict] = None):
+        saved = []
+        try:
+            sheet = open_worksheet("LinkedIn_Resources", "resources")
+            if known_index is None:
+                known_index = self._load_known_resources()
+            next_id = len(known_index) + 1
             
             for r in resources:
-                if existing.empty or r['url'] not in existing.get('url', []).values:
-                    r['id'] = len(existing) + 1 if not existing.empty else 1
+                if r['url'] not in known_index:
+                    r['id'] = next_id
+                    next_id += 1
                     r['created_at'] = datetime.now().isoformat()
                     
                     sheet.append_row([
@@ -433,5 +421,24 @@ Perfect for learning {resource['search_query']}! 🚀
                         str(r.get('download_status', '')),
                         str(r.get('created_at', ''))
                     ])
+                    known_index[r['url']] = r
+                    saved.append(r)
         except Exception as e:
             print(f"❌ Save error: {e}")
+        
+        if saved:
+            get_sheet_cache().note_write(sheet)
+            get_dashboard_stats().resources_added(saved)
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_curation_service() -> CurationService:
+    """Process-wide service shared by the app and the scheduler"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = CurationService()
+        return _shared_service
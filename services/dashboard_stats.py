@@ -0,0 +1,192 @@
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from services.local_state import load_json, save_json
+
+STATS_FILE = 'dashboard_stats.json'
+
+
+def _text(value) -> str:
+    """Sheet/DataFrame cell as a string (timestamps as ISO, NaN/NaT as '')"""
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        try:
+            return value.isoformat()
+        except ValueError:  # NaT
+            return ''
+    text = str(value)
+    return '' if text in ('nan', 'NaT', 'None') else text
+
+
+class DashboardStats:
+    """Dashboard aggregates kept in a small local file and updated on every write.
+
+    Holds post counts by status, resource and enhancement totals, the
+    earliest pending posts and the newest resources, so the dashboard
+    renders from one tiny read instead of downloading every sheet. Write
+    paths report their changes here. A full rebuild from the sheets is
+    only needed the first time, after invalidate(), or once removals
+    drain the buffer of upcoming posts.
+    """
+
+    def __init__(self, filename: str = STATS_FILE, limit: int = 5, buffer: int = 20):
+        self.filename = filename
+        self.limit = limit
+        self.buffer = buffer  # pending posts kept so removals rarely force a rebuild
+        self._lock = threading.RLock()
+
+    def snapshot(self) -> Optional[Dict]:
+        """Current aggregates, or None when they need a rebuild"""
+        data = load_json(self.filename, default=None)
+        if not data or data.get('stale'):
+            return None
+        return data
+
+    def rebuild(self, posts: Iterable[Dict], resources: Iterable[Dict], enhancements: int) -> Dict:
+        """Recompute everything from full sheet contents"""
+        posts = list(posts)
+        resources = list(resources)
+
+        counts: Dict[str, int] = {}
+        for post in posts:
+            status = _text(post.get('status'))
+            counts[status] = counts.get(status, 0) + 1
+
+        pending = [self._compact_post(p) for p in posts if _text(p.get('status')) == 'pending']
+        pending.sort(key=lambda p: p['scheduled_date'])
+
+        recent = sorted((self._compact_resource(r) for r in resources), key=lambda r: r['created_at'], reverse=True)
+
+        data = {
+            'posts_by_status': counts,
+            'resources': len(resources),
+            'enhancements': enhancements,
+            'upcoming': pending[:self.buffer],
+            'upcoming_complete': len(pending) <= self.buffer,
+            'recent_resources': recent[:self.limit],
+            'rebuilt_at': datetime.now().isoformat(),
+            'updated_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            save_json(self.filename, data)
+        return data
+
+    def invalidate(self):
+        """Force a rebuild on the next dashboard view"""
+        with self._lock:
+            data = load_json(self.filename, default=None)
+            if data:
+                data['stale'] = True
+                save_json(self.filename, data)
+
+    def posts_added(self, posts: Iterable[Dict]):
+        def apply(data):
+            for post in posts:
+                status = _text(post.get('status'))
+                self._count(data, status, 1)
+                if status == 'pending':
+                    self._add_upcoming(data, post)
+        self._update(apply)
+
+    def post_status_changed(self, post: Dict, old_status: str, new_status: str):
+        def apply(data):
+            self._count(data, old_status, -1)
+            self._count(data, new_status, 1)
+            if old_status == 'pending' and new_status != 'pending':
+                self._remove_upcoming(data, post)
+            elif new_status == 'pending' and old_status != 'pending':
+                self._add_upcoming(data, post)
+        self._update(apply)
+
+    def posts_removed(self, posts: Iterable[Dict]):
+        def apply(data):
+            for post in posts:
+                status = _text(post.get('status'))
+                self._count(data, status, -1)
+                if status == 'pending':
+                    self._remove_upcoming(data, post)
+        self._update(apply)
+
+    def resources_added(self, resources: Iterable[Dict]):
+        def apply(data):
+            resources_list = list(resources)
+            data['resources'] += len(resources_list)
+            recent = data['recent_resources'] + [self._compact_resource(r) for r in resources_list]
+            recent.sort(key=lambda r: r['created_at'], reverse=True)
+            data['recent_resources'] = recent[:self.limit]
+        self._update(apply)
+
+    def enhancement_added(self, count: int = 1):
+        def apply(data):
+            data['enhancements'] += count
+        self._update(apply)
+
+    def _update(self, apply):
+        with self._lock:
+            data = load_json(self.filename, default=None)
+            if not data or data.get('stale'):
+                return  # nothing materialized yet; the next view rebuilds
+            try:
+                apply(data)
+            except (KeyError, TypeError) as e:
+                print(f"⚠️ Dashboard stats out of shape, rebuilding on next view: {e}")
+                data['stale'] = True
+            data['updated_at'] = datetime.now().isoformat()
+            save_json(self.filename, data)
+
+    @staticmethod
+    def _count(data: Dict, status: str, delta: int):
+        counts = data['posts_by_status']
+        counts[status] = max(0, counts.get(status, 0) + delta)
+
+    def _add_upcoming(self, data: Dict, post: Dict):
+        upcoming = data['upcoming'] + [self._compact_post(post)]
+        upcoming.sort(key=lambda p: p['scheduled_date'])
+        if len(upcoming) > self.buffer:
+            upcoming = upcoming[:self.buffer]
+            data['upcoming_complete'] = False
+        data['upcoming'] = upcoming
+
+    def _remove_upcoming(self, data: Dict, post: Dict):
+        post_id = _text(post.get('id'))
+        data['upcoming'] = [p for p in data['upcoming'] if p['id'] != post_id]
+        # Posts beyond the buffer aren't known here, so refill from the sheet
+        if len(data['upcoming']) < self.limit and not data.get('upcoming_complete', True):
+            data['stale'] = True
+
+    @staticmethod
+    def _compact_post(post: Dict) -> Dict:
+        return {
+            'id': _text(post.get('id')),
+            'series': _text(post.get('series')),
+            'topic': _text(post.get('topic')),
+            'scheduled_date': _text(post.get('scheduled_date')),
+            'preview': _text(post.get('content'))[:200]
+        }
+
+    @staticmethod
+    def _compact_resource(resource: Dict) -> Dict:
+        return {
+            'title': _text(resource.get('title')),
+            'url': _text(resource.get('url')),
+            'resource_type': _text(resource.get('resource_type')),
+            'source': _text(resource.get('source')),
+            'relevance_score': _text(resource.get('relevance_score')),
+            'summary': _text(resource.get('summary'))[:300],
+            'created_at': _text(resource.get('created_at'))
+        }
+
+
+_shared_stats = None
+_shared_lock = threading.Lock()
+
+
+def get_dashboard_stats() -> DashboardStats:
+    """Process-wide aggregates shared by the app, scheduler and curation"""
+    global _shared_stats
+    with _shared_lock:
+        if _shared_stats is None:
+            _shared_stats = DashboardStats()
+        return _shared_stats
@@ -0,0 +1,160 @@
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List
+
+from services.local_state import state_path
+
+
+class EnhancementStore:
+    """Append-only SQLite store of Content Enhancer history.
+
+    Ideas are indexed on created_at so the history view reads only the
+    newest rows, each variation is its own row instead of a JSON cell, and
+    an FTS5 index (LIKE where FTS5 isn't compiled in) searches old ideas.
+    """
+
+    def __init__(self, db_file: str = 'enhancements.sqlite'):
+        self.db_path = state_path(db_file)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS enhancements (
+                    id INTEGER PRIMARY KEY,
+                    original_idea TEXT NOT NULL,
+                    add_emojis INTEGER NOT NULL DEFAULT 0,
+                    version_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_enhancements_created ON enhancements (created_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS enhancement_versions (
+                    enhancement_id INTEGER NOT NULL,
+                    version INTEGER NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (enhancement_id, version)
+                )
+            """)
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS enhancements_fts "
+                    "USING fts5(original_idea, content='enhancements', content_rowid='id')"
+                )
+                self.full_text = True
+            except sqlite3.OperationalError:
+                self.full_text = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection that commits (or rolls back) and is closed on exit"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, idea: str, versions: List[str], add_emojis: bool = False,
+            created_at: str = None, enhancement_id: int = None) -> int:
+        """Record one enhancement run and return its id"""
+        created_at = created_at or datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO enhancements (id, original_idea, add_emojis, version_count, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (enhancement_id, idea, int(bool(add_emojis)), len(versions), created_at)
+            )
+            new_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO enhancement_versions (enhancement_id, version, content) VALUES (?, ?, ?)",
+                [(new_id, i, content) for i, content in enumerate(versions, 1)]
+            )
+            if self.full_text:
+                conn.execute("INSERT INTO enhancements_fts (rowid, original_idea) VALUES (?, ?)", (new_id, idea))
+        return new_id
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM enhancements").fetchone()[0]
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        """Newest enhancements first, with their versions"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, original_idea, add_emojis, version_count, created_at "
+                "FROM enhancements ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+            return self._with_versions(conn, rows)
+
+    def search(self, query: str, limit: int = 20) -> List[Dict]:
+        """Enhancements whose idea matches every word of query, best match first"""
+        words = re.findall(r'\w+', query)
+        if not words:
+            return []
+
+        with self._connect() as conn:
+            if self.full_text:
+                # Quote each word so FTS syntax characters in the query are literal
+                match = ' '.join(f'"{w}"*' for w in words)
+                rows = conn.execute(
+                    "SELECT e.id, e.original_idea, e.add_emojis, e.version_count, e.created_at "
+                    "FROM enhancements_fts f JOIN enhancements e ON e.id = f.rowid "
+                    "WHERE enhancements_fts MATCH ? ORDER BY f.rank LIMIT ?",
+                    (match, limit)
+                ).fetchall()
+            else:
+                clauses = ' AND '.join('original_idea LIKE ?' for _ in words)
+                rows = conn.execute(
+                    "SELECT id, original_idea, add_emojis, version_count, created_at "
+                    f"FROM enhancements WHERE {clauses} ORDER BY created_at DESC LIMIT ?",
+                    [f'%{w}%' for w in words] + [limit]
+                ).fetchall()
+            return self._with_versions(conn, rows)
+
+    @staticmethod
+    def _with_versions(conn: sqlite3.Connection, rows) -> List[Dict]:
+        if not rows:
+            return []
+        ids = [row[0] for row in rows]
+        versions: Dict[int, List[str]] = {}
+        for enhancement_id, content in conn.execute(
+            f"SELECT enhancement_id, content FROM enhancement_versions "
+            f"WHERE enhancement_id IN ({','.join('?' * len(ids))}) ORDER BY enhancement_id, version",
+            ids
+        ):
+            versions.setdefault(enhancement_id, []).append(content)
+
+        return [{
+            'id': enhancement_id,
+            'original_idea': idea,
+            'add_emojis': bool(add_emojis),
+            'version_count': version_count,
+            'created_at': created_at,
+            'versions': versions.get(enhancement_id, [])
+        } for enhancement_id, idea, add_emojis, version_count, created_at in rows]
+
+    def import_records(self, records: List[Dict]) -> int:
+        """Copy rows from the old enhanced_content sheet, skipping ids already stored"""
+        imported = 0
+        for record in records:
+            try:
+                versions = json.loads(record.get('enhanced_versions') or '[]')
+            except (TypeError, ValueError):
+                versions = [str(record.get('enhanced_versions'))]
+            try:
+                self.add(
+                    str(record.get('original_idea', '')),
+                    [str(v) for v in versions],
+                    str(record.get('add_emojis', '')).upper() == 'TRUE',
+                    created_at=str(record.get('created_at') or datetime.now().isoformat()),
+                    enhancement_id=int(record['id']) if str(record.get('id', '')).isdigit() else None
+                )
+                imported += 1
+            except sqlite3.IntegrityError:
+                continue
+        return imported
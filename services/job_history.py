@@ -0,0 +1,200 @@
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List
+
+from services.local_state import state_path
+from services.tracing import span
+
+
+class JobHistory:
+    """SQLite log of scheduler job runs with Prometheus-style metrics"""
+
+    def __init__(self, db_file: str = 'job_history.sqlite'):
+        self.db_path = state_path(db_file)
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    job_id TEXT NOT NULL,
+                    started_at REAL NOT NULL,
+                    finished_at REAL NOT NULL,
+                    duration REAL NOT NULL,
+                    outcome TEXT NOT NULL,
+                    error TEXT,
+                    counts TEXT
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_runs_started ON job_runs (started_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_run_counts (
+                    run_id INTEGER NOT NULL,
+                    job_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    value REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_job_run_counts_job ON job_run_counts (job_id, name)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection that commits (or rolls back) and is closed on exit"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def run(self, job_id: str, func: Callable, *args, **kwargs):
+        """Run a job body and record its timing, outcome and counts.
+
+        The body may return a dict of counts (e.g. {'posts_published': 1});
+        an 'outcome' key in it overrides the default 'success'. Exceptions
+        are logged and recorded as outcome 'error'.
+        """
+        started = time.time()
+        counts, outcome, error = {}, 'success', ''
+        with span('job.run', job=job_id) as s:
+            try:
+                result = func(*args, **kwargs)
+                if isinstance(result, dict):
+                    counts = dict(result)
+                    outcome = counts.pop('outcome', 'success')
+            except Exception as e:
+                outcome, error = 'error', str(e)
+                s.status, s.error = 'error', error[:300]
+                print(f"❌ Job {job_id} failed: {e}")
+            s.set_attribute('outcome', outcome)
+        finished = time.time()
+
+        try:
+            self._insert(job_id, started, finished, outcome, error, counts)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not record run of {job_id}: {e}")
+
+    def _insert(self, job_id: str, started: float, finished: float, outcome: str, error: str, counts: Dict):
+        with self._lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO job_runs (job_id, started_at, finished_at, duration, outcome, error, counts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, started, finished, finished - started, outcome, error[:500], json.dumps(counts))
+            )
+            conn.executemany(
+                "INSERT INTO job_run_counts (run_id, job_id, name, value) VALUES (?, ?, ?, ?)",
+                [(cursor.lastrowid, job_id, name, float(value))
+                 for name, value in counts.items() if isinstance(value, (int, float))]
+            )
+
+    def recent(self, limit: int = 20) -> List[Dict]:
+        """Newest job runs first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, started_at, finished_at, duration, outcome, error, counts "
+                "FROM job_runs ORDER BY started_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+
+        return [{
+            'job': job_id,
+            'started': datetime.fromtimestamp(started).strftime('%Y-%m-%d %H:%M:%S'),
+            'finished': datetime.fromtimestamp(finished).strftime('%H:%M:%S'),
+            'duration_s': round(duration, 2),
+            'outcome': outcome,
+            'counts': ', '.join(f"{k}={v}" for k, v in json.loads(counts or '{}').items()),
+            'error': error or ''
+        } for job_id, started, finished, duration, outcome, error, counts in rows]
+
+    def metrics(self, gauges: Dict[str, float] = None) -> str:
+        """Prometheus text exposition of run counts, durations and item totals"""
+        with self._connect() as conn:
+            runs = conn.execute(
+                "SELECT job_id, outcome, COUNT(*) FROM job_runs GROUP BY job_id, outcome"
+            ).fetchall()
+            durations = conn.execute(
+                "SELECT job_id, SUM(duration), COUNT(*), MAX(finished_at) FROM job_runs GROUP BY job_id"
+            ).fetchall()
+            last = conn.execute(
+                "SELECT job_id, duration FROM job_runs WHERE id IN "
+                "(SELECT MAX(id) FROM job_runs GROUP BY job_id)"
+            ).fetchall()
+            items = conn.execute(
+                "SELECT job_id, name, SUM(value) FROM job_run_counts GROUP BY job_id, name"
+            ).fetchall()
+
+        lines = [
+            '# HELP linkedin_job_runs_total Scheduler job runs by outcome.',
+            '# TYPE linkedin_job_runs_total counter'
+        ]
+        lines += [f'linkedin_job_runs_total{{job="{job}",outcome="{outcome}"}} {n}' for job, outcome, n in runs]
+
+        lines += [
+            '# HELP linkedin_job_duration_seconds Time spent in scheduler jobs.',
+            '# TYPE linkedin_job_duration_seconds summary'
+        ]
+        for job, total, n, _ in durations:
+            lines.append(f'linkedin_job_duration_seconds_sum{{job="{job}"}} {total:.3f}')
+            lines.append(f'linkedin_job_duration_seconds_count{{job="{job}"}} {n}')
+
+        lines += [
+            '# HELP linkedin_job_last_duration_seconds Duration of the most recent run.',
+            '# TYPE linkedin_job_last_duration_seconds gauge'
+        ]
+        lines += [f'linkedin_job_last_duration_seconds{{job="{job}"}} {duration:.3f}' for job, duration in last]
+
+        lines += [
+            '# HELP linkedin_job_last_run_timestamp_seconds Unix time the most recent run finished.',
+            '# TYPE linkedin_job_last_run_timestamp_seconds gauge'
+        ]
+        lines += [f'linkedin_job_last_run_timestamp_seconds{{job="{job}"}} {finished:.0f}' for job, _, _, finished in durations]
+
+        lines += [
+            '# HELP linkedin_job_items_total Items handled by scheduler jobs (posts published, resources found, ...).',
+            '# TYPE linkedin_job_items_total counter'
+        ]
+        lines += [f'linkedin_job_items_total{{job="{job}",item="{name}"}} {value:g}' for job, name, value in items]
+
+        for name, value in (gauges or {}).items():
+            lines.append(f'# TYPE {name} gauge')
+            lines.append(f'{name} {value:g}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def start_metrics_server(port: int, render: Callable[[], str], host: str = '127.0.0.1'):
+    """Serve render() as Prometheus metrics on http://host:port/metrics"""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/metrics'):
+                self.send_error(404)
+                return
+            try:
+                body = render().encode('utf-8')
+            except Exception as e:
+                self.send_error(500, str(e))
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # keep scrapes out of the console
+
+    try:
+        server = ThreadingHTTPServer((host, port), MetricsHandler)
+    except OSError as e:
+        print(f"⚠️ Metrics server not started on port {port}: {e}")
+        return None
+
+    thread = threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True)
+    thread.start()
+    print(f"📈 Scheduler metrics at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,85 @@
+import re
+from typing import Dict, List
+from urllib.parse import unquote, urlparse
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Fallback titles/summaries the search sources make up from the query itself;
+# they would match the topic perfectly while saying nothing about the PDF
+_PLACEHOLDER_RE = re.compile(
+    r'^(?:github |educational |open-source )?pdf about .+?(?: - \d+)?$', re.IGNORECASE
+)
+
+_URL_NOISE = {'http', 'https', 'www', 'com', 'org', 'net', 'io', 'pdf', 'raw', 'blob',
+              'main', 'master', 'html', 'download', 'files', 'uploads'}
+_STOP_WORDS = {'a', 'an', 'and', 'the', 'of', 'for', 'to', 'in', 'on', 'with', 'by', 'from',
+               'is', 'are', 'at', 'as', 'or', 'your', 'you', 'how', 'what', 'into'}
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(str(text or '').lower()) if t not in _STOP_WORDS and len(t) > 1]
+
+
+def is_placeholder(text: str) -> bool:
+    return bool(_PLACEHOLDER_RE.match(str(text or '').strip()))
+
+
+def resource_tokens(resource: Dict) -> List[str]:
+    """Title, URL path and summary tokens, leaving out made-up placeholders"""
+    tokens = []
+    for field in ('title', 'summary'):
+        value = resource.get(field, '')
+        if not is_placeholder(value):
+            tokens += tokenize(value)
+
+    parsed = urlparse(str(resource.get('url', '')))
+    tokens += [t for t in tokenize(unquote(f"{parsed.netloc} {parsed.path}")) if t not in _URL_NOISE]
+    return tokens
+
+
+class LexicalRanker:
+    """Okapi BM25 of each resource against each topic, computed as matrix products.
+
+    Candidate sets are a few dozen to a few hundred short documents, so a
+    dense documents x vocabulary matrix is small and faster to build than a
+    sparse one. A resource's score is its best match over all topics.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    def score(self, resources: List[Dict], topics: List[str]) -> np.ndarray:
+        docs = [resource_tokens(r) for r in resources]
+        queries = [set(tokenize(t)) for t in topics]
+        vocab = {term: i for i, term in enumerate(sorted({t for q in queries for t in q}))}
+        if not docs or not vocab:
+            return np.zeros(len(docs))
+
+        # Only query terms can contribute, so the vocabulary is the topics' terms
+        tf = np.zeros((len(docs), len(vocab)))
+        for row, tokens in enumerate(docs):
+            for token in tokens:
+                col = vocab.get(token)
+                if col is not None:
+                    tf[row, col] += 1
+
+        lengths = np.array([len(tokens) for tokens in docs], dtype=float)
+        avg_length = lengths.mean() or 1.0
+        df = (tf > 0).sum(axis=0)
+        idf = np.log1p((len(docs) - df + 0.5) / (df + 0.5))
+        norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+        weights = tf * (self.k1 + 1) / (tf + norm[:, None]) * idf
+
+        query_matrix = np.zeros((len(queries), len(vocab)))
+        for row, terms in enumerate(queries):
+            query_matrix[row, [vocab[t] for t in terms]] = 1
+        return (weights @ query_matrix.T).max(axis=1)
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> List[int]:
+        """Indices of the k best scores, best first, skipping non-matches"""
+        order = np.argsort(-scores, kind='stable')
+        return [int(i) for i in order[:k] if scores[i] > 0]
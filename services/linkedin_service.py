@@ -8,16 +8,69 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
 from dotenv import load_dotenv
+import functools
+import threading
 import time
 import random
 
+from services.media_store import get_media_store
+from services.selector_registry import get_selector_registry
+from services.tracing import traced
+
 load_dotenv()
 
+# Only one browser flow may drive LinkedIn at a time, whether it comes from
+# a UI session or the background scheduler
+_browser_lock = threading.RLock()
+
+# Requests the posting flow never needs, by category (CDP wildcard patterns).
+# LINKEDIN_BLOCK picks categories (empty blocks nothing) and
+# LINKEDIN_BLOCK_URLS adds patterns of your own.
+BLOCKED_URL_PATTERNS = {
+    'media': [
+        '*media.licdn.com/dms/image/*', '*dms.licdn.com/playlist/*',
+        '*.mp4', '*.webm', '*.m3u8', '*.gif'
+    ],
+    'fonts': ['*.woff', '*.woff2', '*.ttf', '*.otf'],
+    'third_party': [
+        '*doubleclick.net/*', '*googletagmanager.com/*', '*google-analytics.com/*',
+        '*px.ads.linkedin.com/*', '*snap.licdn.com/*', '*bat.bing.com/*',
+        '*connect.facebook.net/*', '*demdex.net/*', '*adnxs.com/*'
+    ]
+}
+
+
+def blocked_url_patterns() -> list:
+    """URL patterns blocked in the browser, from LINKEDIN_BLOCK and LINKEDIN_BLOCK_URLS"""
+    categories = os.getenv('LINKEDIN_BLOCK', 'media,fonts,third_party')
+    patterns = []
+    for category in (c.strip() for c in categories.split(',') if c.strip()):
+        if category not in BLOCKED_URL_PATTERNS:
+            print(f"⚠️ Unknown LINKEDIN_BLOCK category '{category}' ignored")
+            continue
+        patterns.extend(BLOCKED_URL_PATTERNS[category])
+    patterns.extend(p.strip() for p in os.getenv('LINKEDIN_BLOCK_URLS', '').split(',') if p.strip())
+    return patterns
+
+
+def _exclusive_browser(func):
+    """Serialize a method on the process-wide browser lock"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _browser_lock:
+            return func(*args, **kwargs)
+    return wrapper
+
+
 class LinkedInService:
     def __init__(self):
         self.email = os.getenv('LINKEDIN_EMAIL')
         self.password = os.getenv('LINKEDIN_PASSWORD')
+        # Overridable so the benchmarks can drive a local composer page
+        self.base_url = os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com').rstrip('/')
         self.driver = None
+        # Remembers which selector last found each composer element
+        self.selectors = get_selector_registry()
 
     def _human_delay(self, min_sec=1, max_sec=3):
         """Random delay to mimic human behavior"""
@@ -41,6 +94,7 @@ class LinkedInService:
         actions.move_to_element(element).perform()
         self._human_delay(0.3, 0.8)
 
+    @traced('linkedin.init_driver')
     def _init_driver(self):
         """Initialize undetected chromedriver with Chrome 141 compatibility"""
         if self.driver is None:
@@ -57,6 +111,11 @@ class LinkedInService:
             # Set a realistic user agent
             options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/141.0.0.0 Safari/537.36")
             
+            # Lean page loads: return at DOMContentLoaded (every step waits for
+            # its own element anyway) and don't autoplay feed videos
+            options.page_load_strategy = os.getenv('LINKEDIN_PAGE_LOAD_STRATEGY', 'eager')
+            options.add_argument("--autoplay-policy=user-gesture-required")
+            
             try:
                 self.driver = uc.Chrome(
                     options=options,
@@ -67,7 +126,17 @@ class LinkedInService:
             except Exception as e:
                 st.error(f"Failed to initialize browser: {e}")
                 raise
+            
+            patterns = blocked_url_patterns()
+            if patterns:
+                try:
+                    self.driver.execute_cdp_cmd('Network.enable', {})
+                    self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+                except Exception as e:
+                    # Only page weight is at stake, so carry on with everything loading
+                    print(f"⚠️ Could not set blocked URLs: {e}")
 
+    @traced('linkedin.login')
     def _login(self) -> bool:
         """Login to LinkedIn with human-like behavior"""
         if not self.email or not self.password:
@@ -77,7 +146,7 @@ class LinkedInService:
         self._init_driver()
         
         # Check if already logged in
-        self.driver.get("https://www.linkedin.com/feed/")
+        self.driver.get(f"{self.base_url}/feed/")
         self._human_delay(3, 5)
         
         try:
@@ -96,7 +165,7 @@ class LinkedInService:
 
         # Perform login with human-like behavior
         try:
-            self.driver.get("https://www.linkedin.com/login")
+            self.driver.get(f"{self.base_url}/login")
             self._human_delay(2, 4)
             
             # Enter email with human typing
@@ -143,6 +212,8 @@ class LinkedInService:
             self.quit_driver()
             return False
 
+    @_exclusive_browser
+    @traced('linkedin.create_post')
     def create_post(self, content: str, image_url: str = None) -> str:
         """Create a LinkedIn post with maximum human-like behavior"""
         if not self._login():
@@ -150,7 +221,7 @@ class LinkedInService:
 
         try:
             # Navigate to feed
-            self.driver.get("https://www.linkedin.com/feed/")
+            self.driver.get(f"{self.base_url}/feed/")
             self._human_delay(4, 6)
             
             # Scroll and browse like a human BEFORE posting
@@ -167,24 +238,10 @@ class LinkedInService:
             # Find "Start a post" button
             st.write("🔍 Looking for 'Start a post' button...")
             
-            start_post_btn = None
-            selectors = [
-                (By.CSS_SELECTOR, "button.share-box-feed-entry__trigger"),
-                (By.XPATH, "//button[contains(@class, 'share-box-feed-entry__trigger')]"),
-                (By.XPATH, "//button[contains(., 'Start a post')]")
-            ]
-            
-            for selector_type, selector_value in selectors:
-                try:
-                    start_post_btn = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((selector_type, selector_value))
-                    )
-                    st.write(f"✅ Found button")
-                    break
-                except TimeoutException:
-                    continue
-            
-            if not start_post_btn:
+            try:
+                start_post_btn = self.selectors.find(self.driver, 'start_post', timeout=30, clickable=True)
+                st.write(f"✅ Found button")
+            except TimeoutException:
                 raise Exception("Could not find 'Start a post' button")
             
             # Move mouse to button and click (human-like)
@@ -202,9 +259,7 @@ class LinkedInService:
             # Find and enter content with HUMAN TYPING
             st.write("✍️ Typing post content...")
             
-            editor = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.ql-editor"))
-            )
+            editor = self.selectors.find(self.driver, 'editor', timeout=15)
             
             # Click editor and wait
             editor.click()
@@ -220,16 +275,14 @@ class LinkedInService:
             if image_url and os.path.exists(image_url):
                 st.write("📸 Uploading image...")
                 try:
-                    self._upload_image(image_url)
+                    self._upload_image(get_media_store().prepare(image_url))
                 except Exception as img_error:
                     st.warning(f"⚠️ Image upload failed: {img_error}. Posting without image...")
 
             # Click the "Post" button
             st.write("📤 Publishing post...")
             
-            post_btn = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.share-actions__primary-action"))
-            )
+            post_btn = self.selectors.find(self.driver, 'post_button', timeout=15, clickable=True)
             
             # Move mouse to Post button (human-like)
             self._move_mouse_to_element(post_btn)
@@ -262,26 +315,21 @@ class LinkedInService:
             self._save_screenshot("linkedin_post_error.png")
             return f"Posting failed - {e}"
 
+    @traced('linkedin.upload_image')
     def _upload_image(self, image_path: str):
         """Upload image with human-like delays"""
-        media_btn = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Add media']"))
-        )
+        media_btn = self.selectors.find(self.driver, 'add_media', timeout=10, clickable=True)
         self._move_mouse_to_element(media_btn)
         media_btn.click()
         self._human_delay(2, 3)
 
-        file_input = WebDriverWait(self.driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']"))
-        )
+        file_input = self.selectors.find(self.driver, 'file_input', timeout=10)
         file_input.send_keys(os.path.abspath(image_path))
         st.write("✅ Image uploaded")
         self._human_delay(5, 7)
 
         try:
-            done_btn = WebDriverWait(self.driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Done')]"))
-            )
+            done_btn = self.selectors.find(self.driver, 'done_button', timeout=5, clickable=True)
             self._move_mouse_to_element(done_btn)
             done_btn.click()
             self._human_delay(2, 3)
@@ -296,6 +344,7 @@ class LinkedInService:
         except:
             st.warning("Could not save screenshot")
 
+    @_exclusive_browser
     def quit_driver(self):
         """Close browser"""
         if self.driver:
@@ -310,6 +359,8 @@ class LinkedInService:
 
 
 
+    @_exclusive_browser
+    @traced('linkedin.create_post_with_pdf')
     def create_post_with_pdf(self, content: str, pdf_path: str) -> str:
         """Create a LinkedIn post with PDF document attachment"""
         if not self._login():
@@ -317,7 +368,7 @@ class LinkedInService:
         
         try:
             # Navigate to feed
-            self.driver.get("https://www.linkedin.com/feed/")
+            self.driver.get(f"{self.base_url}/feed/")
             self._human_delay(4, 6)
             
             # Scroll and browse like a human
@@ -327,9 +378,7 @@ class LinkedInService:
             
             # Open post editor
             st.write("🔍 Opening post editor...")
-            start_post_btn = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.share-box-feed-entry__trigger"))
-            )
+            start_post_btn = self.selectors.find(self.driver, 'start_post', timeout=30, clickable=True)
             self._move_mouse_to_element(start_post_btn)
             self._human_delay(0.5, 1)
             start_post_btn.click()
@@ -338,9 +387,7 @@ class LinkedInService:
             
             # Enter content
             st.write("✍️ Typing post content...")
-            editor = WebDriverWait(self.driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "div.ql-editor"))
-            )
+            editor = self.selectors.find(self.driver, 'editor', timeout=15)
             editor.click()
             self._human_delay(1, 2)
             self._human_type(editor, content)
@@ -352,26 +399,20 @@ class LinkedInService:
                 st.write("📄 Uploading PDF document...")
                 try:
                     # Click "Add document" button
-                    doc_btn = WebDriverWait(self.driver, 10).until(
-                        EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Add a document']"))
-                    )
+                    doc_btn = self.selectors.find(self.driver, 'add_document', timeout=10, clickable=True)
                     self._move_mouse_to_element(doc_btn)
                     doc_btn.click()
                     self._human_delay(2, 3)
                     
                     # Upload file
-                    file_input = WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']"))
-                    )
+                    file_input = self.selectors.find(self.driver, 'file_input', timeout=10)
                     file_input.send_keys(os.path.abspath(pdf_path))
                     st.write("✅ PDF uploaded")
                     self._human_delay(5, 8)  # Wait for upload to complete
                     
                     # Click "Done" if modal appears
                     try:
-                        done_btn = WebDriverWait(self.driver, 5).until(
-                            EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Done')]"))
-                        )
+                        done_btn = self.selectors.find(self.driver, 'done_button', timeout=5, clickable=True)
                         self._move_mouse_to_element(done_btn)
                         done_btn.click()
                         self._human_delay(2, 3)
@@ -383,9 +424,7 @@ class LinkedInService:
             
             # Publish post
             st.write("📤 Publishing post...")
-            post_btn = WebDriverWait(self.driver, 15).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.share-actions__primary-action"))
-            )
+            post_btn = self.selectors.find(self.driver, 'post_button', timeout=15, clickable=True)
             self._move_mouse_to_element(post_btn)
             self._human_delay(1, 2)
             post_btn.click()
@@ -399,3 +438,16 @@ class LinkedInService:
             st.error(f"❌ Posting failed: {e}")
             self._save_screenshot("linkedin_pdf_post_error.png")
             return f"Posting failed - {e}"
+
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+
+def get_linkedin_service() -> LinkedInService:
+    """Process-wide service, so the app and scheduler share one browser"""
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = LinkedInService()
+        return _shared_service
@@ -0,0 +1,36 @@
+import json
+import os
+from typing import Any
+
+# Directory for local runtime state (checkpoints, caches, job stores)
+STATE_DIR = os.getenv('STATE_DIR', 'state')
+
+
+def state_path(filename: str) -> str:
+    """Return path of a file inside the local state directory"""
+    if not os.path.exists(STATE_DIR):
+        os.makedirs(STATE_DIR, exist_ok=True)
+    return os.path.join(STATE_DIR, filename)
+
+
+def load_json(filename: str, default: Any = None) -> Any:
+    """Load a JSON state file, falling back to default if missing or corrupt"""
+    path = state_path(filename)
+    if not os.path.exists(path):
+        return default
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read state file {path}: {e}")
+        return default
+
+
+def save_json(filename: str, data: Any):
+    """Atomically write a JSON state file"""
+    path = state_path(filename)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
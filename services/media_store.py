@@ -0,0 +1,145 @@
+import hashlib
+import os
+import shutil
+import threading
+import time
+from typing import Dict, Iterable
+
+MEDIA_DIR = os.getenv('MEDIA_DIR', 'media')
+LEGACY_IMAGE_DIR = 'temp_images'
+
+
+class MediaStore:
+    """Post images stored by content hash, with upload-ready derivatives.
+
+    Originals live in <root>/originals/<sha256>.<ext>, so the same picture
+    uploaded twice (or two pictures with the same file name) never collide.
+    prepare() makes a copy fitted within max_side pixels and re-encoded
+    (JPEG, or PNG when the image has transparency), cached under
+    <root>/derived by source hash and settings so it is built only once.
+    gc() deletes files no post refers to anymore.
+    """
+
+    def __init__(self, root: str = MEDIA_DIR, max_side: int = None, quality: int = None):
+        self.root = root
+        self.max_side = max_side or int(os.getenv('MEDIA_MAX_SIDE', '1200'))
+        self.quality = quality or int(os.getenv('MEDIA_JPEG_QUALITY', '85'))
+        self.originals_dir = os.path.join(root, 'originals')
+        self.derived_dir = os.path.join(root, 'derived')
+        os.makedirs(self.originals_dir, exist_ok=True)
+        os.makedirs(self.derived_dir, exist_ok=True)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes, filename: str = '') -> str:
+        """Store an uploaded file and return its content-addressed path"""
+        ext = os.path.splitext(filename)[1].lower() or '.bin'
+        path = os.path.join(self.originals_dir, f"{self._digest(data)}{ext}")
+        if not os.path.exists(path):
+            self._write(path, data)
+        return path
+
+    def prepare(self, path: str) -> str:
+        """Path of an upload-ready copy of the image at path (built once, then cached)"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = f"{self._digest(data)}_{self.max_side}_{self.quality}"
+
+        for ext in ('.jpg', '.png'):
+            cached = os.path.join(self.derived_dir, key + ext)
+            if os.path.exists(cached):
+                return cached
+
+        try:
+            from PIL import Image, ImageOps
+        except ImportError:
+            print("⚠️ Pillow not installed, uploading images as they are")
+            return path
+
+        try:
+            with Image.open(path) as img:
+                source_format = img.format
+                img = ImageOps.exif_transpose(img)
+                resized = max(img.size) > self.max_side
+                img.thumbnail((self.max_side, self.max_side), Image.LANCZOS)
+
+                transparent = img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info)
+                derived = os.path.join(self.derived_dir, key + ('.png' if transparent else '.jpg'))
+                tmp_path = f"{derived}.tmp"
+                if transparent:
+                    img.save(tmp_path, format='PNG', optimize=True)
+                else:
+                    img.convert('RGB').save(tmp_path, format='JPEG', quality=self.quality,
+                                            optimize=True, progressive=True)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not process image {path}, uploading as is: {e}")
+            return path
+
+        # A small, already-compressed image can grow when re-encoded; keep its bytes then
+        expected = 'PNG' if transparent else 'JPEG'
+        if not resized and source_format == expected and os.path.getsize(tmp_path) >= len(data):
+            shutil.copyfile(path, tmp_path)
+        os.replace(tmp_path, derived)
+        print(f"🖼️ Prepared {os.path.basename(path)}: {len(data) // 1024} KB -> {os.path.getsize(derived) // 1024} KB")
+        return derived
+
+    def gc(self, referenced: Iterable[str], min_age: float = 3600, extra_dirs: Iterable[str] = (LEGACY_IMAGE_DIR,)) -> Dict:
+        """Delete stored images that no referenced path points at.
+
+        A derivative survives while its original is referenced. Files newer
+        than min_age seconds are kept, so an image uploaded for a post that
+        isn't queued yet is not swept away.
+        """
+        keep_paths = {os.path.abspath(p) for p in referenced if p}
+        keep_hashes = set()
+        originals_dir = os.path.abspath(self.originals_dir)
+        for p in keep_paths:
+            if os.path.dirname(p) == originals_dir:
+                keep_hashes.add(os.path.splitext(os.path.basename(p))[0])
+            elif os.path.isfile(p):
+                # Older posts point at temp_images/<name>; their derivatives are keyed by content
+                with open(p, 'rb') as f:
+                    keep_hashes.add(self._digest(f.read()))
+
+        removed, freed = 0, 0
+        cutoff = time.time() - min_age
+        with self._lock:
+            for directory in (self.originals_dir, self.derived_dir, *extra_dirs):
+                if not os.path.isdir(directory):
+                    continue
+                for name in os.listdir(directory):
+                    path = os.path.join(directory, name)
+                    if not os.path.isfile(path) or os.path.getmtime(path) > cutoff:
+                        continue
+                    content_hash = os.path.splitext(name)[0].split('_')[0]
+                    if os.path.abspath(path) in keep_paths or content_hash in keep_hashes:
+                        continue
+                    freed += os.path.getsize(path)
+                    os.remove(path)
+                    removed += 1
+        if removed:
+            print(f"🧹 Removed {removed} unreferenced images ({freed // 1024} KB)")
+        return {'files_removed': removed, 'bytes_freed': freed}
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+
+def get_media_store() -> MediaStore:
+    """Process-wide store shared by the app, scheduler and LinkedIn uploads"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = MediaStore()
+        return _shared_store
@@ -1,27 +1,176 @@
-import requests
+import atexit
 import os
+import queue
+import random
+import threading
+import time
+from typing import List, Optional
+
+import requests
+
+from services.tracing import span
+
+TELEGRAM_MAX_LENGTH = 4096
+
 
 class NotificationService:
-    """Telegram notification service"""
-    
-    def __init__(self):
+    """Telegram notification service.
+
+    send_message() only queues the text; a background worker delivers it
+    over a persistent HTTP session, retrying with backoff. Messages that
+    arrive within `coalesce_window` seconds of each other go out as a
+    single digest, so a backlog of published posts produces one summary
+    instead of a burst of messages.
+    """
+
+    def __init__(self, coalesce_window: float = None, max_retries: int = 4, backoff: float = 1.0):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
-    
+        if coalesce_window is None:
+            coalesce_window = float(os.getenv('NOTIFY_COALESCE_SECONDS', '5'))
+        self.coalesce_window = coalesce_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        self._queue = queue.Queue()
+        self._session = None
+        self._worker = None
+        self._worker_lock = threading.Lock()
+
     def send_message(self, text: str):
-        """Send Telegram message"""
-        
+        """Queue a Telegram message; never blocks on the network"""
+
         if not self.bot_token or not self.chat_id:
             print(f"📱 Notification: {text}")
             return
-        
+
+        self._ensure_worker()
+        self._queue.put(text)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Wait until queued messages are delivered (or given up on)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='notifications', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+
+            # Collect whatever else arrives during the coalescing window
+            deadline = time.monotonic() + self.coalesce_window
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._deliver(self._digest(batch), len(batch))
+            except Exception as e:
+                print(f"⚠️ Notification dropped: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    @staticmethod
+    def _digest(messages: List[str]) -> str:
+        """Combine a burst of messages, grouping ones with the same 'prefix: '"""
+        if len(messages) == 1:
+            return messages[0]
+
+        groups = {}
+        for message in messages:
+            prefix, sep, detail = message.partition(': ')
+            key = prefix if sep else message
+            groups.setdefault(key, []).append(detail if sep else '')
+
+        lines = [f"🗞️ {len(messages)} updates"]
+        for prefix, details in groups.items():
+            details = [d for d in details if d]
+            if len(details) > 1:
+                lines.append(f"{prefix} ({len(details)}):")
+                lines.extend(f"  • {d}" for d in details)
+            elif details:
+                lines.append(f"{prefix}: {details[0]}")
+            else:
+                lines.append(prefix)
+
+        text = '\n'.join(lines)
+        if len(text) > TELEGRAM_MAX_LENGTH:
+            text = text[:TELEGRAM_MAX_LENGTH - 20] + '\n… (truncated)'
+        return text
+
+    def _deliver(self, text: str, count: int = 1):
+        """Send one message, retrying rate limits, server errors and timeouts"""
+        if self._session is None:
+            self._session = requests.Session()
+
         url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
-        
+        payload = {"chat_id": self.chat_id, "text": text, "parse_mode": "Markdown"}
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            with span('telegram.send', messages=count, attempt=attempt + 1) as s:
+                try:
+                    response = self._session.post(url, json=payload, timeout=10)
+                    s.set_attribute('status', response.status_code)
+                except requests.RequestException as e:
+                    response = None
+                    s.status, s.error = 'error', str(e)[:300]
+
+            if response is not None:
+                if response.status_code == 200:
+                    return
+                if response.status_code == 400 and 'parse_mode' in payload:
+                    # Topics with _ or * break Markdown; resend as plain text
+                    payload.pop('parse_mode')
+                    continue
+                if response.status_code != 429 and response.status_code < 500:
+                    print(f"⚠️ Telegram rejected notification: HTTP {response.status_code}")
+                    return
+                retry_after = self._retry_after(response)
+
+            if attempt < self.max_retries:
+                delay = retry_after if retry_after is not None else self.backoff * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, 0.5))
+
+        print(f"⚠️ Notification not delivered after {self.max_retries + 1} attempts")
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
         try:
-            requests.post(url, json={
-                "chat_id": self.chat_id,
-                "text": text,
-                "parse_mode": "Markdown"
-            }, timeout=10)
-        except:
+            return float(response.json()['parameters']['retry_after'])
+        except (ValueError, KeyError, TypeError):
             pass
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+
+_shared_notifier = None
+_shared_lock = threading.Lock()
+
+
+def get_notification_service() -> NotificationService:
+    """Process-wide notifier so every caller shares one queue and session"""
+    global _shared_notifier
+    with _shared_lock:
+        if _shared_notifier is None:
+            _shared_notifier = NotificationService()
+            # Give queued messages a chance to go out on shutdown
+            atexit.register(_shared_notifier.flush, 5.0)
+        return _shared_notifier
@@ -0,0 +1,355 @@
+import re
+import threading
+from abc import ABC, abstractmethod
+import time
+from typing import Callable, Dict, List, Optional, Set
+from urllib.parse import quote_plus, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+
+from services.curated_catalog import CuratedCatalog, get_catalog
+from services.local_state import load_json, save_json
+from services.tracing import span
+
+GOOGLE_SEARCH_URL = "https://www.google.com/search"
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+}
+
+
+class SourceError(Exception):
+    """Raised by a source when a search could not be completed"""
+
+
+class PDFSource(ABC):
+    """Base class for PDF search sources.
+
+    Subclasses set a unique `name` and implement `search`, raising
+    SourceError (or any exception) on failure so the registry can tell a
+    broken source from one that simply found nothing.
+    """
+
+    name = 'base'
+    max_results: Optional[int] = None  # per-source cap, None = use caller's limit
+
+    @abstractmethod
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        """Up to max_results PDF resources for query"""
+
+
+class GoogleSearchSource(PDFSource):
+    """Google results via the googlesearch-python library"""
+
+    name = 'google'
+
+    def __init__(self, rate_limiter):
+        self.rate_limiter = rate_limiter
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        from googlesearch import search as google_search  # pip install googlesearch-python
+
+        print(f"🔍 Google: searching {query} filetype:pdf")
+
+        # Paced by the shared limiter instead of googlesearch's sleep_interval
+        self.rate_limiter.acquire(GOOGLE_SEARCH_URL)
+        try:
+            urls = list(google_search(f"{query} filetype:pdf", num_results=max_results, lang='en'))
+        except Exception as e:
+            response = getattr(e, 'response', None)
+            if response is not None:
+                self.rate_limiter.report(GOOGLE_SEARCH_URL, response.status_code, response.headers.get('Retry-After'))
+            raise SourceError(f"Google search failed: {e}")
+        self.rate_limiter.report(GOOGLE_SEARCH_URL, 200)
+
+        pdfs = []
+        for idx, url in enumerate(urls[:max_results]):
+            # Extract title from URL
+            title = urlparse(url).path.split('/')[-1]
+            title = title.replace('.pdf', '').replace('_', ' ').replace('-', ' ')
+            title = re.sub(r'\s+', ' ', title).strip()
+
+            if len(title) < 5:
+                title = f"PDF about {query} - {idx+1}"
+
+            pdfs.append({
+                'title': title[:200],
+                'url': url,
+                'resource_type': 'PDF',
+                'source': 'Google Search',
+                'search_query': query,
+                'summary': f"Educational PDF about {query}"
+            })
+        return pdfs
+
+
+class DuckDuckGoSource(PDFSource):
+    """DuckDuckGo HTML results (no API key required)"""
+
+    name = 'duckduckgo'
+
+    def __init__(self, http_get: Callable[..., requests.Response]):
+        self.http_get = http_get
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        search_url = f"https://duckduckgo.com/html/?q={quote_plus(query + ' filetype:pdf')}"
+        print(f"🔍 DuckDuckGo: searching {query}")
+
+        response = self.http_get(search_url, headers=HEADERS, timeout=15)
+        if response.status_code != 200:
+            raise SourceError(f"DuckDuckGo returned HTTP {response.status_code}")
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        pdfs = []
+        for link in soup.find_all('a', class_='result__a')[:max_results]:
+            url = link.get('href', '')
+            if url and '.pdf' in url.lower():
+                title = link.get_text(strip=True)
+                pdfs.append({
+                    'title': title[:200] if title else f"PDF about {query}",
+                    'url': url,
+                    'resource_type': 'PDF',
+                    'source': 'DuckDuckGo Search',
+                    'search_query': query,
+                    'summary': f"Educational PDF about {query}"
+                })
+        return pdfs
+
+
+class GitHubSource(PDFSource):
+    """GitHub code search for PDF files"""
+
+    name = 'github'
+    max_results = 3
+
+    def __init__(self, http_get: Callable[..., requests.Response]):
+        self.http_get = http_get
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        search_url = f"https://github.com/search?q={quote_plus(query + ' extension:pdf')}&type=code"
+        print(f"🔍 GitHub: searching {query}")
+
+        response = self.http_get(search_url, headers=HEADERS, timeout=15)
+        if response.status_code != 200:
+            raise SourceError(f"GitHub returned HTTP {response.status_code}")
+
+        soup = BeautifulSoup(response.content, 'html.parser')
+        pdfs = []
+        for result in soup.find_all('div', class_='f4')[:max_results]:
+            link = result.find('a')
+            if not link:
+                continue
+
+            # Convert to raw content URL
+            github_url = "https://github.com" + link.get('href', '')
+            raw_url = github_url.replace('/blob/', '/raw/')
+            title = link.get_text(strip=True)
+
+            pdfs.append({
+                'title': title[:200] if title else f"GitHub PDF about {query}",
+                'url': raw_url,
+                'resource_type': 'PDF',
+                'source': 'GitHub',
+                'search_query': query,
+                'summary': f"Open-source PDF about {query}"
+            })
+        return pdfs
+
+
+class CuratedSource(PDFSource):
+    """Curated list of known educational PDFs"""
+
+    name = 'curated'
+
+    def __init__(self, catalog: CuratedCatalog = None):
+        self.catalog = catalog or get_catalog()
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        pdfs = []
+        for entry in self.catalog.match(query):
+            pdfs.append({
+                'title': entry['title'],
+                'url': entry['url'],
+                'resource_type': 'PDF',
+                'source': 'Curated Educational Resources',
+                'search_query': query,
+                'summary': entry.get('summary', '')
+            })
+        return pdfs[:max_results]
+
+
+class SourceStats:
+    """Running latency, success and unique-yield counters for one source"""
+
+    # Pseudo-observations so new sources start with a neutral score
+    PRIOR_CALLS = 2
+    PRIOR_LATENCY = 2.0
+    PRIOR_UNIQUE = 1.0
+
+    def __init__(self, data: Dict = None):
+        data = data or {}
+        self.calls = data.get('calls', 0)
+        self.successes = data.get('successes', 0)
+        self.failures = data.get('failures', 0)
+        self.total_latency = data.get('total_latency', 0.0)
+        self.results = data.get('results', 0)
+        self.unique_results = data.get('unique_results', 0)
+        self.consecutive_failures = data.get('consecutive_failures', 0)
+        self.last_attempt = data.get('last_attempt', 0.0)
+        self.last_error = data.get('last_error', '')
+
+    @property
+    def success_rate(self) -> float:
+        return (self.successes + self.PRIOR_CALLS) / (self.calls + self.PRIOR_CALLS)
+
+    @property
+    def avg_latency(self) -> float:
+        return (self.total_latency + self.PRIOR_LATENCY * self.PRIOR_CALLS) / (self.calls + self.PRIOR_CALLS)
+
+    @property
+    def unique_yield(self) -> float:
+        """Average number of not-yet-seen results per call"""
+        return (self.unique_results + self.PRIOR_UNIQUE * self.PRIOR_CALLS) / (self.calls + self.PRIOR_CALLS)
+
+    @property
+    def score(self) -> float:
+        """Unique results per second of latency, weighted by success rate"""
+        return self.success_rate * self.unique_yield / max(self.avg_latency, 0.05)
+
+    def to_dict(self) -> Dict:
+        return {
+            'calls': self.calls,
+            'successes': self.successes,
+            'failures': self.failures,
+            'total_latency': round(self.total_latency, 3),
+            'results': self.results,
+            'unique_results': self.unique_results,
+            'consecutive_failures': self.consecutive_failures,
+            'last_attempt': self.last_attempt,
+            'last_error': self.last_error
+        }
+
+
+class SourceRegistry:
+    """Registry of PDF sources that orders them by observed performance.
+
+    Sources that keep failing or are too slow are skipped until a cooldown
+    has passed, after which they get a single probe call.
+    """
+
+    def __init__(self, stats_file: str = 'source_stats.json', max_failures: int = 3,
+                 max_latency: float = 20.0, cooldown: float = 3600.0):
+        self.stats_file = stats_file
+        self.max_failures = max_failures
+        self.max_latency = max_latency
+        self.cooldown = cooldown
+        self._sources: Dict[str, PDFSource] = {}
+        self._lock = threading.Lock()
+
+        saved = load_json(stats_file, default={}) or {}
+        self._stats: Dict[str, SourceStats] = {name: SourceStats(data) for name, data in saved.items()}
+
+    def register(self, source: PDFSource):
+        """Add a source; registration order breaks ties between equal scores"""
+        self._sources[source.name] = source
+        self._stats.setdefault(source.name, SourceStats())
+
+    def get(self, name: str) -> PDFSource:
+        return self._sources[name]
+
+    def stats(self, name: str) -> SourceStats:
+        return self._stats[name]
+
+    def _is_healthy(self, stats: SourceStats, now: float) -> bool:
+        failing = stats.consecutive_failures >= self.max_failures
+        slow = stats.calls >= SourceStats.PRIOR_CALLS and stats.avg_latency > self.max_latency
+        if not (failing or slow):
+            return True
+        # Let unhealthy sources probe again once the cooldown has passed
+        return now - stats.last_attempt > self.cooldown
+
+    def _plan_key(self, name: str, order: List[str]):
+        return -self._stats[name].score, order.index(name)
+
+    def plan(self) -> List[PDFSource]:
+        """Healthy sources, best unique-yield per second first"""
+        now = time.time()
+        order = list(self._sources)
+        with self._lock:
+            healthy = [name for name in order if self._is_healthy(self._stats[name], now)]
+            healthy.sort(key=lambda name: self._plan_key(name, order))
+        return [self._sources[name] for name in healthy]
+
+    def search(self, source: PDFSource, query: str, max_results: int, seen_urls: Set[str] = None) -> List[Dict]:
+        """Run one source search and record its latency, outcome and yield"""
+        if source.max_results is not None:
+            max_results = min(max_results, source.max_results)
+
+        started = time.perf_counter()
+        error = None
+        with span('source.search', source=source.name, query=query) as s:
+            try:
+                results = source.search(query, max_results)
+            except Exception as e:
+                results = []
+                error = str(e)
+                s.status, s.error = 'error', error[:300]
+                print(f"❌ Source {source.name} failed: {e}")
+            s.set_attribute('results', len(results))
+        latency = time.perf_counter() - started
+
+        with self._lock:
+            stats = self._stats[source.name]
+            stats.calls += 1
+            stats.total_latency += latency
+            stats.last_attempt = time.time()
+            stats.results += len(results)
+
+            if error is None:
+                stats.successes += 1
+                stats.consecutive_failures = 0
+            else:
+                stats.failures += 1
+                stats.consecutive_failures += 1
+                stats.last_error = error[:200]
+
+            if seen_urls is not None:
+                for r in results:
+                    if r['url'] not in seen_urls:
+                        seen_urls.add(r['url'])
+                        stats.unique_results += 1
+            else:
+                stats.unique_results += len(results)
+
+        print(f"📚 {source.name} found {len(results)} PDFs in {latency:.1f}s")
+        return results
+
+    def save(self):
+        """Persist stats so ordering carries over between runs"""
+        with self._lock:
+            data = {name: stats.to_dict() for name, stats in self._stats.items()}
+        try:
+            save_json(self.stats_file, data)
+        except OSError as e:
+            print(f"⚠️ Could not save source stats: {e}")
+
+    def summary(self) -> List[Dict]:
+        """Per-source stats for display, in planned order (sources cooling down last)"""
+        now = time.time()
+        order = list(self._sources)
+        active = {name: self._is_healthy(self._stats[name], now) for name in order}
+        rows = []
+        for name in sorted(order, key=lambda name: (not active[name], self._plan_key(name, order))):
+            stats = self._stats[name]
+            rows.append({
+                'source': name,
+                'calls': stats.calls,
+                'success_rate': round(stats.success_rate, 2),
+                'avg_latency_s': round(stats.avg_latency, 2),
+                'unique_per_call': round(stats.unique_yield, 2),
+                'score': round(stats.score, 3),
+                'active': active[name],
+                'last_error': stats.last_error
+            })
+        return rows
@@ -0,0 +1,215 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+from services.local_state import state_path
+
+_PRIME = np.uint64(4294967291)  # largest prime below 2**32, so a*x + b fits in uint64
+_WORD_RE = re.compile(r'\w+')
+_URL_RE = re.compile(r'https?://\S+')
+
+
+def _hash32(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=4).digest(), 'little')
+
+
+def normalize(text: str) -> List[str]:
+    """Lowercased words without URLs, so link or emoji changes don't hide a repeat"""
+    return _WORD_RE.findall(_URL_RE.sub(' ', str(text or '').lower()))
+
+
+def post_label(post) -> str:
+    return f"post #{post.get('id', '?')} ({post.get('status', '')})"
+
+
+class PostIndex:
+    """MinHash signatures of every post, with an LSH table for near-duplicate lookups.
+
+    Each post is reduced to num_perm MinHash values over word shingles and
+    split into bands; posts sharing any band bucket are candidates, and only
+    those are compared. Bucket lookups hit an SQLite index, so a check costs
+    the same with fifty posts or fifty thousand. Entries are keyed by a hash
+    of the normalized text, which makes adding the same post twice a no-op.
+    """
+
+    def __init__(self, db_file: str = 'post_index.sqlite', num_perm: int = 64, bands: int = 16,
+                 shingle_size: int = 3, threshold: float = None):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db_path = state_path(db_file)
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold if threshold is not None else float(os.getenv('DUPLICATE_THRESHOLD', '0.8'))
+
+        # Fixed seed: signatures are stored, so the permutations must never change
+        rng = np.random.default_rng(20240601)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    key TEXT PRIMARY KEY,
+                    label TEXT NOT NULL,
+                    preview TEXT NOT NULL,
+                    signature BLOB NOT NULL,
+                    added_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    band INTEGER NOT NULL,
+                    bucket INTEGER NOT NULL,
+                    key TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lsh_bucket ON lsh_buckets (band, bucket)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_lsh_key ON lsh_buckets (key)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Connection that commits (or rolls back) and is closed on exit"""
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(' '.join(normalize(text)).encode('utf-8')).hexdigest()
+
+    def signature(self, text: str) -> np.ndarray:
+        words = normalize(text)
+        k = min(self.shingle_size, len(words)) or 1
+        shingles = {' '.join(words[i:i + k]) for i in range(max(len(words) - k + 1, 1))}
+        hashes = np.array([_hash32(s) for s in shingles], dtype=np.uint64) % _PRIME
+        # One row per permutation: (a*x + b) mod p over every shingle, keep the minimum
+        return ((np.outer(self._a, hashes) + self._b[:, None]) % _PRIME).min(axis=1)
+
+    def _buckets(self, signature: np.ndarray) -> List[Tuple[int, int]]:
+        buckets = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            buckets.append((band, int.from_bytes(digest, 'little', signed=True)))
+        return buckets
+
+    def add(self, text: str, label: str = '') -> bool:
+        """Index one post; returns False when the same text was already indexed"""
+        return self.add_many([(text, label)]) == 1
+
+    def add_many(self, posts: Iterable[Tuple[str, str]]) -> int:
+        """Index (text, label) pairs in one transaction, skipping known and empty texts"""
+        entries = []
+        for text, label in posts:
+            if not normalize(text):
+                continue
+            signature = self.signature(text)
+            entries.append((self.key(text), label, str(text)[:200], signature))
+
+        added = 0
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            for key, label, preview, signature in entries:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO posts (key, label, preview, signature, added_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, label, preview, signature.astype('<u4').tobytes(), now)
+                )
+                if cursor.rowcount:
+                    conn.executemany(
+                        "INSERT INTO lsh_buckets (band, bucket, key) VALUES (?, ?, ?)",
+                        [(band, bucket, key) for band, bucket in self._buckets(signature)]
+                    )
+                    added += 1
+        return added
+
+    def remove(self, text: str):
+        key = self.key(text)
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM posts WHERE key = ?", (key,))
+            conn.execute("DELETE FROM lsh_buckets WHERE key = ?", (key,))
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def find_similar(self, text: str, limit: int = 3, threshold: float = None) -> List[Dict]:
+        """Indexed posts whose estimated Jaccard similarity with text is at least threshold"""
+        if not normalize(text):
+            return []
+        threshold = self.threshold if threshold is None else threshold
+        signature = self.signature(text)
+        buckets = self._buckets(signature)
+
+        with self._connect() as conn:
+            clauses = ' OR '.join('(band = ? AND bucket = ?)' for _ in buckets)
+            candidates = conn.execute(
+                f"SELECT p.key, p.label, p.preview, p.signature FROM posts p WHERE p.key IN "
+                f"(SELECT key FROM lsh_buckets WHERE {clauses})",
+                [value for pair in buckets for value in pair]
+            ).fetchall()
+
+        matches = []
+        for key, label, preview, stored in candidates:
+            similarity = float(np.mean(np.frombuffer(stored, dtype='<u4') == signature))
+            if similarity >= threshold:
+                matches.append({'key': key, 'label': label, 'preview': preview, 'similarity': round(similarity, 2)})
+        matches.sort(key=lambda m: m['similarity'], reverse=True)
+        return matches[:limit]
+
+    def is_duplicate(self, text: str) -> bool:
+        return bool(self.find_similar(text, limit=1))
+
+    def backfill(self) -> int:
+        """Index every post already in the posts sheet, once per index file.
+
+        The flag is stored with the index, so posts indexed first by the
+        scheduler or curation don't make the history look covered.
+        """
+        with self._connect() as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE name = 'backfilled'").fetchone():
+                return 0
+
+        from services.sheet_cache import get_sheet_cache
+        from services.sheets import open_worksheet
+        try:
+            posts = get_sheet_cache().records(open_worksheet("LinkedIn_Posts", "posts"))
+        except Exception as e:
+            # Not flagged, so the next process start tries again
+            print(f"⚠️ Could not index existing posts: {e}")
+            return 0
+
+        indexed = self.add_many((str(p.get('content', '')), post_label(p)) for p in posts)
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (name, value) VALUES ('backfilled', ?)",
+                         (datetime.now().isoformat(),))
+        if indexed:
+            print(f"🧬 Indexed {indexed} posts for duplicate detection")
+        return indexed
+
+
+_shared_index = None
+_shared_lock = threading.Lock()
+
+
+def get_post_index() -> PostIndex:
+    """Process-wide index shared by the app, scheduler and curation"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = PostIndex()
+            _shared_index.backfill()
+        return _shared_index
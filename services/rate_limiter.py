@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class _HostBucket:
+    """Token bucket state for a single host"""
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+
+class HostRateLimiter:
+    """Per-host token bucket limiter that adapts to 429/503 responses.
+
+    Each host gets its own bucket, so requests to different hosts never wait
+    on each other. A throttled response halves the host's rate and honours
+    Retry-After up to max_retry_after seconds; successful responses slowly
+    restore it (AIMD).
+    """
+
+    def __init__(self, rate: float = 0.5, burst: float = 2, min_rate: float = 0.02, max_rate: float = None,
+                 max_retry_after: float = 300.0):
+        self.base_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate or rate * 4
+        self.max_retry_after = max_retry_after
+        self._buckets: Dict[str, _HostBucket] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return (urlparse(url).netloc or url).lower()
+
+    def _bucket(self, host: str) -> _HostBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _HostBucket(self.base_rate, self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def acquire(self, url: str):
+        """Block until a request to this URL's host is allowed"""
+        host = self._host(url)
+        while True:
+            with self._lock:
+                bucket = self._bucket(host)
+                now = time.monotonic()
+                bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate)
+                bucket.updated = now
+
+                if bucket.blocked_until > now:
+                    wait = bucket.blocked_until - now
+                elif bucket.tokens >= 1:
+                    bucket.tokens -= 1
+                    return
+                else:
+                    wait = (1 - bucket.tokens) / bucket.rate
+            time.sleep(wait)
+
+    def report(self, url: str, status_code: int, retry_after: Optional[str] = None):
+        """Feed a response status back so the host's rate can adapt"""
+        host = self._host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+
+            if status_code in (429, 503):
+                bucket.rate = max(self.min_rate, bucket.rate / 2)
+                bucket.tokens = 0
+                delay = self._parse_retry_after(retry_after)
+                if delay is None:
+                    delay = 1 / bucket.rate
+                elif delay > self.max_retry_after:
+                    # A bad or hostile header must not block the host indefinitely
+                    print(f"⚠️ {host} asked to wait {delay:.0f}s, capping at {self.max_retry_after:.0f}s")
+                    delay = self.max_retry_after
+                bucket.blocked_until = max(bucket.blocked_until, now + delay)
+                print(f"🐢 {host} throttled ({status_code}), backing off {delay:.1f}s")
+            elif status_code < 400:
+                bucket.rate = min(self.max_rate, bucket.rate + self.base_rate * 0.1)
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Parse a Retry-After header given in seconds or as an HTTP date"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter shared by all curation fetchers"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter(
+                rate=float(os.getenv('CURATION_HOST_RATE', '0.5')),
+                burst=float(os.getenv('CURATION_HOST_BURST', '2')),
+                max_retry_after=float(os.getenv('CURATION_MAX_RETRY_AFTER', '300'))
+            )
+        return _shared_limiter
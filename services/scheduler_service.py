@@ -1,130 +1,508 @@
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.date import DateTrigger
+from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.executors.pool import ThreadPoolExecutor
 import pandas as pd
-from datetime import datetime
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+from datetime import datetime, timedelta
+from gspread.utils import rowcol_to_a1
+import os
+import threading
+from typing import Dict, List
+from dotenv import load_dotenv
+from services.local_state import load_json, save_json, state_path
+from services.sheets import get_sheets_client, open_worksheet
+from services.sheet_cache import get_sheet_cache
+from services.dashboard_stats import get_dashboard_stats
+from services.job_history import JobHistory, start_metrics_server
+from services.notification_service import get_notification_service
+from services.media_store import get_media_store
+from services.post_index import get_post_index
+from services.series_planner import SeriesPlanner, get_series_planner
+
+load_dotenv()
+
+CURATION_CHECKPOINT = 'curation_checkpoint.json'
+SCHEDULER_STATE = 'scheduler.json'
+JOBSTORE_FILE = 'jobs.sqlite'
+
+# Jobs in the persistent store are saved as references to these module-level
+# functions (bound methods can't be serialized); they dispatch to the live
+# SchedulerService instance of this process.
+_active_service = None
+
+
+def _run_active(job_id: str, method: str, *args):
+    if _active_service is not None:
+        _active_service.history.run(job_id, getattr(_active_service, method), *args)
+
+
+def _publish_job():
+    _run_active('daily_post', '_publish_scheduled_post')
+
+
+def _curation_job():
+    _run_active('daily_curation', '_run_curation')
+
+
+def _post_job(post_id: str):
+    _run_active('post', '_publish_post', post_id)
+
+
+def _sync_posts_job():
+    _run_active('sync_posts', 'sync_post_jobs')
+
+
+def _pregenerate_job():
+    _run_active('pregenerate_series', '_pregenerate_series')
+
+
+def _media_gc_job():
+    _run_active('media_gc', '_collect_media')
+
+
+def get_curation_topics() -> List[str]:
+    """Read daily curation topics from CURATION_TOPICS (comma-separated)"""
+    raw = os.getenv('CURATION_TOPICS', '')
+    return [t.strip() for t in raw.split(',') if t.strip()]
+
 
 class SchedulerService:
     """Background job scheduler"""
     
     def __init__(self):
-        self.scheduler = BackgroundScheduler(timezone='Asia/Kolkata')
+        global _active_service
+        
+        # Empty SCHEDULER_MISFIRE_GRACE means overdue runs fire no matter how late
+        misfire_grace = os.getenv('SCHEDULER_MISFIRE_GRACE', '')
+        
+        self.scheduler = BackgroundScheduler(
+            jobstores={
+                'default': SQLAlchemyJobStore(url=f"sqlite:///{state_path(JOBSTORE_FILE)}")
+            },
+            executors={
+                'default': ThreadPoolExecutor(max_workers=int(os.getenv('SCHEDULER_MAX_WORKERS', '4')))
+            },
+            job_defaults={
+                'coalesce': True,  # a backlog of missed runs fires once
+                'max_instances': 1,
+                'misfire_grace_time': int(misfire_grace) if misfire_grace else None
+            },
+            timezone='Asia/Kolkata'
+        )
         self._running = False
-        # Initialize Google Sheets client
-        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-        creds = ServiceAccountCredentials.from_json_keyfile_name("credentials.json", scope)
-        self.client = gspread.authorize(creds)
+        self._lock = threading.RLock()  # shared by every session using this instance
+        self._publish_lock = threading.Lock()  # one read-check-publish at a time
+        self._pregenerate_lock = threading.Lock()  # the nightly job and "run now" never overlap
+        self._post_index = {}
+        # Shared Google Sheets client (authorized once per process)
+        self.client = get_sheets_client()
+        _active_service = self
+        
+        # Run history and metrics endpoint (SCHEDULER_METRICS_PORT=0 disables)
+        self.history = JobHistory()
+        metrics_port = int(os.getenv('SCHEDULER_METRICS_PORT', '9464'))
+        self.metrics_server = start_metrics_server(metrics_port, self.render_metrics) if metrics_port else None
+        
+        # Start paused so the job store is loaded (and schedule changes can be
+        # made) without running anything until the scheduler is switched on
+        self.scheduler.start(paused=True)
         self._setup_jobs()
+        self.sync_post_jobs()
+        
+        # Resume automatically if the scheduler was running before a restart;
+        # overdue jobs then run once right away
+        if load_json(SCHEDULER_STATE, default={}).get('enabled'):
+            self.start()
     
     def _setup_jobs(self):
-        """Setup scheduled jobs"""
+        """Add default jobs, keeping schedules already saved in the job store"""
         
         # Daily post job - 9 AM
-        self.scheduler.add_job(
-            self._publish_scheduled_post,
-            CronTrigger(hour=9, minute=0),
-            id='daily_post',
-            name='Daily LinkedIn Post',
-            replace_existing=True
-        )
+        if self.scheduler.get_job('daily_post') is None:
+            self.scheduler.add_job(
+                _publish_job,
+                CronTrigger(hour=9, minute=0),
+                id='daily_post',
+                name='Daily LinkedIn Post'
+            )
         
         # Daily curation job - 8 AM
+        if self.scheduler.get_job('daily_curation') is None:
+            self.scheduler.add_job(
+                _curation_job,
+                CronTrigger(hour=8, minute=0),
+                id='daily_curation',
+                name='Daily Resource Curation'
+            )
+        
+        # Series pre-generation - 3 AM, while nobody is waiting on Gemini
+        if self.scheduler.get_job('pregenerate_series') is None:
+            self.scheduler.add_job(
+                _pregenerate_job,
+                CronTrigger(hour=int(os.getenv('PREGENERATE_HOUR', '3')), minute=0),
+                id='pregenerate_series',
+                name='Series Pre-generation'
+            )
+        
+        # Image cleanup - 4 AM, deletes uploads no queued post uses anymore
+        if self.scheduler.get_job('media_gc') is None:
+            self.scheduler.add_job(
+                _media_gc_job,
+                CronTrigger(hour=4, minute=0),
+                id='media_gc',
+                name='Image Cleanup'
+            )
+        
+        # Re-sync per-post jobs to catch edits made directly in the sheet
         self.scheduler.add_job(
-            self._run_curation,
-            CronTrigger(hour=8, minute=0),
-            id='daily_curation',
-            name='Daily Resource Curation',
+            _sync_posts_job,
+            IntervalTrigger(minutes=int(os.getenv('POST_SYNC_MINUTES', '15'))),
+            id='sync_posts',
+            name='Sync Post Jobs',
             replace_existing=True
         )
     
-    def _publish_scheduled_post(self):
-        """Publish next scheduled post"""
+    def _load_posts(self, fresh: bool = False):
+        """Posts worksheet and its rows as a DataFrame.
         
-        try:
-            posts_sheet = self.client.open("LinkedIn_Posts").worksheet("posts")
-            posts_df = pd.DataFrame(posts_sheet.get_all_records())
+        Rows come from the shared sheet cache; fresh=True re-checks the
+        spreadsheet's Drive metadata first, which publishing needs so a
+        post deleted or published by hand is never posted again.
+        """
+        posts_sheet = open_worksheet("LinkedIn_Posts", "posts")
+        return posts_sheet, pd.DataFrame(get_sheet_cache().records(posts_sheet, fresh=fresh))
+    
+    def _publish_scheduled_post(self) -> Dict:
+        """Publish next overdue post (catch-up sweep behind the per-post jobs)"""
+        
+        with self._publish_lock:
+            posts_sheet, posts_df = self._load_posts(fresh=True)
             
             # Get next pending post
-            pending = posts_df[posts_df['status'] == 'pending']
-            if len(pending) == 0:
-                return
-            
-            pending['scheduled_date'] = pd.to_datetime(pending['scheduled_date'])
-            pending = pending.sort_values('scheduled_date')
-            next_post = pending.iloc[0]
+            pending = posts_df[posts_df['status'] == 'pending'].copy()
+            pending['scheduled_date'] = pd.to_datetime(pending['scheduled_date'], errors='coerce')
+            pending = pending.dropna(subset=['scheduled_date']).sort_values('scheduled_date')
             
             # Check if it's time to post
-            now = datetime.now()
-            scheduled = next_post['scheduled_date']
+            if len(pending) == 0 or pending.iloc[0]['scheduled_date'] > datetime.now():
+                return {'outcome': 'idle'}
             
-            if scheduled <= now:
-                # Post to LinkedIn
-                from services.linkedin_service import LinkedInService
-                linkedin = LinkedInService()
+            return self._publish_row(posts_sheet, posts_df, pending.iloc[0])
+    
+    def _publish_post(self, post_id: str) -> Dict:
+        """Publish one post when its own date trigger fires"""
+        
+        with self._publish_lock:
+            posts_sheet, posts_df = self._load_posts(fresh=True)
+            match = posts_df[posts_df['id'].astype(str) == str(post_id)]
+            
+            # The post may have been deleted or published by hand meanwhile
+            if len(match) == 0 or match.iloc[0]['status'] != 'pending':
+                print(f"⏭️ Post {post_id} is no longer pending, skipping")
+                return {'outcome': 'skipped'}
+            
+            return self._publish_row(posts_sheet, posts_df, match.iloc[0])
+    
+    def _publish_row(self, posts_sheet, posts_df: pd.DataFrame, post):
+        """Post to LinkedIn and record the outcome on the post's sheet row"""
+        
+        # The app's browser, so scheduled posts don't each start a Chrome
+        from services.linkedin_service import get_linkedin_service
+        linkedin = get_linkedin_service()
+        
+        post_url = linkedin.create_post(
+            content=post['content'],
+            image_url=post['image_url'] if post['image_url'] else None
+        )
+        
+        failed = any(word in post_url.lower() for word in ('failed', 'error', 'draft'))
+        status = 'failed' if failed else 'published'
+        
+        # Update only the changed cells of this post's row (header is row 1)
+        columns = list(posts_df.columns)
+        row_number = int(posts_df.index[posts_df['id'].astype(str) == str(post['id'])][0]) + 2
+        updates = {
+            'status': status,
+            'post_url': post_url,
+            'published_at': datetime.now().isoformat() if not failed else ''
+        }
+        posts_sheet.batch_update([
+            {
+                'range': rowcol_to_a1(row_number, columns.index(column) + 1),
+                'values': [[value]]
+            }
+            for column, value in updates.items() if column in columns
+        ])
+        get_sheet_cache().note_write(posts_sheet)
+        get_dashboard_stats().post_status_changed(post, 'pending', status)
+        
+        # Send notification
+        if failed:
+            self._send_notification(f"❌ Post failed: {post['topic']}")
+            return {'outcome': 'failed', 'posts_failed': 1}
+        
+        self._send_notification(f"✅ Post published: {post['topic']}")
+        return {'posts_published': 1}
+    
+    def sync_post_jobs(self, posts_df: pd.DataFrame = None) -> Dict:
+        """Register a one-shot date job per pending post and drop stale ones.
+        
+        Called whenever the queue changes, and periodically to pick up
+        edits made directly in the sheet.
+        """
+        
+        with self._lock:
+            try:
+                if posts_df is None:
+                    _, posts_df = self._load_posts()
                 
-                post_url = linkedin.create_post(
-                    content=next_post['content'],
-                    image_url=next_post['image_url'] if next_post['image_url'] else None
-                )
+                upcoming = {}
+                if not posts_df.empty and 'status' in posts_df.columns:
+                    pending = posts_df[posts_df['status'] == 'pending'].copy()
+                    pending['scheduled_date'] = pd.to_datetime(pending['scheduled_date'], errors='coerce')
+                    pending = pending.dropna(subset=['scheduled_date']).sort_values('scheduled_date')
+                    
+                    # Keep a minimum gap between posts, counting from the last
+                    # one published, so overdue backlogs don't all go out in
+                    # the same minute
+                    gap = timedelta(minutes=int(os.getenv('POST_MIN_GAP_MINUTES', '15')))
+                    now = datetime.now().astimezone()
+                    previous = None
+                    if 'published_at' in posts_df.columns:
+                        published = pd.to_datetime(posts_df['published_at'], errors='coerce').dropna()
+                        if not published.empty:
+                            previous = published.max().to_pydatetime().astimezone()
+                    for _, post in pending.iterrows():
+                        job_id = f"post_{post['id']}"
+                        run_at = post['scheduled_date'].to_pydatetime().astimezone()
+                        if run_at < now:
+                            # Overdue: keep the slot an earlier sync gave it
+                            planned = self._post_index.get(job_id)
+                            run_at = planned if planned is not None and planned >= now else now
+                        if previous is not None and run_at < previous + gap:
+                            run_at = previous + gap
+                        upcoming[job_id] = (str(post['id']), str(post['topic']), run_at)
+                        previous = run_at
                 
-                # Update status
-                posts_df.loc[posts_df['id'] == next_post['id'], 'status'] = 'published'
-                posts_df.loc[posts_df['id'] == next_post['id'], 'post_url'] = post_url
-                posts_df.loc[posts_df['id'] == next_post['id'], 'published_at'] = now.isoformat()
+                # Drop jobs for posts that were published, deleted or drafted
+                for job in self.scheduler.get_jobs():
+                    if job.id.startswith('post_') and job.id not in upcoming:
+                        job.remove()
                 
-                # Update Google Sheet
-                posts_sheet.clear()
-                posts_sheet.append_row(list(posts_df.columns))
-                for _, row in posts_df.iterrows():
-                    posts_sheet.append_row([str(v) for v in row.values])
+                for job_id, (post_id, topic, run_at) in upcoming.items():
+                    job = self.scheduler.get_job(job_id)
+                    if job is not None and job.trigger.run_date == run_at:
+                        continue
+                    self.scheduler.add_job(
+                        _post_job,
+                        DateTrigger(run_date=run_at),
+                        args=[post_id],
+                        id=job_id,
+                        name=f"Post: {topic[:50]}",
+                        replace_existing=True
+                    )
                 
-                # Send notification
-                self._send_notification(f"✅ Post published: {next_post['topic']}")
+                self._post_index = {job_id: run_at for job_id, (_, _, run_at) in upcoming.items()}
+                return {'post_jobs': len(upcoming)}
+            
+            except Exception as e:
+                print(f"Error syncing post jobs: {e}")
+                return {'outcome': 'error'}
+    
+    def get_next_post_time(self):
+        """Run time of the earliest scheduled post job"""
+        post_jobs = [job for job in self.scheduler.get_jobs() if job.id.startswith('post_') and job.next_run_time]
+        return min((job.next_run_time for job in post_jobs), default=None)
+    
+    def _run_curation(self) -> Dict:
+        """Run resource curation, resuming from the last finished topic"""
         
-        except Exception as e:
-            print(f"Error publishing post: {e}")
+        topics = get_curation_topics()
+        if not topics:
+            print("⚠️ No curation topics configured (set CURATION_TOPICS in .env)")
+            return {'outcome': 'skipped'}
+        
+        max_per_topic = int(os.getenv('CURATION_MAX_PER_TOPIC', '5'))
+        today = datetime.now().date().isoformat()
+        
+        # Start a fresh checkpoint for a new day or a changed topic list
+        checkpoint = load_json(CURATION_CHECKPOINT, default=None)
+        if not checkpoint or checkpoint.get('run_date') != today or checkpoint.get('topics') != topics:
+            checkpoint = {'run_date': today, 'topics': topics, 'completed': {}}
+        
+        remaining = [t for t in topics if t not in checkpoint['completed']]
+        if not remaining:
+            print(f"✅ Curation already completed for {today}")
+            return {'outcome': 'skipped'}
+        if len(remaining) < len(topics):
+            print(f"♻️ Resuming curation: {len(topics) - len(remaining)}/{len(topics)} topics already done")
+        
+        from services.curation_service import get_curation_service
+        curator = get_curation_service()
+        
+        resources_found = 0
+        for topic in remaining:
+            resources = curator.curate_resources_from_topics(
+                topics=[topic],
+                max_per_topic=max_per_topic
+            )
+            resources_found += len(resources)
+            checkpoint['completed'][topic] = len(resources)
+            save_json(CURATION_CHECKPOINT, checkpoint)
+        
+        total = sum(checkpoint['completed'].values())
+        self._send_notification(f"📚 Curated {total} resources across {len(topics)} topics")
+        return {'topics_completed': len(remaining), 'resources_found': resources_found}
     
-    def _run_curation(self):
-        """Run resource curation"""
+    def _pregenerate_series(self) -> Dict:
+        """Top up each active series plan's buffer of ready posts in the queue"""
         
+        if not self._pregenerate_lock.acquire(blocking=False):
+            print("⏭️ Series pre-generation already running")
+            return {'outcome': 'skipped'}
         try:
-            from services.curation_service import CurationService
-            curator = CurationService()
+            planner = get_series_planner()
+            plans = [p for p in planner.plans() if p['status'] == 'active']
+            if not plans:
+                return {'outcome': 'idle'}
             
-            resources = curator.curate_resources()
+            from services.ai_service import get_ai_service
+            ai_service = get_ai_service()
+            post_index = get_post_index()
+            posts_sheet, posts_df = self._load_posts(fresh=True)
+            ids = pd.to_numeric(posts_df['id'], errors='coerce').dropna() if 'id' in posts_df.columns else pd.Series(dtype=float)
+            next_id = int(ids.max()) + 1 if len(ids) else 1
+            
+            generated = 0
+            for plan in plans:
+                # Earlier plans may have taken minutes; skip one paused or removed meanwhile
+                plan = planner.get(plan['id'])
+                if not plan or plan['status'] != 'active':
+                    continue
+                ready = len(SeriesPlanner.ready_posts(plan, posts_df))
+                need = min(plan['buffer'] - ready, plan['total_posts'] - plan['generated'])
+                if need <= 0:
+                    continue
+                
+                first_day = plan['generated'] + 1
+                posts = ai_service.generate_post_series(
+                    topic=plan['topic'],
+                    num_posts=need,
+                    add_emojis=plan['add_emojis'],
+                    is_duplicate=post_index.is_duplicate,
+                    first_day=first_day,
+                    series_length=plan['total_posts']
+                )
+                
+                # Queue posts in day order up to the first one that fails
+                # validation; the next run retries from that day
+                new_posts = []
+                for day, post in enumerate(posts, first_day):
+                    problem = self._invalid_post_reason(post, day)
+                    if problem:
+                        print(f"⚠️ {plan['series']} day {day} not queued: {problem}")
+                        break
+                    new_posts.append({
+                        'id': next_id,
+                        'series': plan['series'],
+                        'topic': f"Day {day}: {post.get('title', 'Untitled')}",
+                        'content': post['content'],
+                        'status': 'pending',
+                        'scheduled_date': SeriesPlanner.scheduled_for(plan, day).isoformat(),
+                        'image_url': '',
+                        'post_url': '',
+                        'created_at': datetime.now().isoformat(),
+                        'published_at': ''
+                    })
+                    next_id += 1
+                
+                if new_posts:
+                    posts_sheet.append_rows([[str(v) for v in p.values()] for p in new_posts])
+                    get_sheet_cache().note_write(posts_sheet)
+                    get_dashboard_stats().posts_added(new_posts)
+                    post_index.add_many((p['content'], f"post #{p['id']} (pending)") for p in new_posts)
+                    generated += len(new_posts)
+                
+                planner.record_generated(plan['id'], [p['id'] for p in new_posts])
             
-            self._send_notification(f"📚 Curated {len(resources)} new resources")
+            if generated:
+                self.sync_post_jobs()
+                self._send_notification(f"🗓️ Pre-generated {generated} series posts, ready for review")
+            return {'posts_generated': generated, 'plans': len(plans)}
+        finally:
+            self._pregenerate_lock.release()
+    
+    @staticmethod
+    def _invalid_post_reason(post: Dict, day: int) -> str:
+        """Why a generated post can't be queued unattended ('' if it can)"""
+        content = str(post.get('content', '')).strip()
+        if not content or content.startswith('[Placeholder]'):
+            return 'generation failed'
+        if post.get('day') != day:
+            return f"expected day {day}, got {post.get('day')}"
+        if post.get('duplicate'):
+            return 'too similar to an earlier post'
+        if len(content) > 3000:
+            return f"{len(content)} characters is over LinkedIn's 3000 limit"
+        return ''
+    
+    def _collect_media(self) -> Dict:
+        """Delete stored images that no pending or draft post refers to"""
         
-        except Exception as e:
-            print(f"Error running curation: {e}")
+        _, posts_df = self._load_posts(fresh=True)
+        referenced = []
+        if not posts_df.empty and 'image_url' in posts_df.columns:
+            waiting = posts_df[posts_df['status'].isin(['pending', 'draft'])]
+            referenced = [str(p) for p in waiting['image_url'] if str(p).strip()]
+        return get_media_store().gc(referenced)
+    
+    def pregenerate_now(self):
+        """Run series pre-generation in the background instead of waiting for the night"""
+        threading.Thread(
+            target=self.history.run, args=('pregenerate_series', self._pregenerate_series), daemon=True
+        ).start()
     
     def _send_notification(self, message: str):
-        """Send Telegram notification"""
+        """Queue a Telegram notification (delivered in the background)"""
         
         try:
-            from services.notification_service import NotificationService
-            notif = NotificationService()
-            notif.send_message(message)
-        except:
-            pass
+            get_notification_service().send_message(message)
+        except Exception as e:
+            print(f"⚠️ Could not queue notification: {e}")
     
     def start(self):
         """Start scheduler"""
-        if not self._running:
-            self.scheduler.start()
-            self._running = True
+        with self._lock:
+            if not self._running:
+                self.scheduler.resume()
+                self._running = True
+                save_json(SCHEDULER_STATE, {'enabled': True})
     
     def stop(self):
         """Stop scheduler"""
-        if self._running:
-            self.scheduler.shutdown()
-            self._running = False
+        with self._lock:
+            if self._running:
+                self.scheduler.pause()
+                self._running = False
+                save_json(SCHEDULER_STATE, {'enabled': False})
     
     def is_running(self) -> bool:
         """Check if scheduler is running"""
         return self._running
     
+    def get_run_history(self, limit: int = 20) -> List[Dict]:
+        """Most recent job runs with duration, outcome and counts"""
+        return self.history.recent(limit)
+    
+    def render_metrics(self) -> str:
+        """Prometheus metrics for the /metrics endpoint"""
+        return self.history.metrics(gauges={
+            'linkedin_scheduler_running': 1 if self._running else 0,
+            'linkedin_scheduler_post_jobs': len(self._post_index)
+        })
+    
     def get_next_run_time(self, job_id: str):
         """Get next run time for job"""
         job = self.scheduler.get_job(job_id)
@@ -132,7 +510,8 @@ class SchedulerService:
     
     def update_schedule(self, job_id: str, hour: int, minute: int):
         """Update job schedule"""
-        self.scheduler.reschedule_job(
-            job_id,
-            trigger=CronTrigger(hour=hour, minute=minute)
-        )
\ No newline at end of file
+        with self._lock:
+            self.scheduler.reschedule_job(
+                job_id,
+                trigger=CronTrigger(hour=hour, minute=minute)
+            )
\ No newline at end of file
@@ -0,0 +1,139 @@
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+
+from services.local_state import load_json, save_json
+from services.tracing import span
+
+SELECTORS_FILE = 'selectors.json'
+
+# Candidate locators for each composer element, in the order they were
+# historically reliable. The registry tries whichever worked last first.
+ELEMENTS: Dict[str, List[Tuple[str, str]]] = {
+    'start_post': [
+        (By.CSS_SELECTOR, "button.share-box-feed-entry__trigger"),
+        (By.XPATH, "//button[contains(@class, 'share-box-feed-entry__trigger')]"),
+        (By.XPATH, "//button[contains(., 'Start a post')]")
+    ],
+    'editor': [
+        (By.CSS_SELECTOR, "div.ql-editor"),
+        (By.CSS_SELECTOR, "div[role='textbox'][contenteditable='true']")
+    ],
+    'add_media': [
+        (By.XPATH, "//button[@aria-label='Add media']"),
+        (By.XPATH, "//button[contains(@aria-label, 'media')]")
+    ],
+    'add_document': [
+        (By.XPATH, "//button[@aria-label='Add a document']"),
+        (By.XPATH, "//button[contains(@aria-label, 'document')]")
+    ],
+    'file_input': [
+        (By.CSS_SELECTOR, "input[type='file']")
+    ],
+    'done_button': [
+        (By.XPATH, "//button[contains(text(), 'Done')]"),
+        (By.XPATH, "//button[.//span[normalize-space()='Done']]")
+    ],
+    'post_button': [
+        (By.CSS_SELECTOR, "button.share-actions__primary-action"),
+        (By.XPATH, "//button[normalize-space()='Post']")
+    ]
+}
+
+
+class SelectorRegistry:
+    """Finds composer elements, trying the selector that last worked first.
+
+    Instead of a full WebDriverWait per stale selector, every poll (poll
+    seconds apart) checks all candidates with a non-blocking
+    find_elements, the remembered one first. A lookup therefore returns as
+    soon as any candidate matches. The winning selector and per-element hit
+    counts are kept in a small local file, so they survive restarts.
+    """
+
+    def __init__(self, filename: str = SELECTORS_FILE, poll: float = 0.1):
+        self.filename = filename
+        self.poll = poll
+        self._lock = threading.Lock()
+        self._state = load_json(filename, default={})
+
+    def _candidates(self, element: str) -> List[Tuple[str, str]]:
+        candidates = list(ELEMENTS[element])
+        last = self._state.get(element, {}).get('last')
+        if last:
+            last = tuple(last)
+            if last in candidates:
+                candidates.remove(last)
+            candidates.insert(0, last)
+        return candidates
+
+    def find(self, driver, element: str, timeout: float = 15, clickable: bool = False):
+        """First element matching any candidate of element; TimeoutException after timeout"""
+        candidates = self._candidates(element)
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with span('linkedin.find', element=element) as s:
+            while True:
+                for index, locator in enumerate(candidates):
+                    try:
+                        for found in driver.find_elements(*locator):
+                            if not clickable or (found.is_displayed() and found.is_enabled()):
+                                self._record(element, locator, hit=index == 0, elapsed=time.monotonic() - started)
+                                s.set_attribute('hit', index == 0)
+                                s.set_attribute('candidate', index)
+                                return found
+                    except StaleElementReferenceException:
+                        continue
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(self.poll)
+
+            self._record(element, None, hit=False, elapsed=time.monotonic() - started)
+            s.set_attribute('hit', False)
+            raise TimeoutException(f"No selector for '{element}' matched within {timeout:g}s")
+
+    def _record(self, element: str, locator, hit: bool, elapsed: float):
+        with self._lock:
+            stats = self._state.setdefault(element, {'lookups': 0, 'hits': 0, 'failures': 0, 'total_ms': 0.0})
+            stats['lookups'] += 1
+            stats['total_ms'] += elapsed * 1000
+            if locator is None:
+                stats['failures'] += 1
+            else:
+                stats['hits'] += int(hit)
+                if not hit:
+                    print(f"🔁 Selector for '{element}' changed to {locator[1]}")
+                stats['last'] = list(locator)
+            save_json(self.filename, self._state)
+
+    def summary(self) -> List[Dict]:
+        """Per element: lookups, first-try hit rate, failures, mean time and current selector"""
+        rows = []
+        for element, stats in sorted(self._state.items()):
+            lookups = stats.get('lookups', 0)
+            rows.append({
+                'element': element,
+                'lookups': lookups,
+                'hit_rate': round(stats.get('hits', 0) / lookups, 3) if lookups else None,
+                'failures': stats.get('failures', 0),
+                'mean_ms': round(stats.get('total_ms', 0) / lookups, 1) if lookups else None,
+                'selector': (stats.get('last') or ['', ''])[1]
+            })
+        return rows
+
+
+_shared_registry = None
+_shared_lock = threading.Lock()
+
+
+def get_selector_registry() -> SelectorRegistry:
+    """Process-wide registry shared by every LinkedInService"""
+    global _shared_registry
+    with _shared_lock:
+        if _shared_registry is None:
+            _shared_registry = SelectorRegistry()
+        return _shared_registry
@@ -0,0 +1,113 @@
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from services.local_state import load_json, save_json
+
+PLANS_FILE = 'series_plans.json'
+
+
+class SeriesPlanner:
+    """Series plans whose posts the scheduler writes ahead of time.
+
+    A plan is a topic, a length and a cadence. The scheduler's off-peak
+    pre-generation job keeps `buffer` validated posts of each active plan
+    pending in the queue, generating the next days of the series as
+    earlier ones are published, until all total_posts are queued. The
+    ids of the posts a plan queued are kept with it, so a manual series
+    with the same name doesn't count towards its buffer.
+    """
+
+    def __init__(self, filename: str = PLANS_FILE):
+        self.filename = filename
+        self._lock = threading.Lock()
+
+    def plans(self) -> List[Dict]:
+        return load_json(self.filename, default=[])
+
+    def get(self, plan_id: str) -> Optional[Dict]:
+        return next((p for p in self.plans() if p['id'] == plan_id), None)
+
+    def add(self, series: str, topic: str, total_posts: int, start_date: date, post_time: time,
+            cadence_days: int = 1, buffer: int = 5, add_emojis: bool = True) -> Dict:
+        plan = {
+            'id': uuid.uuid4().hex[:8],
+            'series': series,
+            'topic': topic,
+            'total_posts': int(total_posts),
+            'start_date': start_date.isoformat(),
+            'post_time': post_time.strftime('%H:%M'),
+            'cadence_days': max(int(cadence_days), 1),
+            'buffer': max(int(buffer), 1),
+            'add_emojis': bool(add_emojis),
+            'generated': 0,
+            'post_ids': [],
+            'status': 'active',
+            'created_at': datetime.now().isoformat(),
+            'last_run': ''
+        }
+        with self._lock:
+            plans = self.plans()
+            plans.append(plan)
+            save_json(self.filename, plans)
+        return plan
+
+    def update(self, plan_id: str, **changes):
+        with self._lock:
+            plans = self.plans()
+            for plan in plans:
+                if plan['id'] == plan_id:
+                    plan.update(changes)
+            save_json(self.filename, plans)
+
+    def record_generated(self, plan_id: str, post_ids: Iterable):
+        """Count newly queued posts towards a plan, re-reading it so a pause
+        made while they were being written is kept"""
+        post_ids = [str(i) for i in post_ids]
+        with self._lock:
+            plans = self.plans()
+            for plan in plans:
+                if plan['id'] == plan_id:
+                    plan['generated'] += len(post_ids)
+                    plan['post_ids'] = plan.get('post_ids', []) + post_ids
+                    plan['last_run'] = datetime.now().isoformat()
+                    if plan['generated'] >= plan['total_posts']:
+                        plan['status'] = 'done'
+            save_json(self.filename, plans)
+
+    def remove(self, plan_id: str):
+        with self._lock:
+            save_json(self.filename, [p for p in self.plans() if p['id'] != plan_id])
+
+    @staticmethod
+    def scheduled_for(plan: Dict, day: int) -> datetime:
+        """Publish time of a plan's day-th post (day 1 is the start date)"""
+        start = datetime.combine(date.fromisoformat(plan['start_date']),
+                                 datetime.strptime(plan['post_time'], '%H:%M').time())
+        return start + timedelta(days=(day - 1) * plan['cadence_days'])
+
+    @staticmethod
+    def ready_posts(plan: Dict, posts_df: pd.DataFrame) -> pd.DataFrame:
+        """The plan's posts still pending in the queue"""
+        if posts_df.empty or not {'id', 'series', 'status'}.issubset(posts_df.columns):
+            return posts_df.iloc[0:0]
+        mine = posts_df['series'] == plan['series']
+        if 'post_ids' in plan:
+            mine &= posts_df['id'].astype(str).isin(plan['post_ids'])
+        return posts_df[mine & (posts_df['status'] == 'pending')]
+
+
+_shared_planner = None
+_shared_lock = threading.Lock()
+
+
+def get_series_planner() -> SeriesPlanner:
+    """Process-wide planner shared by the app and the scheduler"""
+    global _shared_planner
+    with _shared_lock:
+        if _shared_planner is None:
+            _shared_planner = SeriesPlanner()
+        return _shared_planner
@@ -0,0 +1,172 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from services.sheets import get_sheets_client
+from services.tracing import span
+
+
+class SheetWatcher:
+    """Tracks each spreadsheet's Drive modifiedTime with one cheap listing call.
+
+    A single files.list request (gspread's list_spreadsheet_files) returns
+    the modifiedTime of every spreadsheet, and it is made at most once per
+    poll_interval unless a caller asks for a fresh check. Listeners hear
+    about every change, along with whether it looks external, meaning the
+    new modifiedTime is later than the app's last write to that spreadsheet
+    (wall clock, with clock_skew seconds of tolerance). A local write is
+    therefore recognised however long it takes until the next poll.
+    When the listing call fails, reads go uncached and the poll is retried
+    after a backoff that doubles up to max_backoff seconds.
+    """
+
+    def __init__(self, poll_interval: float = 30.0, clock_skew: float = 5.0,
+                 max_backoff: float = 900.0):
+        self.poll_interval = poll_interval
+        self.clock_skew = clock_skew
+        self.max_backoff = max_backoff
+        self.available = True
+        self._backoff = 0.0
+        self._retry_at = 0.0
+        self._modified: Dict[str, str] = {}
+        self._local_writes: Dict[str, float] = {}
+        self._listeners: List[Callable[[str, bool], None]] = []
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener: Callable[[str, bool], None]):
+        """Call listener(title, external) whenever a spreadsheet's modifiedTime moves"""
+        self._listeners.append(listener)
+
+    def note_local_write(self, title: str):
+        # Wall clock, to compare with Drive's modifiedTime
+        self._local_writes[title] = time.time()
+
+    def _is_external(self, title: str, modified: str) -> bool:
+        last_write = self._local_writes.get(title)
+        if last_write is None:
+            return True
+        try:
+            modified_at = datetime.fromisoformat(str(modified).replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return True
+        return modified_at > last_write + self.clock_skew
+
+    def modified_time(self, title: str, fresh: bool = False) -> Optional[str]:
+        """Last known modifiedTime, or None when Drive metadata isn't available"""
+        self._poll(force=fresh)
+        return self._modified.get(title)
+
+    def _poll(self, force: bool = False):
+        with self._lock:
+            now = time.monotonic()
+            if not self.available and now < self._retry_at:
+                return
+            if self.available and not force and now - self._checked < self.poll_interval:
+                return
+            self._checked = now
+
+            try:
+                with span('drive.poll'):
+                    files = get_sheets_client().list_spreadsheet_files()
+            except Exception as e:
+                # Without Drive metadata every read goes to the sheet, as before
+                self._backoff = min(max(self._backoff * 2, self.poll_interval), self.max_backoff)
+                self._retry_at = now + self._backoff
+                print(f"⚠️ Sheet change detection unavailable, reading uncached; retrying in {self._backoff:.0f}s: {e}")
+                self.available = False
+                self._modified.clear()
+                return
+
+            if not self.available:
+                print("✅ Sheet change detection back, caching re-enabled")
+                self.available = True
+                self._backoff = 0.0
+
+            changed = []
+            for f in files:
+                title, modified = f.get('name'), f.get('modifiedTime')
+                previous = self._modified.get(title)
+                if previous is not None and previous != modified:
+                    changed.append((title, self._is_external(title, modified)))
+                self._modified[title] = modified
+
+        for title, external in changed:
+            print(f"🔄 Spreadsheet {title} changed{' outside the app' if external else ''}")
+            for listener in self._listeners:
+                try:
+                    listener(title, external)
+                except Exception as e:
+                    print(f"⚠️ Sheet change listener failed: {e}")
+
+
+class SheetCache:
+    """get_all_records() results kept until the spreadsheet's modifiedTime moves"""
+
+    def __init__(self, watcher: SheetWatcher):
+        self.watcher = watcher
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Tuple[str, str], Tuple[str, List[Dict]]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(worksheet) -> Tuple[str, str]:
+        return worksheet.spreadsheet.title, worksheet.title
+
+    def records(self, worksheet, fresh: bool = False) -> List[Dict]:
+        """Worksheet rows as dicts; fresh=True re-checks Drive metadata first"""
+        key = self._key(worksheet)
+        modified = self.watcher.modified_time(key[0], fresh=fresh)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if modified is not None and entry is not None and entry[0] == modified:
+                self.hits += 1
+                return [dict(r) for r in entry[1]]
+            self.misses += 1
+
+        with span('sheets.read', sheet=key[1]):
+            records = worksheet.get_all_records()
+
+        if modified is not None:
+            with self._lock:
+                self._entries[key] = (modified, records)
+        return [dict(r) for r in records]
+
+    def note_write(self, worksheet):
+        """Drop the cached rows after the app itself changed the worksheet"""
+        key = self._key(worksheet)
+        with self._lock:
+            self._entries.pop(key, None)
+        self.watcher.note_local_write(key[0])
+
+    def invalidate(self, title: str = None):
+        with self._lock:
+            for key in [k for k in self._entries if title is None or k[0] == title]:
+                del self._entries[key]
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_sheet_cache() -> SheetCache:
+    """Process-wide cache shared by the app, scheduler and curation"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            watcher = SheetWatcher(poll_interval=float(os.getenv('SHEETS_POLL_SECONDS', '30')))
+            _shared_cache = SheetCache(watcher)
+            watcher.add_listener(_on_sheet_change)
+        return _shared_cache
+
+
+def _on_sheet_change(title: str, external: bool):
+    _shared_cache.invalidate(title)
+    # Hand edits aren't reflected in the incrementally maintained aggregates
+    if external:
+        from services.dashboard_stats import get_dashboard_stats
+        get_dashboard_stats().invalidate()
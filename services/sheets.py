@@ -0,0 +1,49 @@
+import threading
+
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+CREDENTIALS_FILE = "credentials.json"
+
+_client = None
+_client_lock = threading.Lock()
+_worksheets = {}
+
+
+def get_sheets_client():
+    """Authorized gspread client shared by the app and all services.
+
+    gspread and oauth2client are imported on first use, and the service
+    account is authorized once per process instead of once per service.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+
+            creds = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, SCOPE)
+            _client = gspread.authorize(creds)
+        return _client
+
+
+def set_sheets_client(client):
+    """Use an already-built client (e.g. the benchmark fakes) instead of authorizing"""
+    global _client
+    with _client_lock:
+        _client = client
+        _worksheets.clear()
+
+
+def open_worksheet(spreadsheet: str, worksheet: str):
+    """Worksheet handle, opened once per process.
+
+    Opening by title costs a Drive lookup plus a metadata fetch, so the
+    handles are kept instead of reopening the sheet on every rerun.
+    """
+    key = (spreadsheet, worksheet)
+    with _client_lock:
+        handle = _worksheets.get(key)
+    if handle is None:
+        handle = get_sheets_client().open(spreadsheet).worksheet(worksheet)
+        with _client_lock:
+            _worksheets[key] = handle
+    return handle
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import threading
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+from services.local_state import load_json, save_json
+
+USAGE_FILE = 'token_usage.json'
+RESPONSE_CACHE_FILE = 'ai_response_cache.json'
+
+
+class BudgetExceeded(Exception):
+    """Raised instead of calling Gemini once a daily token budget is used up"""
+
+
+class TokenLedger:
+    """Gemini token usage per task kind and day, with optional daily budgets.
+
+    Usage comes from each response's usage_metadata and is kept for
+    keep_days in a small local file. GEMINI_DAILY_TOKEN_BUDGET caps all
+    tasks together and GEMINI_DAILY_TOKEN_BUDGET_<TASK> (e.g. _SERIES) caps
+    one task; unset or 0 means unlimited. The last cache_size responses are
+    kept so an over-budget call can reuse the answer to an identical prompt.
+    """
+
+    def __init__(self, filename: str = USAGE_FILE, cache_file: str = RESPONSE_CACHE_FILE,
+                 keep_days: int = 90, cache_size: int = 100):
+        self.filename = filename
+        self.cache_file = cache_file
+        self.keep_days = keep_days
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def budget(task: str = None) -> int:
+        name = f"GEMINI_DAILY_TOKEN_BUDGET_{task.upper()}" if task else 'GEMINI_DAILY_TOKEN_BUDGET'
+        return int(os.getenv(name, '0') or 0)
+
+    def used_today(self, task: str = None) -> int:
+        tasks = load_json(self.filename, default={}).get(date.today().isoformat(), {})
+        if task:
+            return tasks.get(task, {}).get('total_tokens', 0)
+        return sum(t.get('total_tokens', 0) for t in tasks.values())
+
+    def check(self, task: str):
+        """Raise BudgetExceeded when today's total or task budget is spent"""
+        for scope in (None, task):
+            limit = self.budget(scope)
+            if limit and self.used_today(scope) >= limit:
+                raise BudgetExceeded(
+                    f"Daily Gemini token budget reached for {scope or 'all tasks'} "
+                    f"({self.used_today(scope)}/{limit} tokens)"
+                )
+
+    def record(self, task: str, usage) -> Dict[str, int]:
+        """Add one response's usage_metadata to today's totals and return it"""
+        tokens = {
+            'prompt_tokens': int(getattr(usage, 'prompt_token_count', 0) or 0),
+            'output_tokens': int(getattr(usage, 'candidates_token_count', 0) or 0),
+            'total_tokens': int(getattr(usage, 'total_token_count', 0) or 0)
+        }
+        today = date.today().isoformat()
+        with self._lock:
+            data = load_json(self.filename, default={})
+            totals = data.setdefault(today, {}).setdefault(
+                task, {'calls': 0, 'prompt_tokens': 0, 'output_tokens': 0, 'total_tokens': 0}
+            )
+            totals['calls'] += 1
+            for key, value in tokens.items():
+                totals[key] += value
+
+            cutoff = (date.today() - timedelta(days=self.keep_days)).isoformat()
+            for day in [d for d in data if d < cutoff]:
+                del data[day]
+            save_json(self.filename, data)
+        return tokens
+
+    def usage(self, days: int = 30) -> List[Dict]:
+        """One row per day and task, newest day first"""
+        cutoff = (date.today() - timedelta(days=days - 1)).isoformat()
+        data = load_json(self.filename, default={})
+        rows = []
+        for day in sorted((d for d in data if d >= cutoff), reverse=True):
+            for task, totals in sorted(data[day].items()):
+                rows.append({'day': day, 'task': task, **totals})
+        return rows
+
+    @staticmethod
+    def _prompt_key(task: str, prompt: str) -> str:
+        return hashlib.sha1(f"{task}\n{prompt}".encode('utf-8')).hexdigest()
+
+    def remember(self, task: str, prompt: str, text: str):
+        with self._lock:
+            cache = load_json(self.cache_file, default={})
+            cache.pop(self._prompt_key(task, prompt), None)
+            cache[self._prompt_key(task, prompt)] = text
+            # Dicts keep insertion order, so the oldest entries come first
+            for key in list(cache)[:-self.cache_size]:
+                del cache[key]
+            save_json(self.cache_file, cache)
+
+    def cached(self, task: str, prompt: str) -> Optional[str]:
+        return load_json(self.cache_file, default={}).get(self._prompt_key(task, prompt))
+
+
+_shared_ledger = None
+_shared_lock = threading.Lock()
+
+
+def get_token_ledger() -> TokenLedger:
+    """Process-wide ledger shared by every AIService"""
+    global _shared_ledger
+    with _shared_lock:
+        if _shared_ledger is None:
+            _shared_ledger = TokenLedger()
+        return _shared_ledger
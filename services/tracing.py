@@ -0,0 +1,184 @@
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, List
+
+from services.local_state import state_path
+
+TRACE_FILE = 'traces.jsonl'
+TRACE_MAX_BYTES = int(os.getenv('TRACE_MAX_BYTES', str(10 * 1024 * 1024)))
+
+# Set TRACING=0 to turn span recording off entirely
+TRACING_ENABLED = os.getenv('TRACING', '1') != '0'
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+class Span:
+    """A timed operation with attributes; use span() rather than creating directly"""
+
+    def __init__(self, name: str, attributes: Dict, parent: 'Span' = None):
+        self.name = name
+        self.attributes = dict(attributes)
+        self.trace_id = parent.trace_id if parent else uuid.uuid4().hex[:16]
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent.span_id if parent else None
+        self.start = time.time()
+        self.status = 'ok'
+        self.error = ''
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    def to_record(self, duration: float) -> Dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': round(self.start, 6),
+            'duration_ms': round(duration * 1000, 3),
+            'status': self.status,
+            'error': self.error,
+            'attributes': self.attributes
+        }
+
+
+class JsonlExporter:
+    """Appends finished spans to a local JSONL file, rotating it when large"""
+
+    def __init__(self, path: str, max_bytes: int = TRACE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def export(self, record: Dict):
+        line = json.dumps(record, default=str) + '\n'
+        with self._lock:
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) > self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+            except OSError as e:
+                print(f"⚠️ Could not write trace: {e}")
+
+
+def _otel_tracer():
+    """OpenTelemetry tracer when TRACE_EXPORTER=otel and the SDK is installed"""
+    if os.getenv('TRACE_EXPORTER', 'jsonl') != 'otel':
+        return None
+    try:
+        from opentelemetry import trace
+        return trace.get_tracer('linkedin-automation')
+    except ImportError:
+        print("⚠️ TRACE_EXPORTER=otel but opentelemetry is not installed; using JSONL only")
+        return None
+
+
+_exporter = None
+_otel = None
+_init_lock = threading.Lock()
+
+
+def _get_exporters():
+    global _exporter, _otel
+    if _exporter is None:
+        with _init_lock:
+            if _exporter is None:
+                _otel = _otel_tracer()
+                _exporter = JsonlExporter(state_path(TRACE_FILE))
+    return _exporter, _otel
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Time a block as a span: `with span('gemini.generate', task='score') as s:`"""
+    if not TRACING_ENABLED:
+        yield Span(name, attributes)
+        return
+
+    exporter, otel = _get_exporters()
+    current = Span(name, attributes, parent=_current_span.get())
+    token = _current_span.set(current)
+    otel_cm = otel.start_as_current_span(name) if otel else None
+    otel_span = otel_cm.__enter__() if otel_cm else None
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.status = 'error'
+        current.error = f"{type(e).__name__}: {e}"[:300]
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        _current_span.reset(token)
+        if otel_span is not None:
+            for key, value in current.attributes.items():
+                if isinstance(value, (str, bool, int, float)):
+                    otel_span.set_attribute(key, value)
+            otel_cm.__exit__(None, None, None)
+        exporter.export(current.to_record(duration))
+
+
+def traced(name: str = None, **attributes):
+    """Decorator form of span(); defaults the span name to module.function"""
+    def decorator(func):
+        span_name = name or f"{func.__module__.split('.')[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def read_spans(limit: int = 5000) -> List[Dict]:
+    """Most recent spans from the local trace file (oldest first)"""
+    path = state_path(TRACE_FILE)
+    if not os.path.exists(path):
+        return []
+
+    # Read just the tail of the file
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - limit * 600))
+        lines = f.read().splitlines()[-limit:]
+
+    spans = []
+    for line in lines:
+        try:
+            spans.append(json.loads(line))
+        except ValueError:
+            continue  # partial first line after seeking
+    return spans
+
+
+def summarize(spans: List[Dict]) -> List[Dict]:
+    """Per-span-name count, error count and latency percentiles (ms)"""
+    by_name: Dict[str, List[Dict]] = {}
+    for record in spans:
+        by_name.setdefault(record['name'], []).append(record)
+
+    rows = []
+    for name, records in by_name.items():
+        durations = sorted(r['duration_ms'] for r in records)
+        n = len(durations)
+        rows.append({
+            'span': name,
+            'count': n,
+            'errors': sum(1 for r in records if r.get('status') == 'error'),
+            'total_s': round(sum(durations) / 1000, 2),
+            'p50_ms': round(durations[n // 2], 1),
+            'p95_ms': round(durations[min(n - 1, int(n * 0.95))], 1),
+            'max_ms': round(durations[-1], 1)
+        })
+    rows.sort(key=lambda r: -r['total_s'])
+    return rows